@@ -1,92 +1,27 @@
 # algorithms/algoritmo_tabu_mejorado.py
 
-from utils.utilidades import generar_vecinos
-from utils.utilidades import registrar_evento
-
-
-def algoritmo_tabu_mejorado(tour_inicial, distancia_inicial, matriz_distancias, params, log_file=None):
-
-    # Parámetros
-    iteraciones = params['iterations']
-    tamanio_inicial_entorno = params['initial_environment_size']
-    ratio_disminucion_entorno = params['size_decrease_rate']
-    disminucion_tamanio = params['size_decrease_environment']
-    ratio_empeoramiento = params['worsening_movement_rate']
-
-    # Calculo el tamaño del entorno dinámico
-    tamanio = int(iteraciones * tamanio_inicial_entorno)
-
-    # Inicialización
-    mejor_global = tour_inicial
-    mejor_distancia_global = distancia_inicial
-    solucion_actual = tour_inicial
-    distancia_actual = distancia_inicial
-    mejor_momento_actual = tour_inicial
-    distancia_momento_actual = distancia_inicial
-
-    # Contadores
-    movimientos_empeoramiento = 0
-    contador = 0
-    iteracion = 0
-
-    # Registrar el estado inicial
-    registrar_evento(log_file, f"Estado inicial: tour={tour_inicial} distancia_inicial={distancia_inicial:.2f}\n")
-
-    while contador < iteraciones:
-
-        # Generar vecinos con el operador 2-opt
-        vecino, distancia_vecino, mejora, i, j = generar_vecinos(solucion_actual, distancia_actual, matriz_distancias, tamanio)
-
-        # Registrar vecinos generados
-        registrar_evento(log_file,f"Iteración {contador + 1}: Generado vecino con intercambio {vecino[i], vecino[j]} distancia={distancia_vecino:.2f}, mejora={mejora}\n")
-
-        # Si hay mejora
-        if mejora and vecino is not None:
-            solucion_actual = vecino
-            distancia_actual = distancia_vecino
-            mejor_momento_actual = solucion_actual
-            distancia_momento_actual = distancia_actual
-            contador += 1
-
-            # Actualizar mejor global si es necesario
-            if distancia_momento_actual < mejor_distancia_global:
-                mejor_global = mejor_momento_actual
-                mejor_distancia_global = distancia_momento_actual
-                movimientos_empeoramiento = 0  # Reiniciar el contador de empeoramientos
-
-            # Registrar mejora
-            registrar_evento(log_file, f"Mejora encontrada: distancia_actual={distancia_actual:.2f}\n")
-
-        else:
-            # No hay mejora, movernos al mejor vecino (aunque empeore)
-            solucion_actual = vecino
-            distancia_actual = distancia_vecino
-            contador += 1
-            movimientos_empeoramiento += 1
-
-            # Registrar empeoramiento
-            registrar_evento(log_file, f"Movimiento empeoramiento: distancia_actual={distancia_actual:.2f}\n")
-
-            # Verificar estancamiento
-            if movimientos_empeoramiento >= iteraciones * ratio_empeoramiento:
-                registrar_evento(log_file, "Algoritmo estancado, reiniciando con una nueva solución.\n")
-                # Aqui ahora hacer la Oscilación Estratégica
-                movimientos_empeoramiento = 0  # Reiniciar el contador de empeoramientos
-
-        # Reducimos el tamaño del entorno
-        if contador == iteracion + int(tamanio * ratio_disminucion_entorno):
-            tamanio = int(tamanio * (1 - disminucion_tamanio))
-            iteracion = contador
-
-            # Registrar reducción de tamaño del entorno
-            registrar_evento(log_file, f"Tamaño del entorno reducido a {tamanio}\n")
-
-            # Si se reduce por debajo del 10% termina
-            if tamanio < (disminucion_tamanio * 100):
-                registrar_evento(log_file, "Tamaño del entorno demasiado pequeño, finalizando.\n")
-                break
-
-    # Registrar el mejor resultado final
-    registrar_evento(log_file, f"Mejor solución encontrada: mejor_distancia_global={mejor_distancia_global:.2f}\n")
-
-    return mejor_global, mejor_distancia_global
\ No newline at end of file
+from utils.busqueda_tabu import busqueda_tabu
+
+
+def algoritmo_tabu_mejorado(tour_inicial, distancia_inicial, matriz_distancias, params, log_file=None, candidatos=None, traza=None, parada=None, checkpoint=None):
+    """
+        Variante de algoritmo_tabu con memoria tabú a corto plazo: las ciudades de cada movimiento quedan
+        prohibidas durante taboo_possesion iteraciones salvo que el movimiento mejore la mejor distancia
+        encontrada (criterio de aspiración), lo que evita volver una y otra vez sobre los mismos movimientos.
+
+        Args:
+            tour_inicial (list): La solución inicial (recorrido) del problema.
+            distancia_inicial (float): La distancia total del recorrido inicial.
+            matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+            params (dict): Parámetros del algoritmo que controlan su comportamiento.
+            log_file (file object, optional): Archivo donde se registran los eventos del algoritmo.
+            candidatos (numpy.ndarray, optional): Lista de candidatos (k vecinos más cercanos) de cada ciudad.
+            traza (TrazaBinaria, optional): Traza binaria donde se guarda una fila por iteración.
+            parada (CriterioParada, optional): Límite de tiempo, de evaluaciones o distancia objetivo.
+            checkpoint (Checkpoint, optional): Punto de control periódico desde el que se reanuda la búsqueda.
+
+        Returns:
+            tuple: Un tuple que contiene el mejor recorrido encontrado y su distancia total.
+    """
+    return busqueda_tabu(tour_inicial, distancia_inicial, matriz_distancias, params, log_file, candidatos, traza, parada,
+                         checkpoint, memoria_corto_plazo=True)
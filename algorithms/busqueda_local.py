@@ -1,19 +1,35 @@
 # algorithms/busqueda_local.py
 
-from utils.utilidades import generar_vecinos
+from utils.utilidades import explorar_entorno
+from utils.movimientos import aplicar_movimiento
+from utils.busqueda_dlb import BusquedaLocalDLB
+from utils.candidatos import candidatos_por_defecto
+from utils.tour import Tour
 from utils.utilidades import registrar_evento
+from utils.registro import RESUMEN, TRAZA
+from utils.traza import registrar_iteracion
 
+import utils.perfilado as perfilado
 
-def busqueda_local_mejor(tour_inicial, distancia_inicial, matriz_distancias, params, log_file=None):
+
+def busqueda_local_mejor(tour_inicial, distancia_inicial, matriz_distancias, params, log_file=None, candidatos=None, traza=None, parada=None):
     """
-        Realiza una búsqueda local para mejorar un tour inicial utilizando el operador 2-opt.
+        Realiza una búsqueda local para mejorar un tour inicial utilizando el operador de vecindario
+        configurado (intercambio, 2-opt u Or-opt).
+
+        Con local_search_mode=exhaustiva, en lugar de muestrear un entorno dinámico se recorre de forma
+        determinista todo el entorno 2-opt, Or-opt y 3-opt restringido de los candidatos, con don't-look
+        bits, hasta llegar a un óptimo local.
 
         Args:
             tour_inicial (list[int]): El tour inicial propuesto.
             distancia_inicial (float): La distancia total del tour inicial.
-            matriz_distancias (np.ndarray): Matriz de distancias entre las ciudades.
+            matriz_distancias (np.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
             params (dict): Parámetros de control para la búsqueda local.
             log_file (file object, optional): Archivo donde se registran los eventos de la búsqueda.
+            candidatos (numpy.ndarray, optional): Lista de candidatos (k vecinos más cercanos) de cada ciudad.
+            traza (TrazaBinaria, optional): Traza binaria donde se guarda una fila por iteración (o por mejora).
+            parada (CriterioParada, optional): Límite de tiempo, de evaluaciones o distancia objetivo.
 
         Returns:
             tuple: Un tuple que contiene el mejor recorrido (tour) y la mejor distancia encontrada.
@@ -24,12 +40,24 @@ def busqueda_local_mejor(tour_inicial, distancia_inicial, matriz_distancias, par
     tamanio_inicial_entorno = params['initial_environment_size']
     ratio_disminucion_entorno = params['size_decrease_rate']
     disminucion_tamanio = params['size_decrease_environment']
+    operador = params['neighborhood_operator']
+    modo_evaluacion = params['evaluation_mode']
+    modo_busqueda = params['local_search_mode']
+
+    if modo_busqueda == 'exhaustiva':
+        if candidatos is None:
+            candidatos = candidatos_por_defecto(matriz_distancias, params['candidate_neighbors'])
+
+        registrar_evento(log_file, lambda: f"Estado inicial: tour={tour_inicial} distancia_inicial={distancia_inicial:.2f}\n", TRAZA)
+        mejor_tour, mejor_distancia = BusquedaLocalDLB(matriz_distancias, candidatos).optimizar(tour_inicial, distancia_inicial, log_file, traza, parada)
+        registrar_evento(log_file, f"Mejor solución encontrada: mejor_distancia_global={mejor_distancia:.2f}\n", RESUMEN)
+        return mejor_tour, mejor_distancia
 
     # Calculo el tamaño del entorno dinámico
     tamanio = int(iteraciones * tamanio_inicial_entorno)
 
-    # Inicialización
-    mejor_tour = tour_inicial
+    # Inicialización (los movimientos se aplican sobre el propio tour)
+    mejor_tour = Tour(tour_inicial)
     mejor_distancia = distancia_inicial
 
     # Contadores
@@ -37,23 +65,38 @@ def busqueda_local_mejor(tour_inicial, distancia_inicial, matriz_distancias, par
     iteracion = 0
 
     # Registrar el estado inicial
-    registrar_evento(log_file, f"Estado inicial: tour={tour_inicial} distancia_inicial={distancia_inicial:.2f}\n")
+    registrar_evento(log_file, lambda: f"Estado inicial: tour={tour_inicial} distancia_inicial={distancia_inicial:.2f}\n", TRAZA)
 
     while contador < iteraciones:
 
-        # Generar vecinos con el operador 2-opt
-        vecino, distancia_vecino, mejora, i, j = generar_vecinos(mejor_tour, mejor_distancia, matriz_distancias, tamanio)
+        # Terminar si se ha agotado el tiempo o las evaluaciones o se ha alcanzado la distancia objetivo
+        if parada is not None and parada.agotado(mejor_distancia, tamanio):
+            registrar_evento(log_file, f"Criterio de parada alcanzado ({parada.motivo}), finalizando.\n")
+            break
 
-        # Registrar vecinos generados
-        registrar_evento(log_file,f"Iteración {contador + 1}: Generado vecino con intercambio {vecino[i], vecino[j]} distancia={distancia_vecino:.2f}, mejora={mejora}\n")
+        # Evaluar el entorno con el operador configurado
+        movimiento, distancia_vecino = explorar_entorno(mejor_tour, mejor_distancia, matriz_distancias, tamanio, operador, candidatos, modo_evaluacion)
+        mejora = distancia_vecino < mejor_distancia
+        if perfilado.activo:
+            perfilado.contar('evaluaciones', tamanio)
 
-        # Si hay mejora
-        if mejora and vecino is not None:
-            mejor_tour = vecino
+        # Registrar vecinos generados
+        if movimiento is not None:
+            registrar_evento(log_file, lambda: f"Iteración {contador + 1}: Generado vecino con {operador} {mejor_tour[movimiento[1]], mejor_tour[movimiento[2]]} distancia={distancia_vecino:.2f}, mejora={mejora}\n", TRAZA)
+
+        # Si hay mejora, aplicamos el movimiento sobre el tour
+        if mejora and movimiento is not None:
+            # Guardar la iteración en la traza binaria (las ciudades se leen antes de aplicar el movimiento)
+            if traza is not None:
+                registrar_iteracion(traza, contador + 1, mejor_tour[movimiento[1]], mejor_tour[movimiento[2]],
+                                    distancia_vecino - mejor_distancia, distancia_vecino, distancia_vecino, tamanio)
+            aplicar_movimiento(mejor_tour, movimiento)
             mejor_distancia = distancia_vecino
             contador += 1
+            if perfilado.activo:
+                perfilado.contar('movimientos_mejora')
             # Registrar mejora
-            registrar_evento(log_file, f"Mejora encontrada: distancia_actual={mejor_distancia:.2f}\n")
+            registrar_evento(log_file, lambda: f"Mejora encontrada: distancia_actual={mejor_distancia:.2f}\n", TRAZA)
         else:
             # No hay mejoras, terminamos
             registrar_evento(log_file, "No se encontraron mejoras, finalizando.\n")
@@ -66,6 +109,7 @@ def busqueda_local_mejor(tour_inicial, distancia_inicial, matriz_distancias, par
 
             # Registrar reducción de tamaño del entorno
             registrar_evento(log_file, f"Tamaño del entorno reducido a {tamanio}\n")
+            perfilado.contar('reducciones_entorno')
 
             # Si se reduce por debajo del 10% termina
             if tamanio < (disminucion_tamanio * 100):
@@ -73,6 +117,6 @@ def busqueda_local_mejor(tour_inicial, distancia_inicial, matriz_distancias, par
                 break
 
     # Registrar el mejor resultado final
-    registrar_evento(log_file,f"Mejor solución encontrada: mejor_distancia_global={mejor_distancia:.2f}\n")
+    registrar_evento(log_file, f"Mejor solución encontrada: mejor_distancia_global={mejor_distancia:.2f}\n", RESUMEN)
 
-    return mejor_tour, mejor_distancia
\ No newline at end of file
+    return mejor_tour.a_lista(), mejor_distancia
\ No newline at end of file
@@ -0,0 +1,81 @@
+# algorithms/curva_hilbert.py
+
+import numpy as np
+import random
+
+from utils.utilidades import registrar_evento, coste_camino
+from utils.registro import RESUMEN, TRAZA
+from utils.perfilado import cronometrar
+
+
+# Bits por coordenada de la rejilla sobre la que se traza la curva (2^16 x 2^16 celdas)
+ORDEN_CURVA = 16
+
+
+def indices_hilbert(coordenadas, orden=ORDEN_CURVA):
+    """
+    Posición de cada punto a lo largo de la curva de Hilbert que recorre su rectángulo envolvente.
+
+    Args:
+        coordenadas (numpy.ndarray): Coordenadas de los puntos con forma (n, 2).
+        orden (int): Bits por coordenada de la rejilla.
+
+    Returns:
+        numpy.ndarray: Índice de cada punto sobre la curva (int64).
+    """
+    lado = (1 << orden) - 1
+    minimo = coordenadas.min(axis=0)
+    extension = max(float(np.max(coordenadas.max(axis=0) - minimo)), 1e-12)
+    celdas = np.rint((coordenadas - minimo) / extension * lado).astype(np.int64)
+    x, y = celdas[:, 0].copy(), celdas[:, 1].copy()
+
+    # Conversión (x, y) -> d de la curva, vectorizada sobre todos los puntos a la vez
+    d = np.zeros(len(coordenadas), dtype=np.int64)
+    s = 1 << (orden - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+
+        # Rotar el cuadrante para que la subcurva tenga la orientación correcta
+        girar = ~ry
+        reflejar = girar & rx
+        x[reflejar] = lado - x[reflejar]
+        y[reflejar] = lado - y[reflejar]
+        x[girar], y[girar] = y[girar], x[girar].copy()
+        s >>= 1
+    return d
+
+
+@cronometrar('curva_hilbert')
+def curva_hilbert(matriz_distancias, coordenadas, log_file=None):
+    """
+    Construye un tour visitando las ciudades en el orden de la curva de Hilbert que recubre el plano.
+
+    Ciudades cercanas en la curva lo están en el plano, así que el tour es mucho mejor que el de
+    greedy_aleatorio con un coste O(n log n), sin consultar la matriz de distancias más que para sumar
+    la distancia final. El recorrido empieza en una ciudad aleatoria de la curva.
+
+    Args:
+        matriz_distancias (np.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        coordenadas (np.ndarray): Coordenadas de las ciudades con forma (n, 2).
+        log_file (file object, optional): Archivo donde se registran los eventos del algoritmo.
+
+    Returns:
+        tuple: Una tupla que contiene:
+            - list: El recorrido (tour) de las ciudades visitadas.
+            - float: La distancia total del recorrido.
+    """
+    coordenadas = np.asarray(coordenadas, dtype=np.float64)
+    orden = np.argsort(indices_hilbert(coordenadas), kind='stable')
+
+    # La ciudad inicial solo rota el recorrido (la distancia no cambia)
+    inicio = random.randrange(len(orden))
+    tour = np.concatenate((np.roll(orden, -inicio), orden[inicio:inicio + 1])).tolist()
+    total_distance = coste_camino(tour, matriz_distancias)
+
+    registrar_evento(log_file, f"Inicio en ciudad: {tour[0]}\n")
+    registrar_evento(log_file, f"Recorrido de la curva de Hilbert, Distancia total: {total_distance:.2f}\n", RESUMEN)
+    registrar_evento(log_file, lambda: f"Tour completo: {tour}\n", TRAZA)
+
+    return tour, total_distance
@@ -4,15 +4,26 @@ import numpy as np
 import random
 
 from utils.utilidades import registrar_evento
+from utils.registro import RESUMEN, TRAZA
+from utils.distancias import centralidades
+from utils.perfilado import cronometrar
 
 
-def greedy_aleatorio(matriz_distancias, k, log_file=None):
+@cronometrar('greedy_aleatorio')
+def greedy_aleatorio(matriz_distancias, k, log_file=None, centralidad='exacta', coordenadas=None):
     """
     Implementa el algoritmo Greedy Aleatorio para resolver el problema del vendedor viajero (TSP).
 
+    Con un oráculo de distancias la memoria es O(n): las sumas de cada ciudad se calculan por bloques
+    acotados y las distancias de cada paso, bajo demanda. Con centralidad='centroide' las ciudades se
+    ordenan por su distancia al centroide en lugar de por la suma de sus distancias (O(n) en lugar de O(n²)).
+
     Args:
-        matriz_distancias (np.ndarray): Matriz de distancias entre las ciudades.
+        matriz_distancias (np.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
         k (int): Número de ciudades a considerar al elegir la siguiente ciudad.
+        log_file (file object, optional): Archivo donde se registran los eventos del algoritmo.
+        centralidad (str, optional): 'exacta' (suma de distancias) o 'centroide' (aproximada).
+        coordenadas (np.ndarray, optional): Coordenadas de las ciudades, necesarias para 'centroide' con una matriz densa.
 
     Returns:
         tuple: Una tupla que contiene:
@@ -23,20 +34,38 @@ def greedy_aleatorio(matriz_distancias, k, log_file=None):
     # Nº elementos de la matriz
     n = matriz_distancias.shape[0]
 
-    visited = np.zeros(n, dtype=bool)  # Usar un array de booleanos para las ciudades visitadas
     tour = []
     total_distance = 0.0
 
-    # Paso 1: Calculamos la suma de distancias para cada ciudad usando numpy
-    city_distances = np.sum(matriz_distancias, axis=1)
-
-    # Ordenar las ciudades según la suma de sus distancias
-    sorted_indices = np.argsort(city_distances)
+    # Paso 1: Calculamos la centralidad de cada ciudad (suma de distancias, por bloques si es un oráculo)
+    city_distances = centralidades(matriz_distancias, centralidad, coordenadas)
+
+    # Ordenar las ciudades según su centralidad
+    sorted_indices = np.argsort(city_distances).tolist()
+
+    # Lista doblemente enlazada sobre sorted_indices con las ciudades no visitadas: recorrer desde la
+    # cabeza da las K más prometedoras en O(K), y quitar una ciudad visitada cuesta O(1)
+    rank = [0] * n
+    for posicion, ciudad in enumerate(sorted_indices):
+        rank[ciudad] = posicion
+    siguiente = list(range(1, n + 1))  # n marca el final de la lista
+    anterior = list(range(-1, n - 1))  # -1 marca el principio de la lista
+    cabeza = 0
+
+    def quitar(ciudad):
+        nonlocal cabeza
+        r = rank[ciudad]
+        if anterior[r] == -1:
+            cabeza = siguiente[r]
+        else:
+            siguiente[anterior[r]] = siguiente[r]
+        if siguiente[r] < n:
+            anterior[siguiente[r]] = anterior[r]
 
     # Seleccionar las K ciudades más prometedoras y elegir la primera ciudad aleatoriamente entre ellas
     start_city = random.choice(sorted_indices[:k])
     tour.append(start_city)
-    visited[start_city] = True
+    quitar(start_city)
     current_city = start_city
 
     # Log de inicio
@@ -44,11 +73,12 @@ def greedy_aleatorio(matriz_distancias, k, log_file=None):
 
     # Construir el tour
     for _ in range(n - 1):
-        # Filtrar las ciudades no visitadas
-        unvisited_indices = np.where(~visited)[0]
-
-        # Obtener las K ciudades más prometedoras no visitadas
-        k_candidates = sorted_indices[np.isin(sorted_indices, unvisited_indices)][:k]
+        # Obtener las K ciudades más prometedoras no visitadas (las K primeras de la lista enlazada)
+        k_candidates = []
+        r = cabeza
+        while r < n and len(k_candidates) < k:
+            k_candidates.append(sorted_indices[r])
+            r = siguiente[r]
         if len(k_candidates) == 0:
             break
 
@@ -59,19 +89,19 @@ def greedy_aleatorio(matriz_distancias, k, log_file=None):
         tour.append(next_city)
         total_distance += matriz_distancias[current_city, next_city]
 
-        # Marcar la ciudad como visitada y actualizar la ciudad actual
-        visited[next_city] = True
+        # Quitar la ciudad de las no visitadas y actualizar la ciudad actual
+        quitar(next_city)
         current_city = next_city
 
         # Registro de cada paso
-        registrar_evento(log_file, f"Paso {_ + 1}: Visitando ciudad {next_city}, Distancia acumulada: {total_distance:.2f}\n")
+        registrar_evento(log_file, lambda: f"Paso {_ + 1}: Visitando ciudad {next_city}, Distancia acumulada: {total_distance:.2f}\n", TRAZA)
 
     # Sumamos la distancia para volver a la ciudad inicial
     total_distance += matriz_distancias[current_city, start_city]
     tour.append(start_city)  # Añadir la ciudad inicial al final del tour para cerrar el ciclo
 
     # Registro final
-    registrar_evento(log_file, f"Regresando a la ciudad inicial: {start_city}, Distancia total: {total_distance:.2f}\n")
-    registrar_evento(log_file, f"Tour completo: {list(map(int, tour))}\n")
+    registrar_evento(log_file, f"Regresando a la ciudad inicial: {start_city}, Distancia total: {total_distance:.2f}\n", RESUMEN)
+    registrar_evento(log_file, lambda: f"Tour completo: {list(map(int, tour))}\n", TRAZA)
 
     return list(map(int, tour)), total_distance
\ No newline at end of file
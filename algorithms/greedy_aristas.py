@@ -0,0 +1,119 @@
+# algorithms/greedy_aristas.py
+
+import numpy as np
+import random
+
+from utils.utilidades import registrar_evento, coste_camino
+from utils.registro import RESUMEN, TRAZA
+from utils.candidatos import crear_lista_candidatos, VecinosLibres
+from utils.perfilado import cronometrar
+
+
+def aristas_candidatas(matriz_distancias, candidatos):
+    """
+    Aristas (a, b) con a < b que aparecen en la lista de candidatos, ordenadas de menor a mayor longitud.
+
+    Args:
+        matriz_distancias (np.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        candidatos (np.ndarray): Matriz (n, k) con los vecinos candidatos de cada ciudad.
+
+    Returns:
+        tuple: Arrays con los extremos a y b de cada arista.
+    """
+    n, k = candidatos.shape
+    origenes = np.repeat(np.arange(n, dtype=np.int64), k)
+    destinos = candidatos.ravel().astype(np.int64)
+    claves = np.unique(np.minimum(origenes, destinos) * n + np.maximum(origenes, destinos))
+    a, b = claves // n, claves % n
+
+    longitudes = np.asarray(matriz_distancias[a, b], dtype=np.float64)
+    orden = np.argsort(longitudes, kind='stable')
+    return a[orden], b[orden]
+
+
+@cronometrar('greedy_aristas')
+def greedy_aristas(matriz_distancias, coordenadas, log_file=None, candidatos=None):
+    """
+    Construye un tour con la heurística greedy de aristas restringida a la lista de candidatos.
+
+    Se recorren las aristas candidatas de la más corta a la más larga y se acepta cada una si sus dos
+    extremos tienen grado menor que 2 y no cierra un ciclo (union-find). Los fragmentos que quedan se unen
+    con el vecino más cercano entre sus extremos, buscado en un KD-tree. El coste es O(n k log(n k)).
+
+    Args:
+        matriz_distancias (np.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        coordenadas (np.ndarray): Coordenadas de las ciudades con forma (n, 2).
+        log_file (file object, optional): Archivo donde se registran los eventos del algoritmo.
+        candidatos (np.ndarray, optional): Lista de candidatos; si no se da, se usan los 10 más cercanos.
+
+    Returns:
+        tuple: Una tupla que contiene:
+            - list: El recorrido (tour) de las ciudades visitadas.
+            - float: La distancia total del recorrido.
+    """
+    coordenadas = np.asarray(coordenadas, dtype=np.float64)
+    n = len(coordenadas)
+    if candidatos is None:
+        candidatos = crear_lista_candidatos(coordenadas)
+
+    # Paso 1: aristas candidatas de menor a mayor longitud, aceptadas si no rompen el tour
+    padre = list(range(n))
+
+    def raiz(ciudad):
+        while padre[ciudad] != ciudad:
+            padre[ciudad] = padre[padre[ciudad]]
+            ciudad = padre[ciudad]
+        return ciudad
+
+    vecino_1 = [-1] * n
+    vecino_2 = [-1] * n
+    aceptadas = 0
+    for a, b in zip(*(extremos.tolist() for extremos in aristas_candidatas(matriz_distancias, candidatos))):
+        if vecino_2[a] != -1 or vecino_2[b] != -1:
+            continue
+        raiz_a, raiz_b = raiz(a), raiz(b)
+        if raiz_a == raiz_b:
+            continue
+        padre[raiz_a] = raiz_b
+        for ciudad, otra in ((a, b), (b, a)):
+            if vecino_1[ciudad] == -1:
+                vecino_1[ciudad] = otra
+            else:
+                vecino_2[ciudad] = otra
+        aceptadas += 1
+        if aceptadas == n - 1:
+            break
+
+    registrar_evento(log_file, f"Aristas aceptadas: {aceptadas}, Fragmentos: {n - aceptadas}\n")
+
+    # Paso 2: extremos de los fragmentos (una ciudad aislada es a la vez los dos extremos del suyo)
+    extremos = [ciudad for ciudad in range(n) if vecino_2[ciudad] == -1]
+    posicion_extremo = {ciudad: posicion for posicion, ciudad in enumerate(extremos)}
+    libres = VecinosLibres(coordenadas[extremos])
+
+    def recorrer(ciudad):
+        # Añade al tour el fragmento que empieza en ciudad y devuelve su otro extremo
+        anterior = -1
+        while ciudad != -1:
+            tour.append(ciudad)
+            siguiente = vecino_1[ciudad] if vecino_1[ciudad] != anterior else vecino_2[ciudad]
+            anterior, ciudad = ciudad, siguiente
+        return anterior
+
+    # Paso 3: unir los fragmentos yendo siempre al extremo libre más cercano
+    tour = []
+    posicion = random.randrange(len(extremos))
+    while posicion is not None:
+        libres.quitar(posicion)
+        final = recorrer(extremos[posicion])
+        libres.quitar(posicion_extremo[final])
+        registrar_evento(log_file, lambda: f"Fragmento {extremos[posicion]} -> {final}\n", TRAZA)
+        posicion = libres.mas_cercano(posicion_extremo[final])
+
+    tour.append(tour[0])  # Añadir la ciudad inicial al final del tour para cerrar el ciclo
+    total_distance = coste_camino(tour, matriz_distancias)
+
+    registrar_evento(log_file, f"Regresando a la ciudad inicial: {tour[0]}, Distancia total: {total_distance:.2f}\n", RESUMEN)
+    registrar_evento(log_file, lambda: f"Tour completo: {tour}\n", TRAZA)
+
+    return tour, total_distance
@@ -0,0 +1,44 @@
+# algorithms/lin_kernighan.py
+
+from utils.lin_kernighan import LinKernighan
+from utils.candidatos import candidatos_por_defecto
+from utils.utilidades import registrar_evento
+from utils.registro import RESUMEN, TRAZA
+
+
+def lin_kernighan(tour_inicial, distancia_inicial, matriz_distancias, params, log_file=None, candidatos=None, traza=None, parada=None):
+    """
+        Mejora un tour con movimientos de profundidad variable al estilo Lin-Kernighan (cadenas de 2-opt)
+        combinados con Or-opt, sobre las listas de candidatos y con don't-look bits.
+
+        Args:
+            tour_inicial (list[int]): El tour inicial propuesto.
+            distancia_inicial (float): La distancia total del tour inicial.
+            matriz_distancias (np.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+            params (dict): Parámetros del algoritmo (lk_max_depth, lk_breadth, candidate_neighbors).
+            log_file (file object, optional): Archivo donde se registran los eventos del algoritmo.
+            candidatos (numpy.ndarray, optional): Lista de candidatos (k vecinos más cercanos) de cada ciudad.
+            traza (TrazaBinaria, optional): Traza binaria donde se guarda una fila por mejora.
+            parada (CriterioParada, optional): Límite de tiempo, de evaluaciones o distancia objetivo.
+
+        Returns:
+            tuple: Un tuple que contiene el mejor recorrido (tour) y la mejor distancia encontrada.
+    """
+
+    # Cargar los parámetros
+    profundidad = params['lk_max_depth']
+    amplitud = params['lk_breadth']
+
+    if candidatos is None:
+        candidatos = candidatos_por_defecto(matriz_distancias, params['candidate_neighbors'])
+
+    # Registrar el estado inicial
+    registrar_evento(log_file, lambda: f"Estado inicial: tour={tour_inicial} distancia_inicial={distancia_inicial:.2f}\n", TRAZA)
+
+    motor = LinKernighan(matriz_distancias, candidatos, profundidad, amplitud)
+    mejor_tour, mejor_distancia = motor.optimizar(tour_inicial, distancia_inicial, log_file, traza, parada)
+
+    # Registrar el mejor resultado final
+    registrar_evento(log_file, f"Mejor solución encontrada: mejor_distancia_global={mejor_distancia:.2f}\n", RESUMEN)
+
+    return mejor_tour, mejor_distancia
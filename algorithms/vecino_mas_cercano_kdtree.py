@@ -0,0 +1,52 @@
+# algorithms/vecino_mas_cercano_kdtree.py
+
+import random
+
+from utils.utilidades import registrar_evento, coste_camino
+from utils.registro import RESUMEN, TRAZA
+from utils.candidatos import VecinosLibres
+from utils.perfilado import cronometrar
+
+
+@cronometrar('vecino_mas_cercano_kdtree')
+def vecino_mas_cercano_kdtree(matriz_distancias, coordenadas, log_file=None):
+    """
+    Construye el tour del vecino más cercano buscando cada siguiente ciudad en un KD-tree.
+
+    A diferencia de greedy_teoria, que recorre una fila de la matriz en cada paso (O(n²)), la ciudad no
+    visitada más cercana se obtiene del árbol en O(log n) amortizado. La cercanía se mide en el plano de
+    las coordenadas. La ciudad inicial se elige al azar.
+
+    Args:
+        matriz_distancias (np.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        coordenadas (np.ndarray): Coordenadas de las ciudades con forma (n, 2).
+        log_file (file object, optional): Archivo donde se registran los eventos del algoritmo.
+
+    Returns:
+        tuple: Una tupla que contiene:
+            - list: El recorrido (tour) de las ciudades visitadas.
+            - float: La distancia total del recorrido.
+    """
+    vecinos = VecinosLibres(coordenadas)
+
+    start_city = random.randrange(len(vecinos.libres))
+    tour = [start_city]
+    vecinos.quitar(start_city)
+
+    registrar_evento(log_file, f"Inicio en ciudad: {start_city}\n")
+
+    # Ir siempre a la ciudad libre más cercana a la actual
+    current_city = vecinos.mas_cercano(start_city)
+    while current_city is not None:
+        tour.append(current_city)
+        vecinos.quitar(current_city)
+        registrar_evento(log_file, lambda: f"Paso {len(tour) - 1}: Visitando ciudad {tour[-1]}\n", TRAZA)
+        current_city = vecinos.mas_cercano(current_city)
+
+    tour.append(start_city)  # Añadir la ciudad inicial al final del tour para cerrar el ciclo
+    total_distance = coste_camino(tour, matriz_distancias)
+
+    registrar_evento(log_file, f"Regresando a la ciudad inicial: {start_city}, Distancia total: {total_distance:.2f}\n", RESUMEN)
+    registrar_evento(log_file, lambda: f"Tour completo: {tour}\n", TRAZA)
+
+    return tour, total_distance
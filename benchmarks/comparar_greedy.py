@@ -0,0 +1,79 @@
+# benchmarks/comparar_greedy.py
+#
+# Compara greedy_aleatorio con la versión anterior (np.isin sobre todas las ciudades en cada paso)
+# en todas las instancias de ./data: comprueba que el tour es idéntico para las mismas semillas
+# y mide el tiempo de construcción de ambas.
+#
+# Uso: python -m benchmarks.comparar_greedy [semillas]
+
+import os, random, sys, time
+
+import numpy as np
+
+from utils.procesar_tsp import procesar_tsp
+from utils.distancias import crear_matriz_distancias
+from utils.distancias import sumas_distancias
+from algorithms.greedy_aleatorio import greedy_aleatorio
+
+
+def greedy_aleatorio_isin(matriz_distancias, k):
+    """Versión anterior de greedy_aleatorio (O(n²)), conservada como referencia."""
+    n = matriz_distancias.shape[0]
+    visited = np.zeros(n, dtype=bool)
+    tour = []
+    total_distance = 0.0
+
+    sorted_indices = np.argsort(sumas_distancias(matriz_distancias))
+
+    start_city = random.choice(sorted_indices[:k])
+    tour.append(start_city)
+    visited[start_city] = True
+    current_city = start_city
+
+    for _ in range(n - 1):
+        unvisited_indices = np.where(~visited)[0]
+        k_candidates = sorted_indices[np.isin(sorted_indices, unvisited_indices)][:k]
+        if len(k_candidates) == 0:
+            break
+        next_city = random.choice(k_candidates)
+        tour.append(next_city)
+        total_distance += matriz_distancias[current_city, next_city]
+        visited[next_city] = True
+        current_city = next_city
+
+    total_distance += matriz_distancias[current_city, start_city]
+    tour.append(start_city)
+
+    return list(map(int, tour)), total_distance
+
+
+def main():
+    semillas = [int(semilla) for semilla in sys.argv[1:]] or [18514]
+    k = 5
+
+    for tsp_file in sorted(os.listdir('./data')):
+        if not tsp_file.endswith('.tsp'):
+            continue
+
+        tsp_info = procesar_tsp('./data/' + tsp_file)
+        matriz_distancias = crear_matriz_distancias(tsp_info['coordenadas'])
+
+        for semilla in semillas:
+            random.seed(semilla)
+            inicio = time.perf_counter()
+            tour_nuevo, distancia_nueva = greedy_aleatorio(matriz_distancias, k)
+            tiempo_nuevo = time.perf_counter() - inicio
+
+            random.seed(semilla)
+            inicio = time.perf_counter()
+            tour_anterior, distancia_anterior = greedy_aleatorio_isin(matriz_distancias, k)
+            tiempo_anterior = time.perf_counter() - inicio
+
+            iguales = tour_nuevo == tour_anterior and distancia_nueva == distancia_anterior
+            print(f"{tsp_file:<12} semilla={semilla:<6} n={tsp_info['dimension']:<6} "
+                  f"anterior={tiempo_anterior:8.3f}s nuevo={tiempo_nuevo:8.3f}s "
+                  f"aceleración={tiempo_anterior / tiempo_nuevo:7.1f}x idéntico={'sí' if iguales else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
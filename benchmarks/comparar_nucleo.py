@@ -0,0 +1,91 @@
+# benchmarks/comparar_nucleo.py
+#
+# Compara el núcleo compilado (utils/_nucleo.pyx) con las versiones en Python de utils/nucleo.py en las
+# instancias de ./data con matriz densa, para distancias enteras (EUC_2D) y reales (EUCLIDEA): comprueba
+# que los tours y las distancias son idénticos para las mismas semillas y mide el tiempo de ambos. La
+# comprobación automática de la paridad (sin tiempos) está en tests/test_nucleo.py.
+#
+# Uso: python -m utils.compilar_nucleo && python -m benchmarks.comparar_nucleo [semillas]
+
+import os, random, sys, time
+
+import utils.nucleo as nucleo
+
+from utils.procesar_configuracion import procesar_configuracion
+from utils.procesar_tsp import procesar_tsp
+from utils.distancias import crear_matriz_distancias, UMBRAL_MATRIZ_DENSA, EUCLIDEA
+from utils.candidatos import crear_lista_candidatos
+from utils.tour import Tour
+from utils.utilidades import calcular_distancia
+from algorithms.greedy_aleatorio import greedy_aleatorio
+from algorithms.greedy_teoria import greedy_teoria
+from algorithms.busqueda_local import busqueda_local_mejor
+from algorithms.algoritmo_tabu import algoritmo_tabu
+
+
+def ejecutar(compilado, funcion, *args):
+    """Ejecuta funcion(*args) con o sin el núcleo compilado y devuelve su resultado y su tiempo."""
+    nucleo.usar_compilado = compilado
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def comparar(nombre, semilla, funcion, *args):
+    """Ejecuta una prueba con ambas versiones (misma semilla) e imprime si coinciden y sus tiempos."""
+    random.seed(semilla)
+    python, tiempo_python = ejecutar(False, funcion, *args)
+    random.seed(semilla)
+    compilado, tiempo_compilado = ejecutar(True, funcion, *args)
+
+    identico = python == compilado
+    print(f"  {nombre:<34} python={tiempo_python:8.3f}s compilado={tiempo_compilado:8.3f}s "
+          f"aceleración={tiempo_python / max(tiempo_compilado, 1e-9):7.1f}x idéntico={'sí' if identico else 'NO'}")
+    return identico
+
+
+def main():
+    if not nucleo.NUCLEO_DISPONIBLE:
+        print("El núcleo compilado no está disponible: ejecuta antes python -m utils.compilar_nucleo")
+        sys.exit(1)
+
+    semillas = [int(semilla) for semilla in sys.argv[1:]] or [18514]
+    params = procesar_configuracion('params.txt')
+    params['local_search_mode'] = 'entorno'
+    params['evaluation_mode'] = 'escalar'
+
+    todos_identicos = True
+    for tsp_file in sorted(os.listdir('./data')):
+        if not tsp_file.endswith('.tsp'):
+            continue
+
+        tsp_info = procesar_tsp('./data/' + tsp_file)
+        if tsp_info['dimension'] > UMBRAL_MATRIZ_DENSA:
+            continue  # Con el oráculo de distancias siempre se usa la versión en Python
+
+        candidatos = crear_lista_candidatos(tsp_info['coordenadas'], params['candidate_neighbors'])
+        for tipo in ('EUC_2D', EUCLIDEA):
+            matriz_distancias = crear_matriz_distancias(tsp_info['coordenadas'], tipo=tipo)
+            print(f"{tsp_file} ({tipo}, {matriz_distancias.dtype})")
+
+            todos_identicos &= comparar('greedy_teoria', 0, greedy_teoria, matriz_distancias)
+
+            for semilla in semillas:
+                random.seed(semilla)
+                tour, distancia = greedy_aleatorio(matriz_distancias, params['K'])
+                todos_identicos &= comparar(f'calcular_distancia s={semilla}', semilla,
+                                            lambda: (calcular_distancia(tour, matriz_distancias),
+                                                     calcular_distancia(Tour(tour), matriz_distancias)))
+
+                for operador in ('intercambio', '2opt', 'oropt'):
+                    params['neighborhood_operator'] = operador
+                    for algoritmo in (busqueda_local_mejor, algoritmo_tabu):
+                        todos_identicos &= comparar(f'{algoritmo.__name__} {operador} s={semilla}', semilla,
+                                                    algoritmo, tour, distancia, matriz_distancias, params, None,
+                                                    candidatos)
+
+    print("Todos los resultados son idénticos." if todos_identicos else "HAY DIFERENCIAS.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+# benchmarks/rendimiento.py
+#
+# Banco de pruebas de rendimiento: ejecuta cada algoritmo del diccionario `algoritmos` de main.py sobre las
+# instancias de ./data con las semillas de generar_semillas (DNI de params.txt) y mide, por instancia y
+# algoritmo:
+#   - tiempo de ejecución (mediana) y distancia media, con su porcentaje sobre el óptimo de data/_best.txt;
+#   - vecinos evaluados por segundo (contados con el mismo criterio que max_evaluations);
+#   - tiempo hasta quedar a menos de --gap % del óptimo (mediana de las ejecuciones que lo alcanzan);
+#   - pico de memoria residente (cada instancia y algoritmo se mide en un proceso nuevo).
+#
+# Cada medición se repite --repeticiones veces (cada una en un proceso nuevo) y se toma la mediana.
+#
+# Los resultados se guardan en JSON y se comparan con la referencia guardada (benchmarks/referencia.json,
+# medida en la máquina que indica su cabecera): se marca como regresión una bajada de vecinos/s o una
+# subida de tiempo o memoria mayor que --tolerancia, o una distancia media que empeora más que
+# --tolerancia-calidad. El tiempo y los vecinos/s solo se comparan si la referencia tarda al menos
+# TIEMPO_MINIMO_COMPARABLE. Con regresiones el proceso termina con código 1.
+#
+# Uso: python -m benchmarks.rendimiento [--instancias a280.tsp,ch130.tsp] [--ejecuciones 3] [--repeticiones 3]
+#                                       [--referencia benchmarks/referencia.json] [--guardar-referencia]
+
+import argparse, json, os, platform, random, resource, statistics, sys, time
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import utils.nucleo as nucleo
+
+from utils.procesar_configuracion import procesar_configuracion
+from utils.procesar_tsp import leer_optimos
+from utils.semillas import generar_semillas
+from utils.terminacion import CriterioParada
+from main import algoritmos, constructivos, preparar_instancia, ejecutar_constructivo, solucion_inicial
+
+
+# Por debajo de este tiempo (segundos) la medida es demasiado ruidosa para comparar tiempo y vecinos/s
+TIEMPO_MINIMO_COMPARABLE = 0.5
+
+
+class MedidorParada(CriterioParada):
+    """
+    Criterio de parada sin límites: solo cuenta los vecinos evaluados y anota cuándo la mejor distancia
+    baja por primera vez de la distancia objetivo.
+
+    Args:
+        distancia_objetivo (float, optional): Distancia cuyo tiempo de llegada se mide.
+    """
+
+    def __init__(self, distancia_objetivo=None):
+        super().__init__()
+        self.objetivo = distancia_objetivo
+        self.inicio = time.perf_counter()
+        self.tiempo_objetivo = None
+
+    def agotado(self, distancia, evaluaciones=0):
+        if self.tiempo_objetivo is None and self.objetivo is not None and distancia <= self.objetivo:
+            self.tiempo_objetivo = time.perf_counter() - self.inicio
+        return super().agotado(distancia, evaluaciones)
+
+
+def medir(tsp_file, nombre_algoritmo, semillas, params, gap):
+    """
+    Ejecuta un algoritmo con todas las semillas sobre una instancia (en un proceso aparte).
+
+    :param tsp_file: Nombre del archivo dentro de ./data.
+    :param nombre_algoritmo: Clave del diccionario algoritmos de main.py.
+    :param semillas: Semillas de las ejecuciones.
+    :param params: Diccionario de parámetros.
+    :param gap: Porcentaje sobre el óptimo cuyo tiempo de llegada se mide.
+    :return: Diccionario con las métricas agregadas.
+    """
+    instancia = preparar_instancia(tsp_file, params)
+    matriz_distancias = instancia['matriz_distancias']
+    optimo = leer_optimos().get(instancia['tsp_info']['nombre'].upper())
+    objetivo = None if optimo is None else optimo * (1 + gap / 100)
+    algoritmo = algoritmos[nombre_algoritmo]
+
+    tiempos, distancias, tiempos_objetivo = [], [], []
+    evaluaciones = 0
+    for semilla in semillas:
+        # La solución inicial se construye como en main.py, fuera de la medición
+        random.seed(semilla)
+        if nombre_algoritmo in constructivos:
+            inicio = time.perf_counter()
+            _, distancia = ejecutar_constructivo(nombre_algoritmo, instancia, params)
+            tiempo = time.perf_counter() - inicio
+            tiempo_objetivo = tiempo if objetivo is not None and distancia <= objetivo else None
+        else:
+            recorrido_inicial, distancia_inicial = solucion_inicial(instancia, semilla, params)
+            random.seed(semilla)
+            medidor = MedidorParada(objetivo)
+            inicio = time.perf_counter()
+            _, distancia = algoritmo(recorrido_inicial, distancia_inicial, matriz_distancias, params, None,
+                                     instancia['candidatos'], None, medidor)
+            tiempo = time.perf_counter() - inicio
+            evaluaciones += medidor.evaluaciones
+            tiempo_objetivo = medidor.tiempo_objetivo
+            if tiempo_objetivo is None and objetivo is not None and distancia <= objetivo:
+                tiempo_objetivo = tiempo  # La última mejora ya no pasa por la comprobación del bucle
+
+        tiempos.append(tiempo)
+        distancias.append(float(distancia))
+        if tiempo_objetivo is not None:
+            tiempos_objetivo.append(tiempo_objetivo)
+
+    distancia_media = statistics.mean(distancias)
+    return {
+        'ejecuciones': len(semillas),
+        'tiempo': statistics.median(tiempos),
+        'distancia_media': distancia_media,
+        'gap_medio': None if optimo is None else 100 * (distancia_media - optimo) / optimo,
+        'evaluaciones_por_segundo': evaluaciones / sum(tiempos) if evaluaciones else None,
+        'tiempo_hasta_gap': statistics.median(tiempos_objetivo) if tiempos_objetivo else None,
+        'alcanzan_gap': len(tiempos_objetivo),
+        'rss_pico_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def mediana_metricas(repeticiones):
+    """
+    Combina las métricas de varias repeticiones de una medición tomando la mediana de cada una.
+
+    :param repeticiones: Lista de diccionarios devueltos por medir().
+    :return: Diccionario con la mediana de cada métrica (None si no la tiene ninguna repetición).
+    """
+    metricas = {}
+    for clave in repeticiones[0]:
+        valores = [repeticion[clave] for repeticion in repeticiones if repeticion[clave] is not None]
+        metricas[clave] = statistics.median(valores) if valores else None
+    return metricas
+
+
+def comparar(resultados, referencia, tolerancia, tolerancia_calidad):
+    """
+    Compara los resultados con la referencia.
+
+    :param resultados: Resultados de esta ejecución ({instancia: {algoritmo: métricas}}).
+    :param referencia: Resultados de referencia con la misma estructura.
+    :param tolerancia: Variación relativa admitida en vecinos/s, tiempo y memoria.
+    :param tolerancia_calidad: Variación relativa admitida en la distancia media.
+    :return: Lista de mensajes con las regresiones encontradas.
+    """
+    # (métrica, tolerancia, True si más es mejor)
+    criterios = [('evaluaciones_por_segundo', tolerancia, True), ('tiempo', tolerancia, False),
+                 ('rss_pico_mb', tolerancia, False), ('distancia_media', tolerancia_calidad, False)]
+
+    regresiones = []
+    for tsp_file, por_algoritmo in resultados.items():
+        for nombre_algoritmo, metricas in por_algoritmo.items():
+            base = referencia.get(tsp_file, {}).get(nombre_algoritmo)
+            if base is None:
+                continue
+            for metrica, margen, mas_es_mejor in criterios:
+                actual, anterior = metricas.get(metrica), base.get(metrica)
+                if actual is None or not anterior:
+                    continue
+                if metrica in ('tiempo', 'evaluaciones_por_segundo') and base['tiempo'] < TIEMPO_MINIMO_COMPARABLE:
+                    continue
+                cambio = (actual - anterior) / anterior
+                if (-cambio if mas_es_mejor else cambio) > margen:
+                    regresiones.append(f"{tsp_file} {nombre_algoritmo}: {metrica} {anterior:.6g} -> {actual:.6g} ({100 * cambio:+.1f}%)")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(usage="python -m benchmarks.rendimiento [opciones]")
+    parser.add_argument('--params', default='params.txt', help="Archivo de parámetros de los algoritmos")
+    parser.add_argument('--instancias', help="Instancias separadas por comas (por defecto las de la referencia)")
+    parser.add_argument('--algoritmos', help="Algoritmos separados por comas (por defecto todos los registrados)")
+    parser.add_argument('--ejecuciones', type=int, default=3, help="Número de semillas por instancia")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Repeticiones de cada medición (se toma la mediana)")
+    parser.add_argument('--gap', type=float, default=10.0, help="Porcentaje sobre el óptimo cuyo tiempo de llegada se mide")
+    parser.add_argument('--salida', default='benchmarks/resultados.json')
+    parser.add_argument('--referencia', default='benchmarks/referencia.json')
+    parser.add_argument('--guardar-referencia', action='store_true', help="Guarda estos resultados como nueva referencia")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Variación admitida en vecinos/s, tiempo y memoria")
+    parser.add_argument('--tolerancia-calidad', type=float, default=0.01, help="Variación admitida en la distancia media")
+    args = parser.parse_args()
+
+    params = procesar_configuracion(args.params)
+    params['shared_memory'] = 'no'  # Cada medición parte de un proceso limpio
+    semillas = generar_semillas(params['dni'], args.ejecuciones)
+
+    # Referencia con la que se compara (si no se va a sustituir)
+    referencia = None
+    if not args.guardar_referencia and os.path.exists(args.referencia):
+        with open(args.referencia, 'r') as archivo:
+            referencia = json.load(archivo)
+
+    # Por defecto, las instancias de la referencia (o todas las de ./data si no hay referencia)
+    if args.instancias:
+        instancias = args.instancias.split(',')
+    elif referencia is not None:
+        instancias = list(referencia['resultados'])
+    else:
+        instancias = sorted(archivo for archivo in os.listdir('./data') if archivo.endswith('.tsp'))
+    nombres_algoritmos = args.algoritmos.split(',') if args.algoritmos else list(algoritmos)
+
+    resultados = {}
+    for tsp_file in instancias:
+        resultados[tsp_file] = {}
+        for nombre_algoritmo in nombres_algoritmos:
+            # Un proceso nuevo por medición para que el pico de memoria sea solo el suyo
+            repeticiones = []
+            for _ in range(args.repeticiones):
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                    repeticiones.append(pool.submit(medir, tsp_file, nombre_algoritmo, semillas, params, args.gap).result())
+            metricas = mediana_metricas(repeticiones)
+            resultados[tsp_file][nombre_algoritmo] = metricas
+
+            evaluaciones = metricas['evaluaciones_por_segundo']
+            hasta_gap = metricas['tiempo_hasta_gap']
+            gap_medio = metricas['gap_medio']
+            print(f"{tsp_file:<12} {nombre_algoritmo:<24} tiempo={metricas['tiempo']:9.3f}s "
+                  f"distancia={metricas['distancia_media']:14.2f} gap={'-' if gap_medio is None else f'{gap_medio:.2f}%':>9} "
+                  f"vecinos/s={'-' if evaluaciones is None else f'{evaluaciones:.0f}':>10} "
+                  f"hasta_{args.gap:g}%={'-' if hasta_gap is None else f'{hasta_gap:.3f}s':>9} "
+                  f"rss={metricas['rss_pico_mb']:8.1f}MB")
+
+    informe = {
+        'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'nucleo_compilado': nucleo.NUCLEO_DISPONIBLE,
+        'semillas': semillas,
+        'repeticiones': args.repeticiones,
+        'gap': args.gap,
+        'resultados': resultados
+    }
+    with open(args.salida, 'w') as archivo:
+        json.dump(informe, archivo, indent=2)
+
+    if args.guardar_referencia:
+        with open(args.referencia, 'w') as archivo:
+            json.dump(informe, archivo, indent=2)
+        print(f"Referencia guardada en {args.referencia}")
+        return
+
+    if referencia is None:
+        print(f"No hay referencia en {args.referencia}: ejecuta con --guardar-referencia para crearla")
+        return
+
+    regresiones = comparar(resultados, referencia['resultados'], args.tolerancia, args.tolerancia_calidad)
+    for regresion in regresiones:
+        print(f"REGRESIÓN {regresion}")
+    print(f"{len(regresiones)} regresiones respecto a la referencia del {referencia['fecha']}.")
+    if regresiones:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,168 +1,522 @@
 # main.py
 
-import sys, random, time, os
+import random, time, os, argparse, cProfile
+
+from concurrent.futures import ProcessPoolExecutor
 
 from utils.procesar_configuracion import procesar_configuracion
 from utils.procesar_tsp import procesar_tsp
+from utils.procesar_tsp import leer_optimos
 from utils.semillas import generar_semillas
-from utils.utilidades import crear_matriz_distancias_scipy
+from utils.distancias import crear_matriz_distancias
+from utils.distancias import resolver_tipo_distancia
+from utils.candidatos import crear_lista_candidatos
+from utils.memoria_compartida import nombre_segmento
+from utils.memoria_compartida import obtener_array_compartido
+from utils.memoria_compartida import liberar_arrays_compartidos
+from utils.cache_instancias import CacheInstancias
+from utils.cache_instancias import huella_archivo
+from utils.soluciones_iniciales import AlmacenSoluciones
 from utils.utilidades import registrar_evento
+from utils.registro import RESUMEN
+from utils.registro import RegistroAsincrono
+from utils.registro import nivel_registro
 from utils.utilidades import generar_logs
+from utils.utilidades import generar_archivo_ejecucion
+from utils.traza import TrazaBinaria
+from utils.terminacion import crear_criterio_parada
+from utils.checkpoint import Checkpoint
+from utils.checkpoint import guardar_resultado
+from utils.checkpoint import cargar_resultado
+from utils.checkpoint import huella_parametros
+import utils.perfilado as perfilado
 from utils.graficar_resultados import generar_graficos
 from utils.graficar_resultados import guardar_estadisticas_generales
+from utils.graficar_resultados import generar_grafico_convergencia
 from algorithms.greedy_aleatorio import greedy_aleatorio
+from algorithms.greedy_teoria import greedy_teoria
+from algorithms.curva_hilbert import curva_hilbert
+from algorithms.vecino_mas_cercano_kdtree import vecino_mas_cercano_kdtree
+from algorithms.greedy_aristas import greedy_aristas
 from algorithms.busqueda_local import busqueda_local_mejor
 from algorithms.algoritmo_tabu import algoritmo_tabu
 from algorithms.algoritmo_tabu_mejorado import algoritmo_tabu_mejorado
+from algorithms.lin_kernighan import lin_kernighan
 from contextlib import nullcontext
 
 
-def main():
-    if len(sys.argv) != 2:
-        print("Uso: python ./main.py ./params.txt")
-        sys.exit(1)
-
-    # Cargar parámetros desde el archivo
-    archivo_configuracion = sys.argv[1]
-    params = procesar_configuracion(archivo_configuracion)
-
-    # Cargar parámetros
-    dni = params['dni']
-    ejecuciones = params['executions']
-    k = params['K']
+# Diccionario de algoritmos
+algoritmos = {
+    'greedy_aleatorio': greedy_aleatorio,
+    'greedy_teoria': greedy_teoria,
+    'curva_hilbert': curva_hilbert,
+    'vecino_mas_cercano_kdtree': vecino_mas_cercano_kdtree,
+    'greedy_aristas': greedy_aristas,
+    'busqueda_local_mejor': busqueda_local_mejor,
+    'algoritmo_tabu': algoritmo_tabu,
+    'algoritmo_tabu_mejorado': algoritmo_tabu_mejorado,
+    'lin_kernighan': lin_kernighan,
+    # Agrega más algoritmos aquí
+}
+
+# Algoritmos constructivos: crean una solución desde cero y pueden dar la solución inicial del resto
+constructivos = {'greedy_aleatorio', 'greedy_teoria', 'curva_hilbert', 'vecino_mas_cercano_kdtree', 'greedy_aristas'}
+
+# Algoritmos que guardan puntos de control periódicos de su estado
+algoritmos_checkpoint = {'algoritmo_tabu', 'algoritmo_tabu_mejorado'}
+
+# Directorio donde se guarda el resultado de cada ejecución terminada (para reanudar)
+DIRECTORIO_EJECUCIONES = 'result/ejecuciones'
+
+# Directorio de los perfiles de cProfile (profile=cprofile)
+DIRECTORIO_PERFILES = 'result/perfiles'
+
+# Instancias ya preparadas en este proceso (cada worker del pool mantiene las suyas)
+_instancias = {}
+
+
+def preparar_instancia(tsp_file, params):
+    """
+    Carga un problema .tsp y construye sus estructuras de distancias.
+
+    Con shared_memory=si las coordenadas, la matriz densa y la lista de candidatos se publican en
+    memoria compartida: el primer proceso que las necesita las construye y el resto (workers del pool
+    u otros main.py lanzados a la vez) se unen a ellas por nombre sin copiarlas.
+
+    Con instance_cache=si, además, se guardan en disco (cache_dir) y las siguientes ejecuciones las
+    cargan mapeadas en memoria en lugar de procesar el .tsp y recalcular las distancias.
+
+    :param tsp_file: Nombre del archivo dentro de ./data.
+    :param params: Diccionario de parámetros.
+    :return: Diccionario con 'tsp_info', 'matriz_distancias', 'candidatos', 'segmentos', 'coordenadas',
+             'huella' y 'tipo_distancia'.
+    """
+    if tsp_file in _instancias:
+        return _instancias[tsp_file]
+
+    # Solo se mantiene una instancia en memoria por proceso
+    _instancias.clear()
+
+    ruta = "./data/" + tsp_file
+
+    # Caché en disco, indexada por la huella del contenido del archivo .tsp
+    cache = None
+    huella = None
+    if params['instance_cache'] == 'si' or params['initial_solution_cache'] == 'si':
+        huella = huella_archivo(ruta)
+    if params['instance_cache'] == 'si':
+        cache = CacheInstancias(params['cache_dir'], params['cache_max_mb'] * 1024 * 1024)
+
+    # Procesamos el archivo .tsp solo si hace falta (una vez como mucho)
+    tsp_procesado = {}
+
+    def procesar():
+        if not tsp_procesado:
+            tsp_procesado.update(procesar_tsp(ruta))
+        return tsp_procesado
+
+    if cache:
+        tsp_info = cache.obtener_json(huella, 'cabecera', lambda: {'nombre': procesar()['nombre'],
+                                                                   'dimension': procesar()['dimension'],
+                                                                   'tipo_distancia': procesar()['tipo_distancia']})
+    else:
+        tsp_info = procesar()
+
+    # Nombres de los segmentos de memoria compartida usados por esta instancia
+    segmentos = []
+
+    def obtener(clave, constructor):
+        # Orden de búsqueda: memoria compartida, caché en disco y, por último, construirlo
+        construir = constructor
+        if cache:
+            construir = lambda: cache.obtener_array(huella, '_'.join(map(str, clave)), constructor)
+
+        if params['shared_memory'] != 'si':
+            return construir()
+        nombre = nombre_segmento(os.path.abspath(ruta), os.path.getmtime(ruta), *clave)
+        segmentos.append(nombre)
+        return obtener_array_compartido(nombre, construir)
+
+    # Extraer coordenadas
+    coordenadas = obtener(('coordenadas',), lambda: procesar()['coordenadas'])
+
+    # Métrica de distancia (la del EDGE_WEIGHT_TYPE del archivo o la indicada en los parámetros)
+    tipo_distancia = resolver_tipo_distancia(params['distance_type'], tsp_info.get('tipo_distancia'))
+
+    # Crear la matriz de distancias (densa para instancias pequeñas, bajo demanda para las grandes)
+    def construir_matriz():
+        return crear_matriz_distancias(coordenadas,
+                                       umbral_densa=params['dense_matrix_threshold'],
+                                       dtype=params['distance_dtype'],
+                                       max_bloques=params['distance_cache_blocks'],
+                                       tipo=tipo_distancia)
+
+    if len(coordenadas) <= params['dense_matrix_threshold']:
+        matriz_distancias = obtener(('matriz', tipo_distancia, params['distance_dtype']), construir_matriz)
+    else:
+        matriz_distancias = construir_matriz()  # El oráculo solo guarda las coordenadas
+
+    # Crear la lista de candidatos (k vecinos más cercanos) si se generan vecinos a partir de ella
+    candidatos = None
+    if params['neighborhood_mode'] == 'candidatos':
+        candidatos = obtener(('candidatos', params['candidate_neighbors']),
+                             lambda: crear_lista_candidatos(coordenadas, params['candidate_neighbors']))
+
+    _instancias[tsp_file] = {
+        'tsp_info': tsp_info,
+        'matriz_distancias': matriz_distancias,
+        'candidatos': candidatos,
+        'segmentos': segmentos,
+        'coordenadas': coordenadas,
+        'huella': huella,
+        'tipo_distancia': tipo_distancia
+    }
+    return _instancias[tsp_file]
+
+
+def ejecutar_constructivo(nombre_algoritmo, instancia, params, log_file=None):
+    """
+    Llama a un algoritmo constructivo con los datos de la instancia que necesita.
+
+    :param nombre_algoritmo: Clave de un algoritmo constructivo en el diccionario algoritmos.
+    :param instancia: Diccionario devuelto por preparar_instancia.
+    :param params: Diccionario de parámetros.
+    :param log_file: Registro donde anota su construcción.
+    :return: Tupla (recorrido, distancia).
+    """
+    matriz_distancias = instancia['matriz_distancias']
+    if nombre_algoritmo == 'greedy_aleatorio':
+        return greedy_aleatorio(matriz_distancias, params['K'], log_file, params['greedy_centrality'], instancia['coordenadas'])
+    if nombre_algoritmo == 'greedy_teoria':
+        return greedy_teoria(matriz_distancias, log_file)
+    if nombre_algoritmo == 'greedy_aristas':
+        return greedy_aristas(matriz_distancias, instancia['coordenadas'], log_file, instancia['candidatos'])
+    return algoritmos[nombre_algoritmo](matriz_distancias, instancia['coordenadas'], log_file)
+
+
+def solucion_inicial(instancia, semilla, params, log_file=None):
+    """
+    Solución del constructivo initial_solution de la que parten los algoritmos para una semilla.
+
+    Se construye siempre con la semilla recién fijada, así que es la misma sea cual sea el orden de los
+    algoritmos. Con initial_solution_cache=si se lee del almacén de soluciones iniciales (cache_dir) y solo
+    se construye, y se guarda, si no estaba.
+
+    :param instancia: Diccionario devuelto por preparar_instancia.
+    :param semilla: Semilla de la ejecución.
+    :param params: Diccionario de parámetros.
+    :param log_file: Registro donde anota su construcción el constructivo.
+    :return: Tupla (recorrido, distancia).
+    """
+    constructor = params['initial_solution']
+
+    def construir():
+        random.seed(semilla)
+        return ejecutar_constructivo(constructor, instancia, params, log_file)
+
+    almacen = almacen_soluciones(instancia, params)
+    if almacen is None:
+        return construir()
+    return almacen.obtener(nombre_solucion(constructor, params), params['K'], semilla, construir)
+
+
+def nombre_solucion(nombre_algoritmo, params):
+    """Nombre con el que se guarda la solución de un constructivo en el almacén (incluye sus opciones)."""
+    if nombre_algoritmo == 'greedy_aleatorio' and params['greedy_centrality'] != 'exacta':
+        return f"{nombre_algoritmo}_{params['greedy_centrality']}"
+    return nombre_algoritmo
+
+
+def almacen_soluciones(instancia, params):
+    """Almacén de soluciones iniciales de la instancia, o None si initial_solution_cache=no."""
+    if params['initial_solution_cache'] != 'si':
+        return None
+    return AlmacenSoluciones(CacheInstancias(params['cache_dir'], params['cache_max_mb'] * 1024 * 1024),
+                             instancia['huella'], instancia['tipo_distancia'], params['distance_dtype'])
+
+
+def ejecutar_semilla(tsp_file, semilla, i, params):
+    """
+    Ejecuta todos los algoritmos configurados para una semilla de un problema.
+
+    Las ejecuciones de distintas semillas son independientes, por lo que esta función es la unidad de
+    trabajo que se reparte entre los procesos del pool. La solución inicial (del constructivo
+    initial_solution) se comparte entre los algoritmos de la misma semilla y, con initial_solution_cache=si, entre ejecuciones de main.py.
+
+    Cada ejecución terminada se guarda en result/ejecuciones; con resume=si las que ya están allí (con los
+    mismos parámetros) no se repiten y los algoritmos con punto de control continúan desde el último que
+    guardaron.
+
+    Con profile distinto de 'no' cada resultado incluye los tiempos por fase y los contadores de la
+    ejecución ('perfil') y, si la instancia se ha preparado en esta llamada, se añade el perfil de su
+    preparación en 'preparacion_instancia'.
+
+    :param tsp_file: Nombre del archivo .tsp.
+    :param semilla: Semilla de la ejecución.
+    :param i: Índice de la ejecución (empezando en 0).
+    :param params: Diccionario de parámetros.
+    :return: Diccionario {nombre_algoritmo: {'semilla', 'distancia', 'tiempo', 'traza', 'perfil'}}.
+    """
+    # Instrumentación (se activa aquí también para los workers del pool)
+    perfilado.activar(params['profile'] != 'no')
+    perfilado.reiniciar()
+
+    instancia = preparar_instancia(tsp_file, params)
+    perfil_preparacion = perfilado.resumen()
+    tsp_info = instancia['tsp_info']
+    matriz_distancias = instancia['matriz_distancias']
+    candidatos = instancia['candidatos']
     echo = params['echo']
+    nivel_log = nivel_registro(params['log_level'])
+
+    # Óptimo conocido del problema, para terminar al acercarse a él (target_gap)
+    optimo = leer_optimos().get(tsp_info['nombre'].upper()) if params['target_gap'] >= 0 else None
+
+    # Solución inicial para esta semilla
+    resultado_inicial = None
+
+    # Los resultados y puntos de control guardados con otros parámetros no se reutilizan
+    huella = huella_parametros(params)
+
+    resultados = {}
+    for nombre_algoritmo in params['algorithms']:
+        nombre_algoritmo = nombre_algoritmo.strip()
+        algoritmo = algoritmos.get(nombre_algoritmo)  # Obtener la función del diccionario
+
+        if not algoritmo:  # Verifica si el algoritmo está en el diccionario
+            continue
+
+        # Traza binaria por iteración (los constructivos no tienen iteraciones)
+        traza_filename = None
+        if params['trace'] == 'si' and nombre_algoritmo not in constructivos:
+            traza_filename = generar_archivo_ejecucion(params['trace_dir'], nombre_algoritmo, tsp_info, semilla, i + 1, 'npy')
+
+        # Reanudar: si la ejecución ya terminó se usa su resultado guardado
+        resultado_filename = generar_archivo_ejecucion(DIRECTORIO_EJECUCIONES, nombre_algoritmo, tsp_info, semilla, i + 1, 'npz')
+        guardado = cargar_resultado(resultado_filename, huella) if params['resume'] == 'si' else None
+        if guardado is not None:
+            resultados[nombre_algoritmo], recorrido = guardado
+            resultados[nombre_algoritmo]['traza'] = traza_filename
+            if nombre_algoritmo == params['initial_solution']:
+                resultado_inicial = (recorrido, resultados[nombre_algoritmo]['distancia'])
+
+            print(f"Ejecución {i + 1} | Algoritmo: {nombre_algoritmo} | Semilla: {semilla} | Ya terminada, se reutiliza su resultado")
+            continue
+
+        random.seed(semilla)  # Fijar la semilla para reproducibilidad
+
+        # Generar el archivo de log
+        log_filename = generar_logs(nombre_algoritmo, tsp_info, seed=semilla, execution_num=i + 1)
+
+        # Punto de control periódico del estado de la búsqueda
+        checkpoint = None
+        if params['checkpoint_interval'] > 0 and nombre_algoritmo in algoritmos_checkpoint:
+            checkpoint = Checkpoint(generar_archivo_ejecucion(params['checkpoint_dir'], nombre_algoritmo, tsp_info, semilla, i + 1, 'npz'),
+                                    params['checkpoint_interval'], reanudar=params['resume'] == 'si', huella=huella)
+
+        # Abrir el archivo de log en el modo correcto (se escribe por lotes en un hilo aparte)
+        with RegistroAsincrono(log_filename, nivel_log) if echo == 'no' else nullcontext() as log_file, \
+                TrazaBinaria(traza_filename) if traza_filename else nullcontext() as traza:
+            # Registrar el inicio de la ejecución
+            registrar_evento(log_file, f"Iniciando ejecución {i + 1} para el algoritmo {nombre_algoritmo} con semilla {semilla}", RESUMEN)
+
+            # Solución inicial (fuera de la medición); después se vuelve a fijar la semilla para que el
+            # algoritmo no dependa de si se ha construido o leído del almacén
+            if nombre_algoritmo not in constructivos and resultado_inicial is None:
+                resultado_inicial = solucion_inicial(instancia, semilla, params, log_file)
+                random.seed(semilla)
+
+            # Tiempos y contadores solo de esta ejecución y, con profile=cprofile, perfil completo
+            perfilado.reiniciar()
+            perfilador = cProfile.Profile() if params['profile'] == 'cprofile' else None
+            if perfilador:
+                perfilador.enable()
+
+            start_time = time.time()
+
+            # Llama al algoritmo pasando los parámetros correspondientes
+            if nombre_algoritmo in constructivos:
+                recorrido, distancia_total = ejecutar_constructivo(nombre_algoritmo, instancia, params, log_file)
+                if nombre_algoritmo == params['initial_solution']:
+                    resultado_inicial = (recorrido, distancia_total)
 
-    # Generar semillas
-    semillas = generar_semillas(dni, ejecuciones)
+            else:
+                recorrido_inicial, distancia_inicial = resultado_inicial
 
-    # Cargamos los nombres de los problemas .tsp
-    tsp_files = params['problem_names']
+                # Límites de tiempo, evaluaciones o distancia objetivo (el tiempo empieza a contar aquí)
+                parada = crear_criterio_parada(params, optimo)
 
-    # Cargamos los algoritmos
-    algoritmos_nombres = params['algorithms']
-
-    # Diccionario de algoritmos
-    algoritmos = {
-        'greedy_aleatorio': greedy_aleatorio,
-        'busqueda_local_mejor': busqueda_local_mejor,
-        'algoritmo_tabu': algoritmo_tabu,
-        'algoritmo_tabu_mejorado': algoritmo_tabu_mejorado,
-        # Agrega más algoritmos aquí
-    }
+                opciones = {'checkpoint': checkpoint} if checkpoint else {}
+                recorrido, distancia_total = algoritmo(recorrido_inicial, distancia_inicial, matriz_distancias, params, log_file, candidatos, traza, parada, **opciones)
 
-    # Diccionario para almacenar los resultados de greedy_aleatorio
-    resultados_greedy = {}
+            execution_time = time.time() - start_time
 
-    # Crear carpeta para resultados estadísticos
-    os.makedirs('result', exist_ok=True)
+            # La solución inicial se guarda también para las siguientes invocaciones
+            if nombre_algoritmo == params['initial_solution'] and params['initial_solution_cache'] == 'si':
+                almacen_soluciones(instancia, params).guardar(nombre_solucion(nombre_algoritmo, params), params['K'], semilla,
+                                                              recorrido, distancia_total)
 
-    # Crear directorio para logs
-    if echo == 'no':
-        os.makedirs('logs', exist_ok=True)
+            if perfilador:
+                perfilador.disable()
+                perfilador.dump_stats(generar_archivo_ejecucion(DIRECTORIO_PERFILES, nombre_algoritmo, tsp_info, semilla, i + 1, 'prof'))
 
-    for tsp_file in tsp_files:
-        # Procesamos el archivo .tsp
-        tsp_info = procesar_tsp("./data/" + tsp_file)
+            registrar_evento(log_file, f"Ejecución {i + 1}: Distancia total = {distancia_total:.2f}, Tiempo = {execution_time:.4f} segundos", RESUMEN)
 
-        print("\n===================================")
-        print(f"Problema TSP: {tsp_info['nombre']}")
-        print(f"Dimensión: {tsp_info['dimension']}")
-        print("===================================")
+        resultados[nombre_algoritmo] = {
+            'semilla': semilla,
+            'distancia': distancia_total,
+            'tiempo': execution_time,
+            'traza': traza_filename,
+            'perfil': perfilado.resumen() if perfilado.activo else None
+        }
 
-        # Extraer coordenadas
-        coordenadas = [coordenadas for _, coordenadas in tsp_info['coordenadas']]
+        # Guardar el resultado antes de descartar el punto de control
+        guardar_resultado(resultado_filename, resultados[nombre_algoritmo], recorrido, huella)
+        if checkpoint:
+            checkpoint.eliminar()
 
-        # Crear la matriz de distancias
-        matriz_distancias = crear_matriz_distancias_scipy(coordenadas)
+        print(f"Ejecución {i + 1} | Algoritmo: {nombre_algoritmo} | Semilla: {semilla} | Distancia Total: {distancia_total:.2f} | Tiempo = {execution_time:.4f} segundos")
+        print("--------------------------------------------------------------------------------------------------------------------")
 
-        # Para almacenar estadísticas por algoritmo
-        estadisticas_por_algoritmo = {}
+    if perfilado.activo and perfil_preparacion['fases']:
+        resultados['preparacion_instancia'] = perfil_preparacion
 
-        for nombre_algoritmo in algoritmos_nombres:
+    return resultados
 
-            algoritmo = algoritmos.get(nombre_algoritmo.strip())  # Obtener la función del diccionario
 
-            if algoritmo:  # Verifica si el algoritmo está en el diccionario
-                # Lista para almacenar los resultados de cada ejecución
-                resultados_ejecuciones = []
+def main():
+    parser = argparse.ArgumentParser(usage="python ./main.py ./params.txt [--workers N]")
+    parser.add_argument('archivo_configuracion')
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Número de procesos que ejecutan semillas en paralelo (1 = secuencial)")
+    args = parser.parse_args()
 
-                # Ejecutar el algoritmo para cada semilla
-                for i, semilla in enumerate(semillas):
-                    random.seed(semilla)  # Fijar la semilla para reproducibilidad
+    # Cargar parámetros desde el archivo
+    params = procesar_configuracion(args.archivo_configuracion)
 
-                    # Generar el archivo de log
-                    log_filename = generar_logs(nombre_algoritmo.strip(), tsp_info, seed=semilla, execution_num=i + 1)
+    # Cargar parámetros
+    dni = params['dni']
+    ejecuciones = params['executions']
+    echo = params['echo']
 
-                    # Abrir el archivo de log en el modo correcto
-                    with open(log_filename, 'w') if echo == 'no' else nullcontext() as log_file:
-                        # Registrar el inicio de la ejecución
-                        registrar_evento(log_file,f"Iniciando ejecución {i + 1} para el algoritmo {nombre_algoritmo.strip()} con semilla {semilla}")
+    # Generar semillas
+    semillas = generar_semillas(dni, ejecuciones)
 
-                        start_time = time.time()
+    # Instrumentación de las fases de cada ejecución
+    perfilado.activar(params['profile'] != 'no')
 
-                        # Llama al algoritmo pasando los parámetros correspondientes
-                        if nombre_algoritmo.strip() == 'greedy_aleatorio':
-                            recorrido, distancia_total = algoritmo(matriz_distancias, k, log_file)
-                            resultados_greedy[(tsp_file, semilla)] = (recorrido, distancia_total)
+    # Cargamos los nombres de los problemas .tsp
+    tsp_files = params['problem_names']
 
-                        elif nombre_algoritmo.strip() == 'busqueda_local_mejor':
-                            if (tsp_file, semilla) not in resultados_greedy:
-                                recorrido_inicial, distancia_inicial = algoritmos['greedy_aleatorio'](matriz_distancias, k, log_file)
-                                resultados_greedy[(tsp_file, semilla)] = (recorrido_inicial, distancia_inicial)
-                            else:
-                                recorrido_inicial, distancia_inicial = resultados_greedy[(tsp_file, semilla)]
+    # Cargamos los algoritmos
+    algoritmos_nombres = [nombre.strip() for nombre in params['algorithms']]
 
-                            recorrido, distancia_total = algoritmo(recorrido_inicial, distancia_inicial,matriz_distancias, params, log_file)
+    for nombre_algoritmo in algoritmos_nombres:
+        if nombre_algoritmo not in algoritmos:
+            print(f"Algoritmo '{nombre_algoritmo}' no reconocido.")
 
-                        elif nombre_algoritmo.strip() == 'algoritmo_tabu':
-                            if (tsp_file, semilla) not in resultados_greedy:
-                                recorrido_inicial, distancia_inicial = algoritmos['greedy_aleatorio'](matriz_distancias, k, log_file)
-                                resultados_greedy[(tsp_file, semilla)] = (recorrido_inicial, distancia_inicial)
-                            else:
-                                recorrido_inicial, distancia_inicial = resultados_greedy[(tsp_file, semilla)]
+    if params['initial_solution'] not in constructivos:
+        raise ValueError(f"Algoritmo constructivo '{params['initial_solution']}' no soportado.")
 
-                            recorrido, distancia_total = algoritmo(recorrido_inicial, distancia_inicial,matriz_distancias, params, log_file)
+    # Crear carpeta para resultados estadísticos
+    os.makedirs('result', exist_ok=True)
+
+    # Crear directorio para logs
+    if echo == 'no':
+        os.makedirs('logs', exist_ok=True)
 
-                        # elif nombre_algoritmo.strip() == 'algoritmo_tabu_mejorado':
-                        #     if (tsp_file, semilla) not in resultados_greedy:
-                        #         recorrido_inicial, distancia_inicial = algoritmos['greedy_aleatorio'](matriz_distancias,k, log_file)
-                        #         resultados_greedy[(tsp_file, semilla)] = (recorrido_inicial, distancia_inicial)
-                        #     else:
-                        #         recorrido_inicial, distancia_inicial = resultados_greedy[(tsp_file, semilla)]
-                        #
-                        #     recorrido, distancia_total = algoritmo(recorrido_inicial, distancia_inicial, matriz_distancias, params, log_file)
+    # Crear directorio para los resultados de cada ejecución
+    os.makedirs(DIRECTORIO_EJECUCIONES, exist_ok=True)
+
+    # Crear directorio para las trazas binarias
+    if params['trace'] == 'si':
+        os.makedirs(params['trace_dir'], exist_ok=True)
+
+    # Crear directorio para los puntos de control
+    if params['checkpoint_interval'] > 0:
+        os.makedirs(params['checkpoint_dir'], exist_ok=True)
+
+    # Crear directorio para los perfiles de cProfile
+    if params['profile'] == 'cprofile':
+        os.makedirs(DIRECTORIO_PERFILES, exist_ok=True)
+
+    # Con varios workers se envían todas las semillas de todos los problemas al pool desde el principio
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    futuros = {}
+    segmentos = {}
+    if pool:
+        for tsp_file in tsp_files:
+            # Publicar antes los datos compartidos para que los workers solo tengan que unirse a ellos
+            if params['shared_memory'] == 'si':
+                segmentos[tsp_file] = preparar_instancia(tsp_file, params)['segmentos']
+
+            for i, semilla in enumerate(semillas):
+                futuros[(tsp_file, i)] = pool.submit(ejecutar_semilla, tsp_file, semilla, i, params)
+
+    try:
+        for tsp_file in tsp_files:
+            perfilado.reiniciar()
+            tsp_info = preparar_instancia(tsp_file, params)['tsp_info'] if not pool else procesar_tsp("./data/" + tsp_file)
+            perfiles_instancia = [perfilado.resumen()]
+
+            print("\n===================================")
+            print(f"Problema TSP: {tsp_info['nombre']}")
+            print(f"Dimensión: {tsp_info['dimension']}")
+            print("===================================")
+
+            # Resultados de cada semilla, en el orden de las semillas
+            if pool:
+                resultados_semillas = [futuros[(tsp_file, i)].result() for i in range(len(semillas))]
+            else:
+                resultados_semillas = [ejecutar_semilla(tsp_file, semilla, i, params) for i, semilla in enumerate(semillas)]
 
-                        execution_time = time.time() - start_time
+            # Perfiles de la preparación de la instancia hecha en los workers
+            perfiles_instancia += [resultados['preparacion_instancia'] for resultados in resultados_semillas
+                                   if 'preparacion_instancia' in resultados]
 
-                        registrar_evento(log_file,f"Ejecución {i + 1}: Distancia total = {distancia_total:.2f}, Tiempo = {execution_time:.4f} segundos")
+            # Para almacenar estadísticas por algoritmo
+            estadisticas_por_algoritmo = {}
+            perfilado.reiniciar()
 
-                        resultados_ejecuciones.append({
-                            'semilla': semilla,
-                            'distancia': distancia_total,
-                            'tiempo': execution_time
-                        })
+            for nombre_algoritmo in algoritmos_nombres:
+                if nombre_algoritmo not in algoritmos:
+                    continue
 
-                        print(f"Ejecución {i + 1} | Algoritmo: {nombre_algoritmo.strip()} | Semilla: {semilla} | Distancia Total: {distancia_total:.2f} | Tiempo = {execution_time:.4f} segundos")
-                        print("--------------------------------------------------------------------------------------------------------------------")
+                # Lista con los resultados de cada ejecución
+                resultados_ejecuciones = [resultados[nombre_algoritmo] for resultados in resultados_semillas]
 
                 # Generar gráficos de los resultados para cada algoritmo
-                generar_graficos(resultados_ejecuciones, nombre_algoritmo.strip(), tsp_file)
+                generar_graficos(resultados_ejecuciones, nombre_algoritmo, tsp_file)
+
+                # Curvas de convergencia a partir de las trazas binarias
+                if params['trace'] == 'si' and nombre_algoritmo not in constructivos:
+                    generar_grafico_convergencia(resultados_ejecuciones, nombre_algoritmo, tsp_file)
 
                 # Almacenar las estadísticas generales por algoritmo
-                estadisticas_por_algoritmo[nombre_algoritmo.strip()] = {
+                estadisticas_por_algoritmo[nombre_algoritmo] = {
                     'distancias': [res['distancia'] for res in resultados_ejecuciones],
                     'tiempos': [res['tiempo'] for res in resultados_ejecuciones]
                 }
 
-            else:
-                print(f"Algoritmo '{nombre_algoritmo.strip()}' no reconocido.")
+                # Tiempos por fase y contadores sumados en todas las semillas
+                if perfilado.activo:
+                    estadisticas_por_algoritmo[nombre_algoritmo]['perfil'] = perfilado.acumular(
+                        [res['perfil'] for res in resultados_ejecuciones if res.get('perfil')])
+
+            # Guardar las estadísticas generales para el problema TSP (con la preparación y los gráficos)
+            perfil_instancia = perfilado.acumular(perfiles_instancia + [perfilado.resumen()]) if perfilado.activo else None
+            guardar_estadisticas_generales(estadisticas_por_algoritmo, tsp_file, perfil_instancia)
 
-        # Guardar las estadísticas generales para el problema TSP
-        guardar_estadisticas_generales(estadisticas_por_algoritmo, tsp_file)
+            # Liberar la memoria compartida del problema (los procesos aún unidos conservan su vista)
+            liberar_arrays_compartidos(segmentos.get(tsp_file, _instancias.get(tsp_file, {}).get('segmentos', [])))
 
-        print("\nProceso completado para el problema:", tsp_info['nombre'])
+            print("\nProceso completado para el problema:", tsp_info['nombre'])
+    finally:
+        if pool:
+            pool.shutdown()
+        liberar_arrays_compartidos()
 
     print("\nProceso completado para todos los problemas y todas las semillas.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,134 @@
+# tests/test_nucleo.py
+#
+# Paridad entre el núcleo compilado (utils/_nucleo.pyx) y las versiones en Python de utils/nucleo.py: con
+# las mismas semillas ambas deben dar exactamente los mismos tours, distancias y deltas. Las pruebas de
+# paridad se saltan si el núcleo no está compilado (python -m utils.compilar_nucleo); la medida de
+# tiempos está en benchmarks/comparar_nucleo.py.
+
+import os, random
+
+import numpy as np
+import pytest
+
+import utils.nucleo as nucleo
+
+from utils.procesar_configuracion import procesar_configuracion
+from utils.procesar_tsp import procesar_tsp
+from utils.distancias import crear_matriz_distancias, EUCLIDEA
+from utils.candidatos import crear_lista_candidatos
+from utils.movimientos import movimiento_aleatorio
+from utils.tour import Tour
+from utils.utilidades import coste_camino
+from algorithms.greedy_aleatorio import greedy_aleatorio
+from algorithms.greedy_teoria import greedy_teoria
+from algorithms.busqueda_local import busqueda_local_mejor
+from algorithms.algoritmo_tabu import algoritmo_tabu
+from algorithms.algoritmo_tabu_mejorado import algoritmo_tabu_mejorado
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INSTANCIAS = ('ch130.tsp', 'a280.tsp')
+TIPOS = ('EUC_2D', EUCLIDEA)
+SEMILLAS = (18514, 39484)
+OPERADORES = ('intercambio', '2opt', 'oropt')
+
+requiere_nucleo = pytest.mark.skipif(not nucleo.NUCLEO_DISPONIBLE,
+                                     reason="núcleo compilado no disponible (python -m utils.compilar_nucleo)")
+
+
+@pytest.fixture(scope='module')
+def params():
+    params = procesar_configuracion(os.path.join(RAIZ, 'params.txt'))
+    params['local_search_mode'] = 'entorno'
+    params['evaluation_mode'] = 'escalar'
+    params['iterations'] = 500
+    return params
+
+
+@pytest.fixture(scope='module', params=[(tsp_file, tipo) for tsp_file in INSTANCIAS for tipo in TIPOS],
+                ids=lambda clave: f"{clave[0]}-{clave[1]}")
+def instancia(request):
+    tsp_file, tipo = request.param
+    tsp_info = procesar_tsp(os.path.join(RAIZ, 'data', tsp_file))
+    return {
+        'matriz_distancias': crear_matriz_distancias(tsp_info['coordenadas'], tipo=tipo),
+        'candidatos': crear_lista_candidatos(tsp_info['coordenadas'], 10)
+    }
+
+
+@pytest.fixture(autouse=True)
+def restaurar_nucleo():
+    valor = nucleo.usar_compilado
+    yield
+    nucleo.usar_compilado = valor
+
+
+def ejecutar_ambos(semilla, funcion, *args):
+    """Ejecuta funcion(*args) con la versión en Python y con la compilada, con la misma semilla."""
+    resultados = []
+    for compilado in (False, True):
+        nucleo.usar_compilado = compilado
+        random.seed(semilla)
+        resultados.append(funcion(*args))
+    return resultados
+
+
+def tour_inicial(instancia, params, semilla):
+    random.seed(semilla)
+    return greedy_aleatorio(instancia['matriz_distancias'], params['K'])
+
+
+def test_longitud_recorrido_python(instancia, params):
+    # La versión en Python (la que se usa sin núcleo o con el oráculo) suma las mismas aristas que numpy
+    nucleo.usar_compilado = False
+    tour, distancia = tour_inicial(instancia, params, SEMILLAS[0])
+    esperado = coste_camino(tour, instancia['matriz_distancias'])
+    assert nucleo.longitud_recorrido(tour, instancia['matriz_distancias']) == pytest.approx(esperado)
+    assert nucleo.longitud_recorrido(Tour(tour), instancia['matriz_distancias']) == pytest.approx(esperado)
+    assert distancia == pytest.approx(esperado)
+
+
+@requiere_nucleo
+def test_vecino_mas_cercano(instancia):
+    python, compilado = ejecutar_ambos(0, greedy_teoria, instancia['matriz_distancias'])
+    assert python == compilado
+
+
+@requiere_nucleo
+@pytest.mark.parametrize('semilla', SEMILLAS)
+def test_longitud_recorrido(instancia, params, semilla):
+    tour, _ = tour_inicial(instancia, params, semilla)
+    matriz_distancias = instancia['matriz_distancias']
+    python, compilado = ejecutar_ambos(semilla, lambda: (nucleo.longitud_recorrido(tour, matriz_distancias),
+                                                         nucleo.longitud_recorrido(Tour(tour), matriz_distancias)))
+    assert python == compilado
+
+
+@requiere_nucleo
+@pytest.mark.parametrize('operador', OPERADORES)
+def test_evaluador_movimientos(instancia, params, operador):
+    tour = Tour(tour_inicial(instancia, params, SEMILLAS[0])[0])
+    matriz_distancias = instancia['matriz_distancias']
+    random.seed(SEMILLAS[0])
+    movimientos = [movimiento_aleatorio(operador, len(tour)) for _ in range(2000)]
+
+    deltas = []
+    for compilado in (False, True):
+        nucleo.usar_compilado = compilado
+        evaluar = nucleo.evaluador_movimientos(tour, matriz_distancias)
+        deltas.append(np.array([evaluar(movimiento) for movimiento in movimientos], dtype=np.float64))
+    np.testing.assert_array_equal(deltas[0], deltas[1])
+
+
+@requiere_nucleo
+@pytest.mark.parametrize('semilla', SEMILLAS)
+@pytest.mark.parametrize('operador', OPERADORES)
+@pytest.mark.parametrize('algoritmo', (busqueda_local_mejor, algoritmo_tabu, algoritmo_tabu_mejorado),
+                         ids=lambda algoritmo: algoritmo.__name__)
+def test_algoritmos(instancia, params, semilla, operador, algoritmo):
+    params = dict(params, neighborhood_operator=operador)
+    tour, distancia = tour_inicial(instancia, params, semilla)
+    python, compilado = ejecutar_ambos(semilla, algoritmo, tour, distancia, instancia['matriz_distancias'], params,
+                                       None, instancia['candidatos'])
+    assert python == compilado
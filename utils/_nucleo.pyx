@@ -0,0 +1,172 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, initializedcheck=False
+#
+# utils/_nucleo.pyx
+#
+# Versión compilada de los bucles escalares de utils/nucleo.py. Trabaja directamente sobre los buffers
+# (array('i') del Tour y matriz densa de numpy) sin crear un objeto Python por cada distancia leída.
+#
+# Las operaciones se hacen en el tipo de la matriz y en el mismo orden que las versiones en Python, de modo
+# que los resultados son idénticos bit a bit: int32 con aritmética de int32 y float64 con la de double.
+#
+# Compilar con: python -m utils.compilar_nucleo
+
+from array import array
+
+from libc.math cimport INFINITY
+from libc.stdlib cimport calloc, free
+
+ctypedef fused distancia_t:
+    int
+    double
+
+
+cdef inline Py_ssize_t _indice(Py_ssize_t base, int sentido, Py_ssize_t p, Py_ssize_t n) noexcept nogil:
+    """Índice en el array de la posición lógica p (módulo positivo, como en Python)."""
+    cdef Py_ssize_t q = (base + sentido * p) % n
+    return q + n if q < 0 else q
+
+
+cdef distancia_t _delta(const distancia_t[:, ::1] d, const int[::1] orden, Py_ssize_t base, int sentido,
+                        int operador, Py_ssize_t i, Py_ssize_t j, Py_ssize_t longitud) noexcept nogil:
+    """Mismas fórmulas (y mismo orden de operaciones) que delta_2opt, delta_oropt y delta_intercambio."""
+    cdef Py_ssize_t n = orden.shape[0]
+    cdef Py_ssize_t fin
+    cdef int anterior, primera, ultima, siguiente, p, q, a, b, anterior_i, siguiente_i, anterior_j, siguiente_j
+
+    if operador == 1:
+        anterior = orden[_indice(base, sentido, i - 1, n)]
+        primera = orden[_indice(base, sentido, i, n)]
+        ultima = orden[_indice(base, sentido, j, n)]
+        siguiente = orden[_indice(base, sentido, j + 1, n)]
+        return (d[anterior, ultima] + d[primera, siguiente]
+                - d[anterior, primera] - d[ultima, siguiente])
+
+    if operador == 2:
+        fin = i + longitud - 1
+        anterior = orden[_indice(base, sentido, i - 1, n)]
+        primera = orden[_indice(base, sentido, i, n)]
+        ultima = orden[_indice(base, sentido, fin, n)]
+        siguiente = orden[_indice(base, sentido, fin + 1, n)]
+        p = orden[_indice(base, sentido, j, n)]
+        q = orden[_indice(base, sentido, j + 1, n)]
+        return (d[anterior, siguiente] + d[p, primera] + d[ultima, q]
+                - d[anterior, primera] - d[ultima, siguiente] - d[p, q])
+
+    a = orden[_indice(base, sentido, i, n)]
+    b = orden[_indice(base, sentido, j, n)]
+    anterior_i = orden[_indice(base, sentido, i - 1, n)]
+    siguiente_j = orden[_indice(base, sentido, j + 1, n)]
+    if i + 1 == j:
+        return (d[anterior_i, b] + d[a, siguiente_j]
+                - d[anterior_i, a] - d[b, siguiente_j])
+
+    siguiente_i = orden[_indice(base, sentido, i + 1, n)]
+    anterior_j = orden[_indice(base, sentido, j - 1, n)]
+    return (d[anterior_i, b] + d[b, siguiente_i]
+            + d[anterior_j, a] + d[a, siguiente_j]
+            - d[anterior_i, a] - d[a, siguiente_i]
+            - d[anterior_j, b] - d[b, siguiente_j])
+
+
+cdef class EvaluadorMovimientos:
+    """
+    Evalúa movimientos (operador, i, j, longitud) sobre un Tour fijo.
+
+    Args:
+        orden (array('i')): Array cíclico de ciudades del Tour.
+        base (int): Índice en el array de la ciudad inicial.
+        sentido (int): Sentido de recorrido del Tour (1 o -1).
+        matriz_distancias (numpy.ndarray): Matriz densa C-contigua de int32 o float64.
+    """
+
+    cdef const int[::1] orden
+    cdef const int[:, ::1] d_entera
+    cdef const double[:, ::1] d_real
+    cdef bint entera
+    cdef Py_ssize_t base
+    cdef int sentido
+
+    def __init__(self, orden, Py_ssize_t base, int sentido, matriz_distancias):
+        self.orden = orden
+        self.base = base
+        self.sentido = sentido
+        self.entera = matriz_distancias.dtype.kind == 'i'
+        if self.entera:
+            self.d_entera = matriz_distancias
+        else:
+            self.d_real = matriz_distancias
+
+    def __call__(self, tuple movimiento):
+        operador, i, j, longitud = movimiento
+        cdef int codigo = 1 if operador == '2opt' else 2 if operador == 'oropt' else 0
+        if self.entera:
+            return _delta[int](self.d_entera, self.orden, self.base, self.sentido, codigo, i, j, longitud)
+        return _delta[double](self.d_real, self.orden, self.base, self.sentido, codigo, i, j, longitud)
+
+
+cdef distancia_t _longitud(const distancia_t[:, ::1] d, const int[::1] orden, Py_ssize_t base,
+                           int sentido) noexcept nogil:
+    """Suma secuencial como calcular_distancia: posiciones lógicas 0..n y vuelta a la inicial."""
+    cdef Py_ssize_t n = orden.shape[0]
+    cdef Py_ssize_t p
+    cdef distancia_t total = 0
+    cdef int actual = orden[_indice(base, sentido, 0, n)]
+    cdef int siguiente
+    for p in range(1, n + 1):
+        siguiente = orden[_indice(base, sentido, p, n)]
+        total += d[actual, siguiente]
+        actual = siguiente
+    # Arista de la ciudad inicial repetida a sí misma, que la versión en Python también suma
+    total += d[actual, actual]
+    return total
+
+
+def longitud_recorrido(orden, Py_ssize_t base, int sentido, matriz_distancias):
+    """Distancia total de un recorrido cíclico dado por el array de ciudades, su base y su sentido."""
+    if matriz_distancias.dtype.kind == 'i':
+        return _longitud[int](matriz_distancias, orden, base, sentido)
+    return _longitud[double](matriz_distancias, orden, base, sentido)
+
+
+cdef double _vecino_mas_cercano(const distancia_t[:, ::1] d, int[::1] tour, Py_ssize_t inicio) noexcept nogil:
+    """Bucle de greedy_teoria: en cada paso, la ciudad no visitada más cercana (la primera si hay empates)."""
+    cdef Py_ssize_t n = d.shape[0]
+    cdef Py_ssize_t paso, ciudad, actual = inicio, siguiente
+    cdef double total = 0.0, minima, distancia
+    cdef char *visitada
+
+    visitada = <char *> calloc(n, 1)
+    visitada[inicio] = 1
+    tour[0] = inicio
+    for paso in range(1, n):
+        siguiente = -1
+        minima = INFINITY
+        for ciudad in range(n):
+            if not visitada[ciudad]:
+                distancia = d[actual, ciudad]
+                if distancia < minima:
+                    minima = distancia
+                    siguiente = ciudad
+        tour[paso] = siguiente
+        total += minima
+        visitada[siguiente] = 1
+        actual = siguiente
+    free(visitada)
+
+    total += d[actual, inicio]
+    tour[n] = inicio
+    return total
+
+
+def vecino_mas_cercano(matriz_distancias, Py_ssize_t inicio=0):
+    """
+    Construye el tour del vecino más cercano partiendo de `inicio`.
+
+    :return: El tour (con la ciudad inicial repetida al final) como array('i') y su distancia.
+    """
+    tour = array('i', bytes(4 * (matriz_distancias.shape[0] + 1)))
+    if matriz_distancias.dtype.kind == 'i':
+        total = _vecino_mas_cercano[int](matriz_distancias, tour, inicio)
+    else:
+        total = _vecino_mas_cercano[double](matriz_distancias, tour, inicio)
+    return tour, total
@@ -0,0 +1,240 @@
+# utils/busqueda_dlb.py
+#
+# Búsqueda local exhaustiva con don't-look bits sobre listas de candidatos.
+#
+# Internamente el tour es un Tour cíclico (utils/tour.py), de modo que sucesor, predecesor y "está entre"
+# son O(1). Una ciudad está activa mientras está en la cola;
+# al procesarla se busca un movimiento de mejora que cree una arista hacia uno de sus candidatos y, si no
+# lo hay, se apaga (su bit "no mirar") hasta que un movimiento toque alguna de sus aristas. Así el trabajo
+# se concentra en las zonas del tour que han cambiado recientemente.
+#
+# Movimientos (todos de primera mejora):
+#   - '2opt': elimina dos aristas e invierte el camino entre ellas (se invierte el lado más corto).
+#   - 'oropt': mueve un segmento de 1 a LONGITUD_MAX_OROPT ciudades junto a un candidato, en cualquier sentido.
+#   - '3opt': 3-opt restringido (or-3opt): intercambia dos segmentos consecutivos sin invertirlos.
+
+from collections import deque
+
+from utils.movimientos import LONGITUD_MAX_OROPT
+from utils.tour import Tour
+from utils.utilidades import registrar_evento
+from utils.registro import TRAZA
+from utils.traza import registrar_iteracion
+
+import utils.perfilado as perfilado
+
+
+# Operadores de la búsqueda exhaustiva, en el orden en que se prueban
+OPERADORES_DLB = ('2opt', 'oropt', '3opt')
+
+# Tolerancia para considerar que un movimiento mejora (evita ciclos por errores de redondeo)
+EPSILON = 1e-7
+
+
+class BusquedaLocalDLB:
+    """
+    Motor de búsqueda local con don't-look bits y cola de ciudades activas.
+
+    Args:
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        candidatos (numpy.ndarray): Lista de candidatos (k vecinos más cercanos, ordenados) de cada ciudad.
+        operadores (tuple, optional): Operadores a usar, de entre OPERADORES_DLB.
+    """
+
+    def __init__(self, matriz_distancias, candidatos, operadores=OPERADORES_DLB):
+        self.matriz = matriz_distancias
+        self.vecinos = [list(fila) for fila in candidatos.tolist()]
+        self.operadores = tuple(operadores)
+        self.tour = None
+        self.n = 0
+        self._cola = deque()
+        self._en_cola = []
+
+    def _activar(self, *ciudades):
+        """Apaga el bit "no mirar" de las ciudades indicadas y las añade a la cola."""
+        for ciudad in ciudades:
+            if not self._en_cola[ciudad]:
+                self._en_cola[ciudad] = True
+                self._cola.append(ciudad)
+
+    # ------------------------------------------------------------------ Movimientos
+
+    def _mejorar_2opt(self, t1):
+        d = self.matriz
+        for adelante in (True, False):
+            siguiente = self.sucesor if adelante else self.predecesor
+            t2 = siguiente(t1)
+            d12 = d[t1, t2]
+            for t3 in self.vecinos[t1]:
+                d13 = d[t1, t3]
+                if d13 >= d12:
+                    break
+                t4 = siguiente(t3)
+                if t3 == t2 or t4 == t1:
+                    continue
+
+                delta = d13 + d[t2, t4] - d12 - d[t3, t4]
+                if delta < -EPSILON:
+                    self.tour.intercambiar_aristas(t1, t2, t3, t4)
+                    self._activar(t1, t2, t3, t4)
+                    return delta
+        return None
+
+    def _mejorar_oropt(self, s1):
+        d = self.matriz
+        for longitud in range(1, min(LONGITUD_MAX_OROPT, self.n - 3) + 1):
+            for adelante in (True, False):
+                siguiente = self.sucesor if adelante else self.predecesor
+                anterior_de = self.predecesor if adelante else self.sucesor
+
+                # Segmento s1 .. se en el sentido elegido, con p antes y nx después
+                segmento = [s1]
+                for _ in range(longitud - 1):
+                    segmento.append(siguiente(segmento[-1]))
+                se = segmento[-1]
+                p, nx = anterior_de(s1), siguiente(se)
+
+                ganancia_quitar = d[p, s1] + d[se, nx] - d[p, nx]
+                if ganancia_quitar <= EPSILON:
+                    continue
+
+                for extremo, otro in ((s1, se), (se, s1)):
+                    for c in self.vecinos[extremo]:
+                        d_c = d[c, extremo]
+                        if d_c >= ganancia_quitar:
+                            break
+                        if c in segmento:
+                            continue
+                        for e in (self.sucesor(c), self.predecesor(c)):
+                            if e in segmento:
+                                continue
+
+                            delta = d_c + d[otro, e] - d[c, e] - ganancia_quitar
+                            if delta < -EPSILON:
+                                self._mover_segmento(segmento, c, e, extremo)
+                                self._activar(p, nx, s1, se, c, e)
+                                return delta
+        return None
+
+    def _mover_segmento(self, segmento, c, e, extremo):
+        """Coloca el segmento entre las ciudades adyacentes c y e, con `extremo` junto a c."""
+        posicion = self.tour.posicion
+        longitud = len(segmento)
+
+        # Extremos del segmento en el sentido del array
+        primera, ultima = segmento[0], segmento[-1]
+        if (posicion[ultima] - posicion[primera]) % self.n != longitud - 1:
+            primera, ultima = ultima, primera
+
+        # u -> w es la arista (c, e) en el sentido del array
+        u, w = (c, e) if self.sucesor(c) == e else (e, c)
+
+        # S B Z con B = camino desde la ciudad tras el segmento hasta u  ->  B S Z (u -> S -> w)
+        longitud_b = (posicion[u] - posicion[ultima]) % self.n
+        self.tour.intercambiar_bloques(posicion[primera], longitud, longitud_b)
+
+        # Si el extremo que debe quedar junto a c no es el que ha quedado a su lado, se invierte el segmento
+        if (primera if u == c else ultima) != extremo:
+            self.tour.invertir(posicion[primera], posicion[ultima])
+
+    def _mejorar_3opt(self, t1):
+        d = self.matriz
+        for adelante in (True, False):
+            siguiente = self.sucesor if adelante else self.predecesor
+            t2 = siguiente(t1)
+            d12 = d[t1, t2]
+            for t3 in self.vecinos[t2]:
+                g1 = d12 - d[t2, t3]
+                if g1 <= EPSILON:
+                    break
+                t4 = siguiente(t3)
+                if t3 == t1 or t4 == t1:
+                    continue
+                d34 = d[t3, t4]
+
+                for t5 in self.vecinos[t4]:
+                    g2 = g1 + d34 - d[t4, t5]
+                    if g2 <= EPSILON:
+                        break
+                    # t5 tiene que estar en el camino t2 .. t3 (sin ser t3) para que no haya inversiones
+                    if t5 == t3 or t5 == t1:
+                        continue
+                    if not (self.entre(t2, t5, t3) if adelante else self.entre(t3, t5, t2)):
+                        continue
+                    t6 = siguiente(t5)
+
+                    delta = d[t6, t1] - d[t5, t6] - g2
+                    if delta < -EPSILON:
+                        # t1 [t2 .. t5] [t6 .. t3] t4  ->  t1 [t6 .. t3] [t2 .. t5] t4
+                        posicion = self.tour.posicion
+                        if adelante:
+                            inicio, longitud_x, longitud_y = posicion[t2], \
+                                (posicion[t5] - posicion[t2]) % self.n + 1, \
+                                (posicion[t3] - posicion[t6]) % self.n + 1
+                        else:
+                            inicio, longitud_x, longitud_y = posicion[t3], \
+                                (posicion[t6] - posicion[t3]) % self.n + 1, \
+                                (posicion[t2] - posicion[t5]) % self.n + 1
+                        self.tour.intercambiar_bloques(inicio, longitud_x, longitud_y)
+                        self._activar(t1, t2, t3, t4, t5, t6)
+                        return delta
+        return None
+
+    # ------------------------------------------------------------------ Bucle principal
+
+    def optimizar(self, tour, distancia, log_file=None, traza=None, parada=None):
+        """
+        Lleva el tour a un óptimo local respecto a todos los operadores configurados.
+
+        Args:
+            tour (list): Recorrido con la ciudad inicial repetida al final (no se modifica).
+            distancia (float): Distancia del recorrido.
+            log_file (file object, optional): Archivo donde se registran las mejoras.
+            traza (TrazaBinaria, optional): Traza binaria donde se guarda una fila por mejora, con la
+                ciudad desde la que se encontró y las ciudades que quedan activas.
+            parada (CriterioParada, optional): Límite de tiempo, de evaluaciones o distancia objetivo; cada
+                ciudad procesada cuenta como tantas evaluaciones como candidatos tiene por operador.
+
+        Returns:
+            tuple: El tour mejorado (misma ciudad inicial) y su distancia.
+        """
+        self.tour = Tour(tour)
+        self.n = self.tour.n
+
+        # Accesos directos a las consultas del tour, que se usan en todos los bucles internos
+        self.sucesor, self.predecesor, self.entre = self.tour.sucesor, self.tour.predecesor, self.tour.entre
+
+        if self.n < 5:
+            return list(tour), distancia
+
+        # Al principio todas las ciudades están activas
+        self._cola = deque(self.tour.orden)
+        self._en_cola = [True] * self.n
+
+        # Cada operador se implementa en el método _mejorar_<operador>
+        mejoras = [getattr(self, f"_mejorar_{operador}") for operador in self.operadores]
+
+        evaluaciones_ciudad = len(self.operadores) * len(self.vecinos[0])
+        iteracion = 0
+        while self._cola:
+            # Terminar si se ha agotado el tiempo o las evaluaciones o se ha alcanzado la distancia objetivo
+            if parada is not None and parada.agotado(distancia, evaluaciones_ciudad):
+                registrar_evento(log_file, f"Criterio de parada alcanzado ({parada.motivo}), finalizando.\n")
+                break
+
+            ciudad = self._cola.popleft()
+            self._en_cola[ciudad] = False
+            if perfilado.activo:
+                perfilado.contar('ciudades_procesadas')
+            for operador, mejorar in zip(self.operadores, mejoras):
+                delta = mejorar(ciudad)
+                if delta is not None:
+                    distancia += delta
+                    iteracion += 1
+                    registrar_evento(log_file, lambda: f"Mejora {operador} desde la ciudad {ciudad}: distancia_actual={distancia:.2f}\n", TRAZA)
+                    registrar_iteracion(traza, iteracion, ciudad, -1, delta, distancia, distancia, len(self._cola))
+                    perfilado.contar(f'mejoras_{operador}')
+                    break
+
+        # Se devuelve con la misma ciudad inicial que el tour de partida
+        return self.tour.a_lista(), distancia
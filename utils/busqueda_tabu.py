@@ -0,0 +1,213 @@
+# utils/busqueda_tabu.py
+#
+# Bucle de búsqueda tabú común a algoritmo_tabu y algoritmo_tabu_mejorado. En cada iteración se evalúa un
+# entorno dinámico (que se reduce cada cierto número de iteraciones) y se pasa siempre al mejor vecino;
+# las aristas introducidas alimentan una memoria a largo plazo que guía los reinicios por estancamiento
+# (oscilación estratégica). Las variantes se distinguen por los parámetros de busqueda_tabu:
+#   - memoria_corto_plazo: prohibir durante taboo_possesion iteraciones las ciudades movidas, con
+#     criterio de aspiración (algoritmo_tabu_mejorado).
+
+import random
+
+from utils.utilidades import explorar_entorno, operador_intensificacion, operador_diversificacion
+from utils.movimientos import aplicar_movimiento, aristas_nuevas
+from utils.memoria_tabu import MemoriaTabu
+from utils.memoria_largo_plazo import MemoriaLargoPlazo
+from utils.tour import Tour
+from utils.utilidades import registrar_evento
+from utils.registro import RESUMEN, TRAZA
+from utils.traza import registrar_iteracion
+
+import utils.perfilado as perfilado
+
+
+def busqueda_tabu(tour_inicial, distancia_inicial, matriz_distancias, params, log_file=None, candidatos=None, traza=None,
+                  parada=None, checkpoint=None, memoria_corto_plazo=True):
+    """
+        Búsqueda tabú sobre un tour inicial.
+
+        Args:
+            tour_inicial (list): La solución inicial (recorrido) del problema.
+            distancia_inicial (float): La distancia total del recorrido inicial.
+            matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+            params (dict): Parámetros del algoritmo que controlan su comportamiento.
+            log_file (file object, optional): Archivo donde se registran los eventos del algoritmo.
+            candidatos (numpy.ndarray, optional): Lista de candidatos (k vecinos más cercanos) de cada ciudad.
+            traza (TrazaBinaria, optional): Traza binaria donde se guarda una fila por iteración.
+            parada (CriterioParada, optional): Límite de tiempo, de evaluaciones o distancia objetivo.
+            checkpoint (Checkpoint, optional): Punto de control periódico desde el que se reanuda la búsqueda.
+            memoria_corto_plazo (bool, optional): Si se usa la memoria tabú a corto plazo con aspiración.
+
+        Returns:
+            tuple: Un tuple que contiene el mejor recorrido encontrado y su distancia total.
+    """
+
+    # Cargar los parámetros
+    iteraciones = params['iterations']
+    tamanio_inicial_entorno = params['initial_environment_size']
+    ratio_disminucion_entorno = params['size_decrease_rate']
+    disminucion_tamanio = params['size_decrease_environment']
+    ratio_empeoramiento = params['worsening_movement_rate']
+    operador = params['neighborhood_operator']
+    modo_evaluacion = params['evaluation_mode']
+    tenencia_tabu = params['taboo_possesion']
+    oscilacion = params['strategic_oscillation']
+    fraccion_reinicio = params['restart_segment_size']
+    k = params['K']
+
+    # Calculo el tamaño del entorno dinámico
+    tamanio = int(iteraciones * tamanio_inicial_entorno)
+
+    # Inicialización (los movimientos se aplican sobre la solución actual, sin copiarla)
+    mejor_global = Tour(tour_inicial)
+    mejor_distancia_global = distancia_inicial
+    solucion_actual = mejor_global.copia()
+    distancia_actual = distancia_inicial
+    distancia_momento_actual = distancia_inicial
+
+    # Memoria tabú a corto plazo: ciudades movidas recientemente
+    memoria_tabu = MemoriaTabu(len(matriz_distancias), tenencia_tabu) if memoria_corto_plazo else None
+
+    # Memoria a largo plazo: frecuencia de las aristas introducidas (restringida a los candidatos si los hay)
+    memoria_frecuencias = MemoriaLargoPlazo(len(matriz_distancias), candidatos)
+    longitud_reinicio = int((len(tour_inicial) - 2) * fraccion_reinicio)
+
+    # Contadores
+    movimientos_empeoramiento = 0
+    contador = 0
+    iteracion = 0
+
+    # Reanudar desde el último punto de control, si lo hay (también restaura el generador aleatorio)
+    estado = checkpoint.cargar() if checkpoint is not None else None
+    if estado is not None:
+        solucion_actual = Tour(estado['solucion_actual'].tolist())
+        mejor_global = Tour(estado['mejor_global'].tolist())
+        distancia_actual = estado['distancia_actual'].item()
+        distancia_momento_actual = estado['distancia_momento_actual'].item()
+        mejor_distancia_global = estado['mejor_distancia_global'].item()
+        if memoria_tabu is not None:
+            memoria_tabu.prohibida_hasta[:] = estado['prohibida_hasta']
+        memoria_frecuencias.frecuencias[:] = estado['frecuencias']
+        memoria_frecuencias.maximo = int(estado['maximo_frecuencias'])
+        movimientos_empeoramiento, contador, iteracion, tamanio = (int(estado[clave]) for clave in (
+            'movimientos_empeoramiento', 'contador', 'iteracion', 'tamanio'))
+        if parada is not None:
+            parada.restaurar(estado)  # El presupuesto consumido antes de la interrupción no se repone
+        registrar_evento(log_file, f"Reanudando desde el punto de control: iteración {contador}, mejor_distancia_global={mejor_distancia_global:.2f}\n")
+
+    # Registrar el estado inicial
+    registrar_evento(log_file, lambda: f"Estado inicial: tour={tour_inicial} distancia_inicial={distancia_inicial:.2f}\n", TRAZA)
+
+    while contador < iteraciones:
+
+        # Guardar periódicamente el estado de la búsqueda (antes de descontar las evaluaciones de esta iteración)
+        if checkpoint is not None and checkpoint.pendiente():
+            opcionales = {} if memoria_tabu is None else {'prohibida_hasta': memoria_tabu.prohibida_hasta}
+            if parada is not None:
+                opcionales.update(parada.estado())
+            checkpoint.guardar(solucion_actual=solucion_actual.a_lista(), mejor_global=mejor_global.a_lista(),
+                               distancia_actual=distancia_actual, distancia_momento_actual=distancia_momento_actual,
+                               mejor_distancia_global=mejor_distancia_global, **opcionales,
+                               frecuencias=memoria_frecuencias.frecuencias, maximo_frecuencias=memoria_frecuencias.maximo,
+                               movimientos_empeoramiento=movimientos_empeoramiento, contador=contador,
+                               iteracion=iteracion, tamanio=tamanio)
+
+        # Terminar si se ha agotado el tiempo o las evaluaciones o se ha alcanzado la distancia objetivo
+        if parada is not None and parada.agotado(mejor_distancia_global, tamanio):
+            registrar_evento(log_file, f"Criterio de parada alcanzado ({parada.motivo}), finalizando.\n")
+            break
+
+        # Evaluar el entorno con el operador configurado
+        movimiento, distancia_vecino = explorar_entorno(solucion_actual, distancia_actual, matriz_distancias, tamanio, operador, candidatos, modo_evaluacion,
+                                                        memoria_tabu, contador, mejor_distancia_global)
+        if perfilado.activo:
+            perfilado.contar('evaluaciones', tamanio)
+        if movimiento is None:
+            # Todos los vecinos evaluados son tabú: la iteración cuenta, pero la solución no cambia
+            if perfilado.activo:
+                perfilado.contar('iteraciones_todo_tabu')
+            contador += 1
+            ciudad_i = ciudad_j = -1
+            delta = 0.0
+
+        else:
+            mejora = distancia_vecino < distancia_actual
+            if perfilado.activo:
+                perfilado.contar('movimientos_mejora' if mejora else 'movimientos_empeoramiento')
+
+            # Registrar vecinos generados
+            registrar_evento(log_file, lambda: f"Iteración {contador + 1}: Generado vecino con {operador} {solucion_actual[movimiento[1]], solucion_actual[movimiento[2]]} distancia={distancia_vecino:.2f}, mejora={mejora}\n", TRAZA)
+
+            # Las ciudades del movimiento pasan a ser tabú (si hay memoria a corto plazo)
+            ciudad_i, ciudad_j = solucion_actual[movimiento[1]], solucion_actual[movimiento[2]]
+            if memoria_tabu is not None:
+                memoria_tabu.registrar(ciudad_i, ciudad_j, contador)
+
+            # Las aristas que crea el movimiento se suman a la memoria a largo plazo
+            for a, b in aristas_nuevas(solucion_actual, movimiento):
+                memoria_frecuencias.registrar(a, b)
+
+            # Nos movemos siempre al mejor vecino, aplicando el movimiento sobre la solución actual
+            delta = distancia_vecino - distancia_actual
+            aplicar_movimiento(solucion_actual, movimiento)
+            distancia_actual = distancia_vecino
+
+            # Si hay mejora
+            if mejora:
+                distancia_momento_actual = distancia_actual
+                contador += 1
+
+                # Actualizar mejor global si es necesario (copia, la solución actual seguirá cambiando)
+                if distancia_momento_actual < mejor_distancia_global:
+                    mejor_global = solucion_actual.copia()
+                    mejor_distancia_global = distancia_momento_actual
+                    movimientos_empeoramiento = 0  # Reiniciar el contador de empeoramientos
+
+                # Registrar mejora
+                registrar_evento(log_file, lambda: f"Mejora encontrada: distancia_actual={distancia_actual:.2f}\n", TRAZA)
+
+            else:
+                # No hay mejora, nos hemos movido al mejor vecino (aunque empeore)
+                contador += 1
+                movimientos_empeoramiento += 1
+
+                # Registrar empeoramiento
+                registrar_evento(log_file, lambda: f"Movimiento empeoramiento: distancia_actual={distancia_actual:.2f}\n", TRAZA)
+
+                # Verificar estancamiento
+                if movimientos_empeoramiento >= iteraciones * ratio_empeoramiento:
+                    # Oscilación estratégica: intensificar alrededor de la mejor solución con probabilidad
+                    # strategic_oscillation y, si no, diversificar; en ambos casos solo se reconstruye un segmento
+                    if random.random() < oscilacion:
+                        solucion_actual, distancia_actual = operador_intensificacion(mejor_global, mejor_distancia_global, matriz_distancias,
+                                                                                     memoria_frecuencias, longitud_reinicio, k)
+                        registrar_evento(log_file, f"Algoritmo estancado, intensificando: distancia_actual={distancia_actual:.2f}\n")
+                        perfilado.contar('reinicios_intensificacion')
+                    else:
+                        solucion_actual, distancia_actual = operador_diversificacion(solucion_actual, distancia_actual, matriz_distancias,
+                                                                                     memoria_frecuencias, longitud_reinicio, k)
+                        registrar_evento(log_file, f"Algoritmo estancado, diversificando: distancia_actual={distancia_actual:.2f}\n")
+                        perfilado.contar('reinicios_diversificacion')
+                    movimientos_empeoramiento = 0  # Reiniciar el contador de empeoramientos
+
+        # Guardar la iteración en la traza binaria
+        registrar_iteracion(traza, contador, ciudad_i, ciudad_j, delta, distancia_actual, mejor_distancia_global, tamanio)
+
+        # Reducimos el tamaño del entorno
+        if contador >= iteracion + int(tamanio * ratio_disminucion_entorno):
+            tamanio = int(tamanio * (1 - disminucion_tamanio))
+            iteracion = contador
+
+            # Registrar reducción de tamaño del entorno
+            registrar_evento(log_file, f"Tamaño del entorno reducido a {tamanio}\n")
+            perfilado.contar('reducciones_entorno')
+
+            # Si se reduce por debajo del 10% termina
+            if tamanio < (disminucion_tamanio * 100):
+                registrar_evento(log_file, "Tamaño del entorno demasiado pequeño, finalizando.\n")
+                break
+
+    # Registrar el mejor resultado final
+    registrar_evento(log_file, f"Mejor solución encontrada: mejor_distancia_global={mejor_distancia_global:.2f}\n", RESUMEN)
+
+    return mejor_global.a_lista(), mejor_distancia_global
\ No newline at end of file
@@ -0,0 +1,128 @@
+# utils/cache_instancias.py
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+def huella_archivo(ruta, tamanio_bloque=1 << 20):
+    """
+    Calcula la huella (SHA-1 del contenido) de un archivo.
+
+    :param ruta: Ruta del archivo.
+    :param tamanio_bloque: Bytes que se leen en cada paso.
+    :return: Huella en hexadecimal.
+    """
+    resumen = hashlib.sha1()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(tamanio_bloque), b''):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+class CacheInstancias:
+    """
+    Caché persistente en disco de instancias procesadas, matrices de distancias y listas de candidatos.
+
+    Cada entrada es un archivo .npy cuyo nombre combina la huella del archivo .tsp con una clave que
+    describe cómo se ha construido (métrica, tipo, k...). Las entradas se cargan mapeadas en memoria y,
+    si el directorio supera el tamaño máximo, se borran las usadas hace más tiempo (LRU por mtime).
+
+    Args:
+        directorio (str): Directorio de la caché.
+        max_bytes (int): Tamaño máximo del directorio en bytes.
+    """
+
+    def __init__(self, directorio, max_bytes):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        os.makedirs(directorio, exist_ok=True)
+
+    def ruta(self, huella, clave, extension='.npy'):
+        """Ruta de la entrada (huella, clave)."""
+        return os.path.join(self.directorio, f"{huella}_{clave}{extension}")
+
+    def _marcar_uso(self, ruta):
+        """Actualiza la fecha de la entrada para que sea la última en desalojarse."""
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+
+    def _guardar(self, ruta, escribir):
+        """Escribe una entrada de forma atómica y aplica el límite de tamaño."""
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as archivo:
+            escribir(archivo)
+        os.replace(temporal, ruta)
+        self.desalojar(proteger=ruta)
+
+    def obtener_array(self, huella, clave, constructor):
+        """
+        Devuelve el array de la entrada (huella, clave), construyéndolo y guardándolo si no existe.
+
+        :param huella: Huella del archivo .tsp.
+        :param clave: Descripción de la estructura (p. ej. 'matriz_euclidean_float64').
+        :param constructor: Función sin argumentos que construye el array.
+        :return: Array de solo lectura mapeado desde disco.
+        """
+        ruta = self.ruta(huella, clave)
+        if os.path.exists(ruta):
+            self._marcar_uso(ruta)
+            return self._cargar(ruta)
+
+        array = np.ascontiguousarray(constructor())
+        self._guardar(ruta, lambda archivo: np.save(archivo, array))
+
+        if not os.path.exists(ruta):
+            # La propia entrada supera el tamaño máximo de la caché
+            return array
+        return self._cargar(ruta)
+
+    @staticmethod
+    def _cargar(ruta):
+        # Vista como ndarray normal: np.memmap redefine __getitem__ en Python y ralentiza el acceso escalar
+        return np.load(ruta, mmap_mode='r').view(np.ndarray)
+
+    def obtener_json(self, huella, clave, constructor):
+        """Igual que obtener_array, para datos pequeños serializables en JSON (cabeceras)."""
+        ruta = self.ruta(huella, clave, '.json')
+        if os.path.exists(ruta):
+            self._marcar_uso(ruta)
+            with open(ruta, 'r') as archivo:
+                return json.load(archivo)
+
+        datos = constructor()
+        self._guardar(ruta, lambda archivo: archivo.write(json.dumps(datos).encode()))
+        return datos
+
+    def desalojar(self, proteger=None):
+        """
+        Borra las entradas menos usadas recientemente hasta que el directorio quepa en max_bytes.
+
+        :param proteger: Ruta que no se borra salvo que ella sola supere el límite.
+        """
+        entradas = []
+        total = 0
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith('.tmp'):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            entradas.append((estado.st_mtime, ruta == proteger, estado.st_size, ruta))
+            total += estado.st_size
+
+        # Las más antiguas primero; la protegida, en último lugar
+        for _, protegida, tamanio, ruta in sorted(entradas, key=lambda entrada: (entrada[1], entrada[0])):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+                total -= tamanio
+            except OSError:
+                pass
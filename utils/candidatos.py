@@ -0,0 +1,135 @@
+# utils/candidatos.py
+
+import numpy as np
+
+from scipy.spatial import cKDTree
+
+from utils.perfilado import cronometrar
+
+
+@cronometrar('crear_lista_candidatos')
+def crear_lista_candidatos(coordenadas, k=10):
+    """
+    Construye la lista de candidatos de cada ciudad: sus k vecinos más cercanos.
+
+    Se utiliza un KD-tree, por lo que el coste es O(n log n) en lugar de recorrer la matriz de distancias.
+
+    Args:
+        coordenadas (array-like): Coordenadas de las ciudades con forma (n, 2).
+        k (int): Número de vecinos candidatos por ciudad.
+
+    Returns:
+        numpy.ndarray: Matriz (n, k) de int32 con los índices de los vecinos, del más cercano al más lejano.
+    """
+    coordenadas_array = np.asarray(coordenadas, dtype=np.float64)
+    n = len(coordenadas_array)
+    k = min(k, n - 1)
+
+    arbol = cKDTree(coordenadas_array)
+    _, indices = arbol.query(coordenadas_array, k=k + 1)
+    indices = np.asarray(indices).reshape(n, k + 1)
+
+    # La propia ciudad no es candidata (con puntos repetidos no tiene por qué salir la primera)
+    es_propia = indices == np.arange(n)[:, None]
+    orden = np.argsort(es_propia, axis=1, kind='stable')
+    indices = np.take_along_axis(indices, orden, axis=1)[:, :k]
+
+    return indices.astype(np.int32)
+
+
+def candidatos_desde_matriz(matriz_distancias, k=10):
+    """
+    Construye la lista de candidatos a partir de una matriz de distancias densa, fila a fila.
+
+    Es O(n²), por lo que solo se usa como alternativa a crear_lista_candidatos cuando no se dispone de las
+    coordenadas (con un oráculo cada fila se calcularía de nuevo; ver candidatos_por_defecto).
+
+    Args:
+        matriz_distancias (numpy.ndarray): Matriz de distancias entre las ciudades.
+        k (int): Número de vecinos candidatos por ciudad.
+
+    Returns:
+        numpy.ndarray: Matriz (n, k) de int32 con los índices de los vecinos, del más cercano al más lejano.
+    """
+    n = len(matriz_distancias)
+    k = min(k, n - 1)
+
+    indices = np.empty((n, k), dtype=np.int32)
+    for ciudad in range(n):
+        fila = np.array(matriz_distancias[ciudad], dtype=np.float64)
+        fila[ciudad] = np.inf
+        cercanos = np.argpartition(fila, k - 1)[:k]
+        indices[ciudad] = cercanos[np.argsort(fila[cercanos], kind='stable')]
+
+    return indices
+
+
+def candidatos_por_defecto(matriz_distancias, k=10):
+    """
+    Lista de candidatos de un algoritmo que la necesita cuando no se la han pasado.
+
+    Con un oráculo de distancias se construye con el KD-tree sobre sus coordenadas (crear_lista_candidatos);
+    solo con una matriz densa se recorren sus filas (candidatos_desde_matriz).
+
+    Args:
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        k (int): Número de vecinos candidatos por ciudad.
+
+    Returns:
+        numpy.ndarray: Matriz (n, k) de int32 con los índices de los vecinos, del más cercano al más lejano.
+    """
+    coordenadas = getattr(matriz_distancias, 'coordenadas', None)
+    if coordenadas is not None:
+        return crear_lista_candidatos(coordenadas, k)
+    return candidatos_desde_matriz(matriz_distancias, k)
+
+
+class VecinosLibres:
+    """
+    Búsqueda del punto libre más cercano sobre un KD-tree del que se van quitando puntos.
+
+    Los puntos quitados no se borran del árbol: se pide a la consulta un número de vecinos que se duplica
+    hasta encontrar uno libre, y el árbol se reconstruye solo con los libres cuando quedan menos de la
+    mitad de los que tenía. Así cada consulta cuesta O(log n) amortizado.
+
+    Args:
+        coordenadas (array-like): Coordenadas de los puntos con forma (n, 2).
+    """
+
+    def __init__(self, coordenadas):
+        self.coordenadas = np.asarray(coordenadas, dtype=np.float64)
+        self.libres = np.ones(len(self.coordenadas), dtype=bool)
+        self.n_libres = len(self.coordenadas)
+        self._reconstruir()
+
+    def _reconstruir(self):
+        self._indices = np.flatnonzero(self.libres)
+        self._arbol = cKDTree(self.coordenadas[self._indices])
+
+    def quitar(self, punto):
+        """Marca un punto como ocupado."""
+        if self.libres[punto]:
+            self.libres[punto] = False
+            self.n_libres -= 1
+            if 0 < self.n_libres < len(self._indices) // 2:
+                self._reconstruir()
+
+    def mas_cercano(self, punto):
+        """
+        Punto libre más cercano a un punto dado.
+
+        :param punto: Índice del punto de referencia.
+        :return: Índice del punto libre más cercano, o None si no queda ninguno.
+        """
+        if self.n_libres == 0:
+            return None
+
+        k = 8
+        while True:
+            k = min(k, len(self._indices))
+            _, posiciones = self._arbol.query(self.coordenadas[punto], k=k)
+            candidatos = self._indices[np.atleast_1d(posiciones)]
+            libres = candidatos[self.libres[candidatos]]
+            if len(libres):
+                return int(libres[0])
+            k *= 2
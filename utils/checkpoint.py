@@ -0,0 +1,156 @@
+# utils/checkpoint.py
+#
+# Puntos de control de las ejecuciones largas y resultados de las ejecuciones terminadas.
+#
+# - Checkpoint guarda cada cierto tiempo el estado completo de una búsqueda (tours, distancias, contadores,
+#   memorias, presupuesto consumido del criterio de parada y estado del generador aleatorio) en un .npz;
+#   al reanudar, la búsqueda continúa exactamente donde se quedó y obtiene el mismo resultado que sin
+#   interrupción (con max_seconds, salvo por el momento exacto en que se agota el tiempo).
+# - guardar_resultado / cargar_resultado guardan el resultado de cada (problema, algoritmo, semilla)
+#   terminado, para que al reanudar main.py no lo vuelva a calcular.
+#
+# Ambos guardan la huella de los parámetros que influyen en el resultado (huella_parametros): un archivo
+# guardado con otros parámetros (otras iteraciones, otro operador, otra métrica...) se ignora al reanudar.
+#
+# Los archivos se escriben primero con otro nombre y se renombran, así que un proceso que muere a mitad
+# de una escritura nunca deja un archivo a medias.
+
+import hashlib, os, random, time
+
+import numpy as np
+
+from utils.terminacion import INTERVALO_RELOJ
+
+
+# Parámetros que no cambian el resultado de una ejecución (qué se ejecuta, dónde se guarda y cómo se registra)
+PARAMETROS_SIN_EFECTO = {'problem_names', 'algorithms', 'dni', 'executions', 'echo', 'log_level', 'trace', 'trace_dir',
+                         'checkpoint_interval', 'checkpoint_dir', 'resume', 'profile', 'distance_cache_blocks',
+                         'shared_memory', 'instance_cache', 'cache_dir', 'cache_max_mb', 'initial_solution_cache'}
+
+
+def huella_parametros(params):
+    """Resumen de los parámetros que influyen en el resultado de una ejecución."""
+    relevantes = sorted((clave, valor) for clave, valor in params.items() if clave not in PARAMETROS_SIN_EFECTO)
+    return hashlib.sha1(repr(relevantes).encode()).hexdigest()[:16]
+
+
+def _guardar_npz(nombre_archivo, **arrays):
+    """Escribe un .npz de forma atómica (archivo temporal y renombrado)."""
+    temporal = nombre_archivo + '.tmp'
+    with open(temporal, 'wb') as archivo:
+        np.savez(archivo, **arrays)
+    os.replace(temporal, nombre_archivo)
+
+
+def _cargar_npz(nombre_archivo):
+    """Carga todos los arrays de un .npz en un diccionario, o devuelve None si no existe."""
+    if not os.path.exists(nombre_archivo):
+        return None
+    with np.load(nombre_archivo) as datos:
+        return {clave: datos[clave] for clave in datos.files}
+
+
+def _misma_huella(datos, huella):
+    """Indica si un archivo cargado se guardó con la huella de parámetros indicada."""
+    return 'huella' in datos and str(datos['huella']) == huella
+
+
+def estado_rng():
+    """Estado del módulo random como arrays (versión, palabras del Mersenne Twister y gauss_next)."""
+    version, palabras, gauss = random.getstate()
+    return {'rng_version': np.int64(version),
+            'rng_palabras': np.array(palabras, dtype=np.uint64),
+            'rng_gauss': np.float64(np.nan if gauss is None else gauss)}
+
+
+def restaurar_rng(estado):
+    """Restaura el módulo random a partir de un estado guardado con estado_rng."""
+    gauss = float(estado['rng_gauss'])
+    random.setstate((int(estado['rng_version']), tuple(int(p) for p in estado['rng_palabras']),
+                     None if np.isnan(gauss) else gauss))
+
+
+class Checkpoint:
+    """
+    Punto de control periódico de una ejecución.
+
+    Args:
+        nombre_archivo (str): Ruta del archivo .npz.
+        intervalo (float): Segundos entre dos puntos de control.
+        reanudar (bool, optional): Si es False se ignora el punto de control que haya de una ejecución anterior.
+        huella (str, optional): Huella de los parámetros (huella_parametros); se ignora el punto de control
+            guardado con otra.
+    """
+
+    def __init__(self, nombre_archivo, intervalo, reanudar=True, huella=''):
+        self.nombre_archivo = nombre_archivo
+        self.intervalo = intervalo
+        self.reanudar = reanudar
+        self.huella = huella
+        self._siguiente = time.monotonic() + intervalo
+        self._hasta_reloj = INTERVALO_RELOJ
+
+    def pendiente(self):
+        """Indica si toca guardar un punto de control (el reloj se consulta una vez cada INTERVALO_RELOJ llamadas)."""
+        self._hasta_reloj -= 1
+        if self._hasta_reloj > 0:
+            return False
+        self._hasta_reloj = INTERVALO_RELOJ
+        return time.monotonic() >= self._siguiente
+
+    def guardar(self, **estado):
+        """
+        Guarda el estado de la búsqueda junto con el del generador aleatorio.
+
+        :param estado: Arrays y escalares con nombre que describen el estado de la búsqueda.
+        """
+        _guardar_npz(self.nombre_archivo, **estado, **estado_rng(), huella=np.str_(self.huella))
+        self._siguiente = time.monotonic() + self.intervalo
+
+    def cargar(self):
+        """
+        Carga el último punto de control (si se reanuda) y restaura el generador aleatorio.
+
+        :return: Diccionario con el estado guardado, o None si no hay nada que reanudar (o se guardó con
+                 otros parámetros).
+        """
+        estado = _cargar_npz(self.nombre_archivo) if self.reanudar else None
+        if estado is not None and not _misma_huella(estado, self.huella):
+            estado = None
+        if estado is not None:
+            restaurar_rng(estado)
+        return estado
+
+    def eliminar(self):
+        """Borra el punto de control al terminar la ejecución."""
+        if os.path.exists(self.nombre_archivo):
+            os.remove(self.nombre_archivo)
+
+
+def guardar_resultado(nombre_archivo, resultado, recorrido, huella=''):
+    """
+    Guarda el resultado de una ejecución terminada.
+
+    :param nombre_archivo: Ruta del archivo .npz.
+    :param resultado: Diccionario con 'semilla', 'distancia' y 'tiempo'.
+    :param recorrido: Recorrido obtenido (con la ciudad inicial repetida al final).
+    :param huella: Huella de los parámetros con los que se obtuvo (huella_parametros).
+    """
+    _guardar_npz(nombre_archivo, recorrido=np.asarray(recorrido, dtype=np.int32), semilla=resultado['semilla'],
+                 distancia=resultado['distancia'], tiempo=resultado['tiempo'], huella=np.str_(huella))
+
+
+def cargar_resultado(nombre_archivo, huella=''):
+    """
+    Carga el resultado de una ejecución terminada.
+
+    :param nombre_archivo: Ruta del archivo .npz.
+    :param huella: Huella de los parámetros actuales (huella_parametros).
+    :return: Tupla (resultado, recorrido) o None si la ejecución no se terminó o se obtuvo con otros parámetros.
+    """
+    datos = _cargar_npz(nombre_archivo)
+    if datos is None or not _misma_huella(datos, huella):
+        return None
+    resultado = {'semilla': int(datos['semilla']), 'distancia': datos['distancia'].item(),
+                 'tiempo': float(datos['tiempo'])}
+    return resultado, datos['recorrido'].tolist()
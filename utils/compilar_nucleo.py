@@ -0,0 +1,25 @@
+# utils/compilar_nucleo.py
+#
+# Compila el núcleo opcional utils/_nucleo.pyx y deja el módulo junto a él, en el directorio utils
+# (necesita Cython y un compilador de C). Sin él, utils/nucleo.py usa las versiones en Python.
+#
+# Uso: python -m utils.compilar_nucleo
+
+import os, tempfile
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+
+def main():
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    # El código C generado y los objetos intermedios no se quedan en el repositorio
+    with tempfile.TemporaryDirectory() as temporal:
+        extension = Extension('utils._nucleo', ['utils/_nucleo.pyx'], extra_compile_args=['-O3'])
+        setup(name='nucleo', ext_modules=cythonize([extension], build_dir=temporal, quiet=True),
+              script_args=['build_ext', '--inplace', '--build-temp', temporal, '--build-lib', temporal])
+
+
+if __name__ == '__main__':
+    main()
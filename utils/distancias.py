@@ -0,0 +1,273 @@
+# utils/distancias.py
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from scipy.spatial.distance import cdist
+
+from utils.perfilado import cronometrar
+
+
+# Por encima de este número de ciudades no se construye la matriz densa
+UMBRAL_MATRIZ_DENSA = 5000
+
+# Máximo de distancias que se calculan a la vez al sumar las filas del oráculo (32 MB en float64)
+MAX_ELEMENTOS_SUMA = 1 << 22
+
+# Tipos de distancia: los de TSPLIB (enteros) y la euclídea sin redondear
+TIPOS_ENTEROS = ('EUC_2D', 'CEIL_2D', 'ATT', 'GEO')
+EUCLIDEA = 'EUCLIDEA'
+
+# Constantes de la distancia GEO definidas por TSPLIB
+PI_TSPLIB = 3.141592
+RADIO_TIERRA = 6378.388
+
+
+def resolver_tipo_distancia(configurado, tipo_archivo):
+    """
+    Decide qué métrica usar a partir del parámetro distance_type y del EDGE_WEIGHT_TYPE del archivo.
+
+    :param configurado: 'tsplib' (usar la del archivo), 'euclidea' o un tipo TSPLIB concreto.
+    :param tipo_archivo: EDGE_WEIGHT_TYPE leído del archivo (puede ser None).
+    :return: Uno de TIPOS_ENTEROS o EUCLIDEA.
+    :raises ValueError: Si el tipo no está soportado.
+    """
+    tipo = (tipo_archivo or 'EUC_2D') if configurado.lower() == 'tsplib' else configurado.upper()
+    if tipo not in TIPOS_ENTEROS and tipo != EUCLIDEA:
+        raise ValueError(f"Tipo de distancia '{tipo}' no soportado.")
+    return tipo
+
+
+def coordenadas_geo(coordenadas):
+    """Convierte coordenadas GEO de TSPLIB (grados.minutos) a latitud y longitud en radianes."""
+    grados = np.trunc(coordenadas)
+    minutos = coordenadas - grados
+    return PI_TSPLIB * (grados + 5.0 * minutos / 3.0) / 180.0
+
+
+def distancias_tsplib(origenes, destinos, tipo):
+    """
+    Distancias vectorizadas entre dos arrays de coordenadas (..., 2) según la métrica de TSPLIB.
+
+    Para GEO las coordenadas deben venir ya convertidas con coordenadas_geo.
+
+    :param origenes: Coordenadas de origen.
+    :param destinos: Coordenadas de destino (mismo número de filas o difundibles).
+    :param tipo: Uno de TIPOS_ENTEROS o EUCLIDEA.
+    :return: Array de int32 para las métricas enteras y de float64 para EUCLIDEA.
+    """
+    if tipo == 'GEO':
+        q1 = np.cos(origenes[..., 1] - destinos[..., 1])
+        q2 = np.cos(origenes[..., 0] - destinos[..., 0])
+        q3 = np.cos(origenes[..., 0] + destinos[..., 0])
+        argumento = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        distancias = (RADIO_TIERRA * np.arccos(argumento) + 1.0).astype(np.int32)
+
+        # La distancia de una ciudad a sí misma es 0 (la fórmula daría 1)
+        iguales = np.all(origenes == destinos, axis=-1)
+        return np.where(iguales, 0, distancias).astype(np.int32)
+
+    diferencia = origenes - destinos
+    return transformar_euclidea(np.hypot(diferencia[..., 0], diferencia[..., 1]), tipo)
+
+
+def transformar_euclidea(euclidea, tipo):
+    """Aplica el redondeo de cada métrica de TSPLIB a distancias euclídeas ya calculadas."""
+    if tipo == 'EUC_2D':
+        return np.floor(euclidea + 0.5).astype(np.int32)
+    if tipo == 'CEIL_2D':
+        return np.ceil(euclidea).astype(np.int32)
+    if tipo == 'ATT':
+        r = euclidea / math.sqrt(10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1, t).astype(np.int32)
+    return euclidea
+
+
+def _filas_distancias(coordenadas, inicio, fin, tipo):
+    """Bloque de filas [inicio, fin) de la matriz de distancias."""
+    if tipo == 'GEO':
+        return distancias_tsplib(coordenadas[inicio:fin, None, :], coordenadas[None, :, :], tipo)
+    return transformar_euclidea(cdist(coordenadas[inicio:fin], coordenadas, metric='euclidean'), tipo)
+
+
+class OraculoDistancias:
+    """
+    Oráculo de distancias calculadas bajo demanda a partir de las coordenadas.
+
+    Se comporta como una matriz de distancias de solo lectura (admite ``oraculo[a, b]``,
+    ``oraculo[a][b]``, ``len(oraculo)`` y ``oraculo.shape``) sin reservar las n x n celdas.
+    Las filas completas se calculan por bloques y se guardan en una caché LRU acotada.
+
+    Args:
+        coordenadas (array-like): Coordenadas de las ciudades con forma (n, 2).
+        dtype (numpy.dtype, optional): Tipo de las filas calculadas para EUCLIDEA (float64 o float32).
+        tamanio_bloque (int, optional): Número de filas que se calculan de una vez.
+        max_bloques (int, optional): Número de bloques que se mantienen en caché (0 la desactiva).
+        tipo (str, optional): Métrica (uno de TIPOS_ENTEROS o EUCLIDEA).
+    """
+
+    def __init__(self, coordenadas, dtype=np.float64, tamanio_bloque=256, max_bloques=0, tipo=EUCLIDEA):
+        self.coordenadas = np.ascontiguousarray(coordenadas, dtype=np.float64)
+        self.tipo = tipo
+        self.n = self.coordenadas.shape[0]
+        self.shape = (self.n, self.n)
+        self.dtype = np.dtype(np.int32 if tipo in TIPOS_ENTEROS else dtype)
+        self.tamanio_bloque = tamanio_bloque
+        self.max_bloques = max_bloques
+        self._bloques = OrderedDict()
+
+        # Para GEO se trabaja directamente con latitud y longitud en radianes
+        self._puntos = coordenadas_geo(self.coordenadas) if tipo == 'GEO' else self.coordenadas
+
+        # Listas de Python para que el acceso escalar no cree escalares de numpy
+        self._xs = self._puntos[:, 0].tolist()
+        self._ys = self._puntos[:, 1].tolist()
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, clave):
+        if isinstance(clave, tuple):
+            a, b = clave
+            if np.isscalar(a) and np.isscalar(b):
+                return self.distancia(a, b)
+            return self.distancias(a, b)
+        return self.fila(clave)
+
+    def distancia(self, a, b):
+        """Distancia entre las ciudades a y b."""
+        tipo = self.tipo
+        if tipo == 'GEO':
+            if a == b:
+                return 0
+            q1 = math.cos(self._ys[a] - self._ys[b])
+            q2 = math.cos(self._xs[a] - self._xs[b])
+            q3 = math.cos(self._xs[a] + self._xs[b])
+            argumento = min(1.0, max(-1.0, 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)))
+            return int(RADIO_TIERRA * math.acos(argumento) + 1.0)
+
+        euclidea = math.hypot(self._xs[a] - self._xs[b], self._ys[a] - self._ys[b])
+        if tipo == EUCLIDEA:
+            return euclidea
+        if tipo == 'EUC_2D':
+            return int(euclidea + 0.5)
+        if tipo == 'CEIL_2D':
+            return math.ceil(euclidea)
+
+        # ATT (pseudo-euclídea)
+        r = euclidea / math.sqrt(10.0)
+        t = int(r + 0.5)
+        return t + 1 if t < r else t
+
+    def distancias(self, origenes, destinos):
+        """Distancias elemento a elemento entre dos arrays de índices de ciudades."""
+        return distancias_tsplib(self._puntos[origenes], self._puntos[destinos], self.tipo).astype(self.dtype, copy=False)
+
+    def bloque(self, indice_bloque):
+        """Devuelve las filas [inicio, fin) del bloque indicado, usando la caché si está activa."""
+        filas = self._bloques.get(indice_bloque)
+        if filas is not None:
+            self._bloques.move_to_end(indice_bloque)
+            return filas
+
+        inicio = indice_bloque * self.tamanio_bloque
+        fin = min(inicio + self.tamanio_bloque, self.n)
+        filas = _filas_distancias(self._puntos, inicio, fin, self.tipo).astype(self.dtype, copy=False)
+
+        if self.max_bloques > 0:
+            self._bloques[indice_bloque] = filas
+            if len(self._bloques) > self.max_bloques:
+                self._bloques.popitem(last=False)
+
+        return filas
+
+    def fila(self, a):
+        """Fila completa de distancias desde la ciudad a."""
+        indice_bloque, desplazamiento = divmod(int(a), self.tamanio_bloque)
+        return self.bloque(indice_bloque)[desplazamiento]
+
+    def sumas_filas(self):
+        """
+        Suma de las distancias de cada ciudad al resto, calculada bloque a bloque.
+
+        Los bloques tienen como mucho MAX_ELEMENTOS_SUMA distancias, así que la memoria temporal no crece
+        con el tamaño de la instancia (cada fila se suma igual sea cual sea el bloque en que se calcula).
+        """
+        sumas = np.empty(self.n, dtype=np.float64)
+        filas_bloque = max(1, MAX_ELEMENTOS_SUMA // self.n)
+        for inicio in range(0, self.n, filas_bloque):
+            fin = min(inicio + filas_bloque, self.n)
+            sumas[inicio:fin] = np.sum(_filas_distancias(self._puntos, inicio, fin, self.tipo), axis=1)
+        return sumas
+
+
+@cronometrar('crear_matriz_distancias')
+def crear_matriz_distancias(coordenadas, umbral_densa=UMBRAL_MATRIZ_DENSA, dtype=np.float64, max_bloques=0,
+                            tipo=EUCLIDEA):
+    """
+    Crea la estructura de distancias más adecuada para el tamaño del problema.
+
+    Para instancias pequeñas se devuelve la matriz densa (acceso más rápido); para las grandes se
+    devuelve un OraculoDistancias que calcula las distancias bajo demanda. Las métricas de TSPLIB
+    producen enteros, que se guardan en int32 (la mitad de memoria que float64 y deltas exactos).
+
+    :param coordenadas: Coordenadas de las ciudades con forma (n, 2).
+    :param umbral_densa: Máximo número de ciudades para usar la matriz densa.
+    :param dtype: Tipo de los valores para EUCLIDEA (float64 o float32).
+    :param max_bloques: Bloques de filas que el oráculo mantiene en caché.
+    :param tipo: Métrica (uno de TIPOS_ENTEROS o EUCLIDEA).
+    :return: numpy.ndarray o OraculoDistancias.
+    """
+    coordenadas_array = np.asarray(coordenadas, dtype=np.float64)
+
+    if len(coordenadas_array) > umbral_densa:
+        return OraculoDistancias(coordenadas_array, dtype=dtype, max_bloques=max_bloques, tipo=tipo)
+
+    if tipo == EUCLIDEA:
+        return cdist(coordenadas_array, coordenadas_array, metric='euclidean').astype(dtype, copy=False)
+
+    puntos = coordenadas_geo(coordenadas_array) if tipo == 'GEO' else coordenadas_array
+    return _filas_distancias(puntos, 0, len(puntos), tipo)
+
+
+def sumas_distancias(matriz_distancias):
+    """Suma de las distancias de cada ciudad al resto, sin materializar la matriz si es un oráculo."""
+    if isinstance(matriz_distancias, OraculoDistancias):
+        return matriz_distancias.sumas_filas()
+    return np.sum(matriz_distancias, axis=1, dtype=np.float64)
+
+
+def distancias_centroide(coordenadas):
+    """Distancia euclídea de cada ciudad al centroide de todas, en O(n) tiempo y memoria."""
+    coordenadas_array = np.asarray(coordenadas, dtype=np.float64)
+    diferencia = coordenadas_array - coordenadas_array.mean(axis=0)
+    return np.hypot(diferencia[:, 0], diferencia[:, 1])
+
+
+def centralidades(matriz_distancias, modo='exacta', coordenadas=None):
+    """
+    Puntuación de cada ciudad con la que greedy_aleatorio ordena las más prometedoras (menor es mejor).
+
+    - 'exacta': suma de las distancias al resto (sumas_distancias), O(n²) en tiempo.
+    - 'centroide': distancia al centroide de las coordenadas, que ordena las ciudades de forma parecida
+      (las centrales primero) en O(n).
+
+    :param matriz_distancias: Matriz u oráculo de distancias entre las ciudades.
+    :param modo: 'exacta' o 'centroide'.
+    :param coordenadas: Coordenadas de las ciudades (para 'centroide'; un oráculo ya las tiene).
+    :return: Array de float64 con la puntuación de cada ciudad.
+    :raises ValueError: Si el modo no está soportado o faltan las coordenadas.
+    """
+    if modo == 'exacta':
+        return sumas_distancias(matriz_distancias)
+    if modo != 'centroide':
+        raise ValueError(f"Centralidad '{modo}' no soportada.")
+
+    if coordenadas is None:
+        if not isinstance(matriz_distancias, OraculoDistancias):
+            raise ValueError("La centralidad 'centroide' necesita las coordenadas de las ciudades.")
+        coordenadas = matriz_distancias.coordenadas
+    return distancias_centroide(coordenadas)
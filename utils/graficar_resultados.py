@@ -1,8 +1,12 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from utils.traza import leer_traza
+from utils.perfilado import cronometrar
+
 
 # Función para graficar los resultados
+@cronometrar('graficos')
 def generar_graficos(resultados, algoritmo, tsp_file):
     distancias = [res['distancia'] for res in resultados]
     tiempos = [res['tiempo'] for res in resultados]
@@ -29,8 +33,20 @@ def generar_graficos(resultados, algoritmo, tsp_file):
     plt.close()
 
 
+# Función para escribir los tiempos por fase y los contadores de un perfil
+def escribir_perfil(f, perfil):
+    f.write("Tiempo por fase:\n")
+    for fase, datos in sorted(perfil['fases'].items(), key=lambda item: -item[1]['segundos']):
+        f.write(f"  {fase}: {datos['segundos']:.4f} segundos ({datos['llamadas']} llamadas)\n")
+    if perfil['contadores']:
+        f.write("Contadores:\n")
+        for contador, valor in sorted(perfil['contadores'].items()):
+            f.write(f"  {contador}: {valor}\n")
+
+
 # Función para guardar estadísticas generales en un archivo
-def guardar_estadisticas_generales(estadisticas, tsp_file):
+@cronometrar('graficos')
+def guardar_estadisticas_generales(estadisticas, tsp_file, perfil_instancia=None):
     with open(f'result/estadisticas_{tsp_file}.txt', 'w') as f:
         for algoritmo, stats in estadisticas.items():
             f.write(f"Algoritmo: {algoritmo}\n")
@@ -40,10 +56,18 @@ def guardar_estadisticas_generales(estadisticas, tsp_file):
             f.write(f"Tiempo promedio: {np.mean(stats['tiempos']):.4f} segundos\n")
             f.write(f"Tiempo mínimo: {np.min(stats['tiempos']):.4f} segundos\n")
             f.write(f"Tiempo máximo: {np.max(stats['tiempos']):.4f} segundos\n")
+            if stats.get('perfil'):
+                escribir_perfil(f, stats['perfil'])
             f.write("\n")
 
+        # Preparación de la instancia y gráficos (comunes a todos los algoritmos)
+        if perfil_instancia:
+            f.write("Instancia (preparación y gráficos)\n")
+            escribir_perfil(f, perfil_instancia)
+
 
 # Función para generar boxplots de distancias y tiempos
+@cronometrar('graficos')
 def generar_boxplot(resultados, algoritmo, tsp_file):
     distancias = [res['distancia'] for res in resultados]
     tiempos = [res['tiempo'] for res in resultados]
@@ -63,3 +87,22 @@ def generar_boxplot(resultados, algoritmo, tsp_file):
     plt.ylabel('Tiempo de ejecución (segundos)')
     plt.savefig(f'result/{algoritmo}_{tsp_file}_boxplot_tiempo.png')
     plt.close()
+
+
+# Función para graficar la convergencia de cada ejecución a partir de sus trazas binarias
+@cronometrar('graficos')
+def generar_grafico_convergencia(resultados, algoritmo, tsp_file):
+    plt.figure()
+    for res in resultados:
+        if not res.get('traza'):
+            continue
+        traza = leer_traza(res['traza'])
+        if len(traza):
+            plt.plot(traza['iteracion'], traza['mejor'], label=f"Semilla {res['semilla']}")
+    plt.title(f'Convergencia - {algoritmo} - {tsp_file}')
+    plt.xlabel('Iteración')
+    plt.ylabel('Mejor distancia')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(f'result/{algoritmo}_{tsp_file}_convergencia.png')
+    plt.close()
@@ -0,0 +1,113 @@
+# utils/lin_kernighan.py
+#
+# Movimiento de profundidad variable al estilo Lin-Kernighan, construido como una cadena de 2-opt.
+#
+# Partiendo de t1 y de un vecino t2 en el tour se elimina (t1, t2) y se añade (t2, t3) hacia un candidato
+# de t2; para cerrar el ciclo se elimina (t3, t4) y se añade (t4, t1), lo que equivale a un 2-opt. En el
+# siguiente nivel la arista de cierre (t1, t4) se vuelve a romper con t4 como nuevo t2, y así hasta la
+# profundidad máxima. Se guarda la ganancia acumulada y, al terminar, se deshacen los 2-opt posteriores al
+# mejor cierre. Las aristas añadidas no pueden volver a quitarse ni las quitadas volver a añadirse.
+
+from utils.busqueda_dlb import BusquedaLocalDLB, EPSILON
+
+
+def _arista(a, b):
+    return (a, b) if a < b else (b, a)
+
+
+class LinKernighan(BusquedaLocalDLB):
+    """
+    Motor Lin-Kernighan con listas de candidatos, profundidad acotada y evaluación por deltas.
+
+    Reutiliza el tour cíclico y la cola de don't-look bits de BusquedaLocalDLB; además del operador 'lk'
+    puede combinarse con los de la búsqueda exhaustiva (por defecto Or-opt).
+
+    Args:
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        candidatos (numpy.ndarray): Lista de candidatos (k vecinos más cercanos, ordenados) de cada ciudad.
+        profundidad (int, optional): Número máximo de 2-opt encadenados en un movimiento.
+        amplitud (int, optional): Alternativas que se prueban en el primer nivel (en los siguientes, solo la mejor).
+        operadores (tuple, optional): Operadores a usar ('lk' y los de OPERADORES_DLB).
+    """
+
+    def __init__(self, matriz_distancias, candidatos, profundidad=50, amplitud=5, operadores=('lk', 'oropt')):
+        super().__init__(matriz_distancias, candidatos, operadores)
+        self.profundidad = profundidad
+        self.amplitud = amplitud
+
+    def _siguientes_lk(self, t1, t2, ganancia, anadidas, quitadas):
+        """
+        Posibles continuaciones (t3, t4) desde t2, ordenadas por ganancia parcial decreciente.
+
+        t4 es el vecino de t3 que hace que quitar (t1, t2) y (t3, t4) y añadir (t2, t3) y (t4, t1) sea un 2-opt válido.
+        """
+        d = self.matriz
+        adelante = self.sucesor(t1) == t2
+        opciones = []
+        for t3 in self.vecinos[t2]:
+            g1 = ganancia - d[t2, t3]
+            if g1 <= EPSILON:
+                break
+            if t3 == t1 or t3 == self.sucesor(t2) or t3 == self.predecesor(t2):
+                continue
+            t4 = self.predecesor(t3) if adelante else self.sucesor(t3)
+            if t4 == t1 or _arista(t2, t3) in quitadas or _arista(t3, t4) in anadidas:
+                continue
+            opciones.append((g1 + d[t3, t4], t3, t4))
+
+        opciones.sort(reverse=True)
+        return opciones
+
+    def _cadena_lk(self, t1, t2, t3, t4, ganancia):
+        """
+        Encadena 2-opt a partir del primer paso (t3, t4) y se queda con el mejor cierre.
+
+        :return: Delta del movimiento aplicado o None si ningún cierre mejora (el tour queda como estaba).
+        """
+        d = self.matriz
+        volteos = []
+        anadidas = set()
+        quitadas = {_arista(t1, t2)}
+        mejor_delta = 0.0
+        mejor_nivel = 0
+
+        for _ in range(self.profundidad):
+            anadidas.add(_arista(t2, t3))
+            quitadas.add(_arista(t3, t4))
+            ganancia += d[t3, t4] - d[t2, t3]
+
+            # Quitar (t1, t2) y (t4, t3) y añadir (t1, t4) y (t2, t3)
+            self.tour.intercambiar_aristas(t1, t2, t4, t3)
+            volteos.append((t1, t2, t4, t3))
+
+            delta = d[t4, t1] - ganancia
+            if delta < mejor_delta - EPSILON:
+                mejor_delta, mejor_nivel = delta, len(volteos)
+
+            # La arista de cierre (t1, t4) se rompe en el siguiente nivel
+            t2 = t4
+            opciones = self._siguientes_lk(t1, t2, ganancia, anadidas, quitadas)
+            if not opciones:
+                break
+            _, t3, t4 = opciones[0]
+
+        # Deshacer los 2-opt posteriores al mejor cierre
+        for a, b, c, e in reversed(volteos[mejor_nivel:]):
+            self.tour.intercambiar_aristas(a, c, b, e)
+
+        if mejor_nivel == 0:
+            return None
+
+        for a, b, c, e in volteos[:mejor_nivel]:
+            self._activar(a, b, c, e)
+        return mejor_delta
+
+    def _mejorar_lk(self, t1):
+        d = self.matriz
+        for t2 in (self.sucesor(t1), self.predecesor(t1)):
+            ganancia = d[t1, t2]
+            for _, t3, t4 in self._siguientes_lk(t1, t2, ganancia, set(), {_arista(t1, t2)})[:self.amplitud]:
+                delta = self._cadena_lk(t1, t2, t3, t4, ganancia)
+                if delta is not None:
+                    return delta
+        return None
@@ -0,0 +1,139 @@
+# utils/memoria_compartida.py
+
+import hashlib
+import json
+import time
+
+import numpy as np
+
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+
+# Bytes reservados al principio de cada segmento para describir el array (dtype y forma)
+TAMANIO_CABECERA = 128
+
+# Segmentos abiertos por este proceso: nombre -> (SharedMemory, creado_aqui)
+_segmentos = {}
+
+
+def nombre_segmento(*partes):
+    """
+    Construye un nombre corto y estable de segmento a partir de las partes que identifican el array
+    (instancia, tipo de estructura y parámetros con los que se construye).
+    """
+    resumen = hashlib.sha1(repr(partes).encode()).hexdigest()[:16]
+    return f"tsp_{resumen}"
+
+
+def _abrir(nombre):
+    """Abre un segmento existente sin que el resource_tracker lo borre al terminar este proceso."""
+    try:
+        return SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # Python < 3.13 no admite track: se evita el registro mientras se abre el segmento
+        # (deshacerlo después borraría también el registro del proceso que lo creó)
+        registrar = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return SharedMemory(name=nombre)
+        finally:
+            resource_tracker.register = registrar
+
+
+def _vista(segmento, espera_maxima=60.0):
+    """Devuelve el array de numpy que vive en el segmento, sin copiarlo."""
+    # La cabecera se escribe después de los datos: mientras esté vacía el creador sigue copiando
+    limite = time.monotonic() + espera_maxima
+    cabecera = bytes(segmento.buf[:TAMANIO_CABECERA]).rstrip(b'\0')
+    while not cabecera:
+        if time.monotonic() > limite:
+            raise TimeoutError(f"El segmento '{segmento.name}' no se ha terminado de publicar.")
+        time.sleep(0.01)
+        cabecera = bytes(segmento.buf[:TAMANIO_CABECERA]).rstrip(b'\0')
+
+    descripcion = json.loads(cabecera)
+    return np.ndarray(tuple(descripcion['forma']), dtype=np.dtype(descripcion['dtype']),
+                      buffer=segmento.buf, offset=TAMANIO_CABECERA)
+
+
+def publicar_array(nombre, array):
+    """
+    Copia un array a un segmento de memoria compartida nuevo.
+
+    :param nombre: Nombre del segmento.
+    :param array: Array de numpy a publicar.
+    :return: Vista de solo lectura del array dentro del segmento.
+    :raises FileExistsError: Si otro proceso ya ha publicado un segmento con ese nombre.
+    """
+    array = np.ascontiguousarray(array)
+    cabecera = json.dumps({'dtype': array.dtype.str, 'forma': list(array.shape)}).encode()
+
+    segmento = SharedMemory(name=nombre, create=True, size=TAMANIO_CABECERA + max(array.nbytes, 1))
+    _segmentos[nombre] = (segmento, True)
+
+    # Primero los datos y después la cabecera, que marca el segmento como listo
+    vista = np.ndarray(array.shape, dtype=array.dtype, buffer=segmento.buf, offset=TAMANIO_CABECERA)
+    vista[...] = array
+    vista.flags.writeable = False
+    segmento.buf[:len(cabecera)] = cabecera
+    return vista
+
+
+def adjuntar_array(nombre):
+    """
+    Se une a un array publicado por otro proceso (sin copiarlo).
+
+    :param nombre: Nombre del segmento.
+    :return: Vista de solo lectura del array.
+    :raises FileNotFoundError: Si nadie ha publicado todavía el segmento.
+    """
+    if nombre in _segmentos:
+        segmento = _segmentos[nombre][0]
+    else:
+        segmento = _abrir(nombre)
+        _segmentos[nombre] = (segmento, False)
+
+    vista = _vista(segmento)
+    vista.flags.writeable = False
+    return vista
+
+
+def obtener_array_compartido(nombre, constructor):
+    """
+    Devuelve el array compartido con ese nombre; si aún no existe, lo construye y lo publica.
+
+    :param nombre: Nombre del segmento (ver nombre_segmento).
+    :param constructor: Función sin argumentos que construye el array.
+    :return: Vista de solo lectura del array en memoria compartida.
+    """
+    try:
+        return adjuntar_array(nombre)
+    except FileNotFoundError:
+        pass
+
+    array = constructor()
+    try:
+        return publicar_array(nombre, array)
+    except FileExistsError:
+        # Otro proceso lo ha publicado mientras lo construíamos
+        return adjuntar_array(nombre)
+
+
+def liberar_arrays_compartidos(nombres=None):
+    """
+    Cierra los segmentos indicados (todos si no se indica ninguno) y borra los que creó este proceso.
+
+    Los procesos que sigan unidos a un segmento borrado conservan su vista hasta que lo cierren.
+    """
+    for nombre in list(_segmentos if nombres is None else nombres):
+        if nombre not in _segmentos:
+            continue
+        segmento, creado_aqui = _segmentos.pop(nombre)
+        try:
+            segmento.close()
+        except BufferError:
+            # Aún hay vistas de numpy sobre el segmento: se libera al terminar el proceso
+            pass
+        if creado_aqui:
+            segmento.unlink()
@@ -0,0 +1,65 @@
+# utils/memoria_largo_plazo.py
+
+import numpy as np
+
+
+class MemoriaLargoPlazo:
+    """
+    Memoria a largo plazo basada en la frecuencia de las aristas que introduce la búsqueda.
+
+    Con lista de candidatos solo se cuentan las aristas entre una ciudad y sus k vecinos más cercanos
+    (matriz (n, k)), de modo que la memoria crece en O(n·k) aunque la instancia sea grande; las aristas
+    fuera de la lista de candidatos cuentan como frecuencia 0. Sin candidatos se usa una matriz densa (n, n).
+
+    Args:
+        n_ciudades (int): Número de ciudades del problema.
+        candidatos (numpy.ndarray, optional): Lista de candidatos (k vecinos más cercanos) de cada ciudad.
+    """
+
+    def __init__(self, n_ciudades, candidatos=None):
+        self.candidatos = None if candidatos is None else np.asarray(candidatos)
+        if self.candidatos is None:
+            self.frecuencias = np.zeros((n_ciudades, n_ciudades), dtype=np.int32)
+        else:
+            self.frecuencias = np.zeros(self.candidatos.shape, dtype=np.int32)
+        self.maximo = 0
+
+    def _incrementar(self, a, b):
+        """Suma 1 a la arista a -> b si está representada en la memoria."""
+        if self.candidatos is None:
+            self.frecuencias[a, b] += 1
+            return self.frecuencias[a, b]
+
+        columnas = np.flatnonzero(self.candidatos[a] == b)
+        if columnas.size == 0:
+            return 0
+        self.frecuencias[a, columnas[0]] += 1
+        return self.frecuencias[a, columnas[0]]
+
+    def registrar(self, a, b):
+        """Registra que la búsqueda ha introducido la arista (a, b)."""
+        frecuencia = max(self._incrementar(a, b), self._incrementar(b, a))
+        if frecuencia > self.maximo:
+            self.maximo = int(frecuencia)
+
+    def frecuencias_aristas(self, origenes, destinos):
+        """
+        Frecuencia de cada arista (origenes[t], destinos[t]), vectorizada.
+
+        :param origenes: Array de ciudades de origen.
+        :param destinos: Array de ciudades de destino (misma longitud).
+        :return: Array de int32 con la frecuencia de cada arista.
+        """
+        origenes = np.asarray(origenes)
+        destinos = np.asarray(destinos)
+        if self.candidatos is None:
+            return self.frecuencias[origenes, destinos]
+
+        # La arista se encuentra en la fila de cualquiera de sus dos extremos
+        directa = np.sum(self.frecuencias[origenes] * (self.candidatos[origenes] == destinos[:, None]), axis=1)
+        inversa = np.sum(self.frecuencias[destinos] * (self.candidatos[destinos] == origenes[:, None]), axis=1)
+        return np.maximum(directa, inversa)
+
+    def frecuencias_normalizadas(self, origenes, destinos):
+        """Frecuencias de frecuencias_aristas escaladas a [0, 1] respecto a la arista más frecuente."""
+        return self.frecuencias_aristas(origenes, destinos) / max(1, self.maximo)
@@ -0,0 +1,41 @@
+# utils/memoria_tabu.py
+
+import numpy as np
+
+
+class MemoriaTabu:
+    """
+    Memoria tabú a corto plazo basada en atributos de ciudad.
+
+    Cada vez que se aplica un movimiento, las ciudades que lo definen quedan prohibidas durante
+    `tenencia` iteraciones. Se guarda la iteración hasta la que cada ciudad es tabú, por lo que
+    comprobar y registrar un atributo es O(1) y las prohibiciones caducan solas sin recorrer listas.
+
+    Args:
+        n_ciudades (int): Número de ciudades del problema.
+        tenencia (int): Iteraciones que un atributo permanece tabú.
+    """
+
+    def __init__(self, n_ciudades, tenencia):
+        self.tenencia = tenencia
+        self.prohibida_hasta = np.zeros(n_ciudades, dtype=np.int64)
+
+    def es_tabu(self, a, b, iteracion):
+        """Indica si un movimiento sobre las ciudades a y b está prohibido en esta iteración."""
+        return self.prohibida_hasta[a] > iteracion or self.prohibida_hasta[b] > iteracion
+
+    def mascara_tabu(self, a, b, iteracion):
+        """Versión vectorizada de es_tabu para arrays de ciudades."""
+        return (self.prohibida_hasta[a] > iteracion) | (self.prohibida_hasta[b] > iteracion)
+
+    def registrar(self, a, b, iteracion):
+        """Prohíbe las ciudades a y b durante las próximas `tenencia` iteraciones."""
+        self.prohibida_hasta[a] = iteracion + self.tenencia
+        self.prohibida_hasta[b] = iteracion + self.tenencia
+
+    def permitido(self, a, b, iteracion, nueva_distancia, distancia_aspiracion):
+        """
+        Criterio completo: un movimiento se permite si no es tabú o si cumple el criterio de aspiración
+        (mejora la mejor distancia encontrada hasta el momento).
+        """
+        return nueva_distancia < distancia_aspiracion or not self.es_tabu(a, b, iteracion)
@@ -0,0 +1,289 @@
+# utils/movimientos.py
+#
+# Motor de movimientos sobre un tour visto como lista con la ciudad inicial repetida al final
+# (tour[0] == tour[n - 1]), ya sea una lista o un Tour (utils/tour.py). Las posiciones 0 y n - 1 nunca se mueven.
+#
+# Un movimiento es una tupla (operador, i, j, longitud):
+#   - 'intercambio': intercambia las ciudades de las posiciones i < j.
+#   - '2opt': invierte el segmento tour[i..j] (i < j).
+#   - 'oropt': mueve el segmento tour[i..i + longitud - 1] entre las posiciones j y j + 1.
+#
+# Los deltas se calculan en O(1) sin construir el tour vecino; solo el movimiento aceptado se aplica (sobre un
+# Tour, actualizando únicamente las posiciones de las ciudades que se mueven).
+
+import random
+
+import numpy as np
+
+from utils.tour import Tour
+from utils.perfilado import cronometrar
+
+
+# Operadores de vecindario disponibles
+OPERADORES = ('intercambio', '2opt', 'oropt')
+
+# Longitud máxima del segmento que mueve Or-opt
+LONGITUD_MAX_OROPT = 3
+
+
+def delta_intercambio(tour, i, j, matriz_distancias):
+    """Variación de la distancia al intercambiar las ciudades de las posiciones i < j."""
+    a, b = tour[i], tour[j]
+    anterior_i, siguiente_j = tour[i - 1], tour[j + 1]
+
+    if i + 1 == j:
+        return (matriz_distancias[anterior_i, b] + matriz_distancias[a, siguiente_j]
+                - matriz_distancias[anterior_i, a] - matriz_distancias[b, siguiente_j])
+
+    siguiente_i, anterior_j = tour[i + 1], tour[j - 1]
+    return (matriz_distancias[anterior_i, b] + matriz_distancias[b, siguiente_i]
+            + matriz_distancias[anterior_j, a] + matriz_distancias[a, siguiente_j]
+            - matriz_distancias[anterior_i, a] - matriz_distancias[a, siguiente_i]
+            - matriz_distancias[anterior_j, b] - matriz_distancias[b, siguiente_j])
+
+
+def delta_2opt(tour, i, j, matriz_distancias):
+    """Variación de la distancia al invertir el segmento tour[i..j] (i < j)."""
+    anterior, primera, ultima, siguiente = tour[i - 1], tour[i], tour[j], tour[j + 1]
+    return (matriz_distancias[anterior, ultima] + matriz_distancias[primera, siguiente]
+            - matriz_distancias[anterior, primera] - matriz_distancias[ultima, siguiente])
+
+
+def delta_oropt(tour, i, j, longitud, matriz_distancias):
+    """Variación de la distancia al mover el segmento tour[i..i + longitud - 1] entre j y j + 1."""
+    fin = i + longitud - 1
+    anterior, primera, ultima, siguiente = tour[i - 1], tour[i], tour[fin], tour[fin + 1]
+    p, q = tour[j], tour[j + 1]
+    return (matriz_distancias[anterior, siguiente] + matriz_distancias[p, primera] + matriz_distancias[ultima, q]
+            - matriz_distancias[anterior, primera] - matriz_distancias[ultima, siguiente] - matriz_distancias[p, q])
+
+
+def evaluar_movimiento(tour, movimiento, matriz_distancias):
+    """Variación de la distancia que produce un movimiento, sin aplicarlo."""
+    operador, i, j, longitud = movimiento
+    if operador == '2opt':
+        return delta_2opt(tour, i, j, matriz_distancias)
+    if operador == 'oropt':
+        return delta_oropt(tour, i, j, longitud, matriz_distancias)
+    return delta_intercambio(tour, i, j, matriz_distancias)
+
+
+@cronometrar('aplicar_movimiento')
+def aplicar_movimiento(tour, movimiento):
+    """Aplica un movimiento sobre el tour (modificándolo en el sitio)."""
+    if isinstance(tour, Tour):
+        tour.aplicar(movimiento)
+        return
+
+    operador, i, j, longitud = movimiento
+    if operador == '2opt':
+        tour[i:j + 1] = tour[i:j + 1][::-1]
+    elif operador == 'oropt':
+        segmento = tour[i:i + longitud]
+        del tour[i:i + longitud]
+        destino = j + 1 if j < i else j + 1 - longitud
+        tour[destino:destino] = segmento
+    else:
+        tour[i], tour[j] = tour[j], tour[i]
+
+
+def aristas_nuevas(tour, movimiento):
+    """
+    Aristas que crea un movimiento, calculadas sobre el tour antes de aplicarlo.
+
+    Son las mismas aristas que suman en el delta de cada operador.
+
+    Args:
+        tour (list): Tour actual (sin aplicar el movimiento).
+        movimiento (tuple): Movimiento (operador, i, j, longitud).
+
+    Returns:
+        list: Pares (a, b) de ciudades unidas por el movimiento.
+    """
+    operador, i, j, longitud = movimiento
+    if operador == '2opt':
+        return [(tour[i - 1], tour[j]), (tour[i], tour[j + 1])]
+    if operador == 'oropt':
+        fin = i + longitud - 1
+        return [(tour[i - 1], tour[fin + 1]), (tour[j], tour[i]), (tour[fin], tour[j + 1])]
+
+    a, b = tour[i], tour[j]
+    if i + 1 == j:
+        return [(tour[i - 1], b), (b, a), (a, tour[j + 1])]
+    return [(tour[i - 1], b), (b, tour[i + 1]), (tour[j - 1], a), (a, tour[j + 1])]
+
+
+def movimiento_aleatorio(operador, n):
+    """
+    Genera un movimiento al azar sobre un tour de n posiciones (ciudad inicial repetida al final).
+
+    Args:
+        operador (str): 'intercambio', '2opt' u 'oropt'.
+        n (int): Longitud del tour.
+
+    Returns:
+        tuple: Movimiento (operador, i, j, longitud).
+    """
+    if operador == 'oropt':
+        longitud = random.randint(1, LONGITUD_MAX_OROPT)
+        i = random.randint(1, n - 1 - longitud)
+
+        # Punto de inserción fuera de [i - 1, i + longitud - 1]
+        j = random.randrange(n - 2 - longitud)
+        if j >= i - 1:
+            j += longitud + 1
+        return operador, i, j, longitud
+
+    i, j = sorted(random.sample(range(1, n - 1), 2))
+    return operador, i, j, 0
+
+
+def movimiento_candidato(operador, tour, candidatos):
+    """
+    Genera un movimiento que crea el arco entre una ciudad al azar y uno de sus candidatos.
+
+    Args:
+        operador (str): 'intercambio', '2opt' u 'oropt'.
+        tour (Tour): Recorrido actual.
+        candidatos (numpy.ndarray): Lista de candidatos (n, k) de cada ciudad.
+
+    Returns:
+        tuple: Movimiento (operador, i, j, longitud).
+    """
+    n = len(tour)
+    k_candidatos = candidatos.shape[1]
+    posicion = tour.indice
+
+    while True:
+        if operador == '2opt':
+            # Invertir el tramo entre la ciudad y su candidato deja ambos juntos
+            i = random.randint(0, n - 2)
+            j = posicion(candidatos[tour[i], random.randrange(k_candidatos)])
+            if j > i + 1:
+                return operador, i + 1, j, 0
+            if j + 1 < i:
+                return operador, j + 1, i, 0
+
+        elif operador == 'oropt':
+            # Mover un segmento que empieza en el candidato justo detrás de la ciudad
+            longitud = random.randint(1, LONGITUD_MAX_OROPT)
+            j = random.randint(0, n - 2)
+            i = posicion(candidatos[tour[j], random.randrange(k_candidatos)])
+            if i != 0 and i + longitud <= n - 1 and not i - 1 <= j <= i + longitud - 1:
+                return operador, i, j, longitud
+
+        else:
+            # Intercambiar la sucesora de la ciudad con su candidato
+            i = random.randint(1, n - 3)
+            j = posicion(candidatos[tour[i], random.randrange(k_candidatos)])
+            if j != 0 and j != i + 1:
+                i, j = sorted((i + 1, j))
+                return operador, i, j, 0
+
+
+def movimientos_aleatorios_lote(operador, n, cantidad, rng):
+    """
+    Genera de una vez `cantidad` movimientos al azar como arrays de numpy.
+
+    Args:
+        operador (str): 'intercambio', '2opt' u 'oropt'.
+        n (int): Longitud del tour.
+        cantidad (int): Número de movimientos.
+        rng (numpy.random.Generator): Generador de números aleatorios.
+
+    Returns:
+        tuple: Arrays (i, j, longitud) con un elemento por movimiento.
+    """
+    if operador == 'oropt':
+        longitud = rng.integers(1, LONGITUD_MAX_OROPT + 1, size=cantidad)
+        i = rng.integers(1, n - longitud)
+        j = rng.integers(0, n - 2 - longitud)
+        j = np.where(j >= i - 1, j + longitud + 1, j)
+        return i, j, longitud
+
+    i = rng.integers(1, n - 1, size=cantidad)
+    j = rng.integers(1, n - 2, size=cantidad)
+    j = j + (j >= i)
+    return np.minimum(i, j), np.maximum(i, j), np.zeros(cantidad, dtype=np.int64)
+
+
+def movimientos_candidatos_lote(operador, tour, candidatos, cantidad, rng):
+    """
+    Genera de una vez hasta `cantidad` movimientos basados en la lista de candidatos.
+
+    Los sorteos que no producen un movimiento válido se descartan, por lo que pueden devolverse menos.
+
+    Args:
+        operador (str): 'intercambio', '2opt' u 'oropt'.
+        tour (Tour): Recorrido actual.
+        candidatos (numpy.ndarray): Lista de candidatos (n, k) de cada ciudad.
+        cantidad (int): Número de sorteos.
+        rng (numpy.random.Generator): Generador de números aleatorios.
+
+    Returns:
+        tuple: Arrays (i, j, longitud) con un elemento por movimiento válido.
+    """
+    n = len(tour)
+    ciudad, posicion = tour.ciudades, tour.indices
+    columna = rng.integers(0, candidatos.shape[1], size=cantidad)
+
+    if operador == '2opt':
+        origen = rng.integers(0, n - 1, size=cantidad)
+        destino = posicion(candidatos[ciudad(origen), columna])
+        i = np.where(destino > origen, origen + 1, destino + 1)
+        j = np.where(destino > origen, destino, origen)
+        validos = i < j
+        longitud = np.zeros(cantidad, dtype=np.int64)
+
+    elif operador == 'oropt':
+        longitud = rng.integers(1, LONGITUD_MAX_OROPT + 1, size=cantidad)
+        j = rng.integers(0, n - 1, size=cantidad)
+        i = posicion(candidatos[ciudad(j), columna])
+        validos = (i != 0) & (i + longitud <= n - 1) & ((j < i - 1) | (j > i + longitud - 1))
+
+    else:
+        origen = rng.integers(1, n - 2, size=cantidad)
+        destino = posicion(candidatos[ciudad(origen), columna])
+        validos = (destino != 0) & (destino != origen + 1)
+        i = np.minimum(origen + 1, destino)
+        j = np.maximum(origen + 1, destino)
+        longitud = np.zeros(cantidad, dtype=np.int64)
+
+    return i[validos], j[validos], longitud[validos]
+
+
+def deltas_lote(tour, operador, i, j, longitud, matriz_distancias):
+    """
+    Variación de la distancia de un lote de movimientos, con indexado avanzado de numpy.
+
+    Args:
+        tour (Tour): Recorrido actual.
+        operador (str): 'intercambio', '2opt' u 'oropt'.
+        i, j, longitud (numpy.ndarray): Posiciones de cada movimiento (ver evaluar_movimiento).
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias.
+
+    Returns:
+        numpy.ndarray: Delta de cada movimiento.
+    """
+    t = tour.ciudades
+    d = matriz_distancias
+
+    if operador == '2opt':
+        anterior, primera, ultima, siguiente = t(i - 1), t(i), t(j), t(j + 1)
+        return d[anterior, ultima] + d[primera, siguiente] - d[anterior, primera] - d[ultima, siguiente]
+
+    if operador == 'oropt':
+        fin = i + longitud - 1
+        anterior, primera, ultima, siguiente = t(i - 1), t(i), t(fin), t(fin + 1)
+        p, q = t(j), t(j + 1)
+        return (d[anterior, siguiente] + d[p, primera] + d[ultima, q]
+                - d[anterior, primera] - d[ultima, siguiente] - d[p, q])
+
+    a, b = t(i), t(j)
+    anterior_i, siguiente_i, anterior_j, siguiente_j = t(i - 1), t(i + 1), t(j - 1), t(j + 1)
+    adyacentes = i + 1 == j
+
+    # Para los intercambios adyacentes solo cambian los arcos exteriores
+    separados = (d[b, siguiente_i] + d[anterior_j, a] - d[a, siguiente_i] - d[anterior_j, b])
+    return (d[anterior_i, b] + d[a, siguiente_j] - d[anterior_i, a] - d[b, siguiente_j]
+            + np.where(adyacentes, 0.0, separados))
@@ -0,0 +1,117 @@
+# utils/nucleo.py
+#
+# Bucles escalares más calientes (evaluación de movimientos, distancia de un tour y construcción del vecino
+# más cercano), con una versión compilada opcional en utils/_nucleo.pyx.
+#
+# Si el módulo compilado existe (python -m utils.compilar_nucleo) y la matriz de distancias es densa, de
+# int32 o float64, se usa; si no, se usan las versiones en Python. Ambas dan los mismos resultados
+# (benchmarks/comparar_nucleo.py lo comprueba).
+
+from array import array
+
+import numpy as np
+
+from utils.tour import Tour
+from utils.movimientos import evaluar_movimiento
+
+try:
+    from utils import _nucleo
+except ImportError:
+    _nucleo = None
+
+
+# Indica si el núcleo compilado está disponible y si se usa (se puede desactivar para comparar)
+NUCLEO_DISPONIBLE = _nucleo is not None
+usar_compilado = NUCLEO_DISPONIBLE
+
+
+def _matriz_compilable(matriz_distancias):
+    """Indica si el núcleo compilado puede trabajar directamente sobre el buffer de la matriz."""
+    return (usar_compilado and isinstance(matriz_distancias, np.ndarray) and matriz_distancias.ndim == 2
+            and matriz_distancias.dtype in (np.int32, np.float64) and matriz_distancias.flags['C_CONTIGUOUS'])
+
+
+def evaluador_movimientos(tour, matriz_distancias):
+    """
+    Función que devuelve la variación de la distancia de un movimiento sobre el tour, sin aplicarlo.
+
+    El evaluador solo es válido mientras el tour no cambie.
+
+    Args:
+        tour (Tour): Recorrido actual.
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+
+    Returns:
+        callable: evaluar(movimiento) -> delta.
+    """
+    if _matriz_compilable(matriz_distancias):
+        return _nucleo.EvaluadorMovimientos(tour.orden, tour.posicion[tour.inicio], tour.sentido, matriz_distancias)
+    return lambda movimiento: evaluar_movimiento(tour, movimiento, matriz_distancias)
+
+
+def longitud_recorrido(tour, matriz_distancias):
+    """
+    Suma, en orden, de las distancias entre posiciones consecutivas de un recorrido con la ciudad inicial
+    repetida al final (incluida la arista de la última posición a la primera).
+
+    Args:
+        tour (Tour | list): Recorrido de las ciudades.
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+
+    Returns:
+        float: Distancia total del recorrido.
+    """
+    if _matriz_compilable(matriz_distancias):
+        if isinstance(tour, Tour):
+            return _nucleo.longitud_recorrido(tour.orden, tour.posicion[tour.inicio], tour.sentido, matriz_distancias)
+        return _nucleo.longitud_recorrido(array('i', tour[:-1]), 0, 1, matriz_distancias)
+
+    if isinstance(tour, Tour):
+        tour = tour.a_lista()
+
+    distancia_total = 0
+    for i in range(len(tour)):
+        distancia_total += matriz_distancias[tour[i], tour[(i + 1) % len(tour)]]
+    return distancia_total
+
+
+def vecino_mas_cercano(matriz_distancias, inicio=0):
+    """
+    Construye el tour del vecino más cercano: en cada paso se va a la ciudad no visitada más cercana
+    (la de menor índice si hay empates).
+
+    Args:
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        inicio (int, optional): Ciudad de partida.
+
+    Returns:
+        tuple: El tour (con la ciudad inicial repetida al final) y su distancia total.
+    """
+    if _matriz_compilable(matriz_distancias):
+        tour, total_distance = _nucleo.vecino_mas_cercano(matriz_distancias, inicio)
+        return tour.tolist(), total_distance
+
+    n = len(matriz_distancias)
+    tour = [inicio]
+    total_distance = 0.0
+    current_city = inicio
+
+    # Ciudades no visitadas en orden creciente (argmin da la primera, la de menor índice, si hay empates)
+    no_visitadas = np.delete(np.arange(n), inicio)
+
+    for _ in range(n - 1):
+        # Distancias a todas las no visitadas de una vez (un oráculo solo calcula esas)
+        distancias = matriz_distancias[current_city, no_visitadas]
+        posicion = int(np.argmin(distancias))
+        next_city = int(no_visitadas[posicion])
+
+        tour.append(next_city)
+        total_distance += distancias[posicion]
+        no_visitadas = np.delete(no_visitadas, posicion)
+        current_city = next_city
+
+    # Regresar a la ciudad inicial
+    total_distance += matriz_distancias[current_city, tour[0]]
+    tour.append(tour[0])
+
+    return tour, total_distance
@@ -0,0 +1,118 @@
+# utils/perfilado.py
+#
+# Instrumentación de las ejecuciones: tiempos por fase (perf_counter_ns) y contadores de eventos de la
+# búsqueda (vecinos evaluados, movimientos aceptados, reinicios, reducciones del entorno...).
+#
+# Está desactivada por defecto (profile=no). Desactivada, una función cronometrada solo comprueba el
+# indicador `activo` antes de llamar a la original, y en los bucles internos los contadores se actualizan
+# dentro de un `if perfilado.activo`, así que el coste es prácticamente nulo. Los datos se acumulan en
+# este módulo (uno por proceso) y se recogen con resumen() al terminar cada ejecución.
+
+import functools, time
+
+from collections import defaultdict
+
+
+# Indicador global: se consulta como perfilado.activo para ver siempre el valor actual
+activo = False
+
+_tiempos = defaultdict(int)
+_llamadas = defaultdict(int)
+_contadores = defaultdict(int)
+
+
+def activar(valor=True):
+    """Activa o desactiva la instrumentación."""
+    global activo
+    activo = valor
+
+
+def reiniciar():
+    """Descarta los tiempos y contadores acumulados."""
+    _tiempos.clear()
+    _llamadas.clear()
+    _contadores.clear()
+
+
+def contar(nombre, cantidad=1):
+    """Suma cantidad al contador indicado (si la instrumentación está activa)."""
+    if activo:
+        _contadores[nombre] += cantidad
+
+
+class fase:
+    """
+    Gestor de contexto que acumula el tiempo de un bloque de código en la fase indicada.
+
+    Args:
+        nombre (str): Nombre de la fase.
+    """
+
+    __slots__ = ('nombre', 'inicio')
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.inicio = None
+
+    def __enter__(self):
+        if activo:
+            self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *excepcion):
+        if self.inicio is not None:
+            _tiempos[self.nombre] += time.perf_counter_ns() - self.inicio
+            _llamadas[self.nombre] += 1
+            self.inicio = None
+
+
+def cronometrar(nombre):
+    """
+    Decorador que acumula el tiempo de cada llamada a la función en la fase indicada.
+
+    :param nombre: Nombre de la fase.
+    :return: Decorador.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter_ns()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _tiempos[nombre] += time.perf_counter_ns() - inicio
+                _llamadas[nombre] += 1
+        return envoltura
+    return decorador
+
+
+def resumen():
+    """
+    Tiempos y contadores acumulados desde el último reinicio.
+
+    :return: Diccionario {'fases': {nombre: {'segundos', 'llamadas'}}, 'contadores': {nombre: valor}}.
+    """
+    return {
+        'fases': {nombre: {'segundos': _tiempos[nombre] / 1e9, 'llamadas': _llamadas[nombre]} for nombre in _tiempos},
+        'contadores': dict(_contadores)
+    }
+
+
+def acumular(perfiles):
+    """
+    Suma varios resúmenes (por ejemplo, los de todas las semillas de un algoritmo).
+
+    :param perfiles: Lista de diccionarios devueltos por resumen().
+    :return: Resumen con los tiempos, llamadas y contadores sumados.
+    """
+    total = {'fases': {}, 'contadores': {}}
+    for perfil in perfiles:
+        for nombre, datos in perfil['fases'].items():
+            acumulado = total['fases'].setdefault(nombre, {'segundos': 0.0, 'llamadas': 0})
+            acumulado['segundos'] += datos['segundos']
+            acumulado['llamadas'] += datos['llamadas']
+        for nombre, valor in perfil['contadores'].items():
+            total['contadores'][nombre] = total['contadores'].get(nombre, 0) + valor
+    return total
@@ -38,7 +38,36 @@ def procesar_configuracion(nombre_archivo):
         'worsening_movement_rate': None,
         'taboo_possesion': None,
         'strategic_oscillation': None,
-        'echo': None
+        'restart_segment_size': 0.1,
+        'max_seconds': 0.0,
+        'max_evaluations': 0,
+        'target_gap': -1.0,
+        'echo': None,
+        'log_level': 'traza',
+        'trace': 'no',
+        'trace_dir': 'traces',
+        'checkpoint_interval': 0.0,
+        'checkpoint_dir': 'checkpoints',
+        'resume': 'no',
+        'profile': 'no',
+        'dense_matrix_threshold': 5000,
+        'distance_type': 'euclidea',
+        'distance_dtype': 'float64',
+        'distance_cache_blocks': 0,
+        'neighborhood_mode': 'aleatorio',
+        'neighborhood_operator': 'intercambio',
+        'evaluation_mode': 'escalar',
+        'candidate_neighbors': 10,
+        'local_search_mode': 'entorno',
+        'lk_max_depth': 50,
+        'lk_breadth': 5,
+        'shared_memory': 'no',
+        'instance_cache': 'no',
+        'cache_dir': 'cache',
+        'cache_max_mb': 2048,
+        'initial_solution_cache': 'no',
+        'initial_solution': 'greedy_aleatorio',
+        'greedy_centrality': 'exacta'
     }
 
     tipos_esperados = {
@@ -54,7 +83,36 @@ def procesar_configuracion(nombre_archivo):
         'worsening_movement_rate': float,
         'taboo_possesion': int,
         'strategic_oscillation': float,
-        'echo': str
+        'restart_segment_size': float,
+        'max_seconds': float,
+        'max_evaluations': int,
+        'target_gap': float,
+        'echo': str,
+        'log_level': str,
+        'trace': str,
+        'trace_dir': str,
+        'checkpoint_interval': float,
+        'checkpoint_dir': str,
+        'resume': str,
+        'profile': str,
+        'dense_matrix_threshold': int,
+        'distance_type': str,
+        'distance_dtype': str,
+        'distance_cache_blocks': int,
+        'neighborhood_mode': str,
+        'neighborhood_operator': str,
+        'evaluation_mode': str,
+        'candidate_neighbors': int,
+        'local_search_mode': str,
+        'lk_max_depth': int,
+        'lk_breadth': int,
+        'shared_memory': str,
+        'instance_cache': str,
+        'cache_dir': str,
+        'cache_max_mb': int,
+        'initial_solution_cache': str,
+        'initial_solution': str,
+        'greedy_centrality': str
     }
 
     try:
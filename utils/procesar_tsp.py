@@ -1,34 +1,87 @@
 # utils/procesar_tsp.py
 
+import gzip
 
+import numpy as np
+
+from utils.perfilado import cronometrar
+
+
+def abrir_tsp(nombre_archivo):
+    """Abre un archivo .tsp en modo texto, descomprimiéndolo si termina en .gz."""
+    if nombre_archivo.endswith('.gz'):
+        return gzip.open(nombre_archivo, 'rt')
+    return open(nombre_archivo, 'r')
+
+
+@cronometrar('procesar_tsp')
 def procesar_tsp(nombre_archivo):
+    """
+    Procesa un archivo TSPLIB (.tsp o .tsp.gz) con sección NODE_COORD_SECTION.
+
+    La cabecera se lee línea a línea y las coordenadas se cargan de una vez con numpy en un array
+    contiguo de float64.
+
+    :param nombre_archivo: Ruta del archivo.
+    :return: Diccionario con 'nombre', 'dimension', 'tipo_distancia' (EDGE_WEIGHT_TYPE),
+             'ciudades' (identificadores del archivo) y 'coordenadas' (array (n, 2)).
+    :raises ValueError: Si el archivo no tiene sección de coordenadas.
+    """
     tsp_data = {
-        'nombre': None,          # Nombre del problema TSP
-        'dimensión': None,       # Número de nodos (ciudades)
-        'coordenadas': []        # Lista para almacenar las coordenadas de las ciudades
+        'nombre': None,            # Nombre del problema TSP
+        'dimension': None,         # Número de nodos (ciudades)
+        'tipo_distancia': None,    # EDGE_WEIGHT_TYPE (EUC_2D, CEIL_2D, ATT, GEO...)
+        'ciudades': None,          # Identificadores de las ciudades en el archivo
+        'coordenadas': None        # Array (n, 2) con las coordenadas de las ciudades
     }
 
-    with open(nombre_archivo, 'r') as file:
+    with abrir_tsp(nombre_archivo) as file:
+        # Procesar cabeceras hasta la sección de coordenadas
         for line in file:
-            line = line.strip()  # Elimina espacios en blanco al principio y final de la línea
-            if not line or line.startswith('NODE_COORD_SECTION') or line == 'EOF':
-                # Saltar líneas vacías, la sección de coordenadas y el indicador de fin del archivo
+            line = line.strip()
+            if not line:
                 continue
+            if line.startswith('NODE_COORD_SECTION'):
+                break
+            if line == 'EOF':
+                raise ValueError(f"El archivo '{nombre_archivo}' no tiene sección NODE_COORD_SECTION.")
+
+            clave, _, valor = line.partition(':')
+            clave, valor = clave.strip(), valor.strip()
+            if clave == 'NAME':
+                tsp_data['nombre'] = valor
+            elif clave == 'DIMENSION':
+                tsp_data['dimension'] = int(valor)
+            elif clave == 'EDGE_WEIGHT_TYPE':
+                tsp_data['tipo_distancia'] = valor
+        else:
+            raise ValueError(f"El archivo '{nombre_archivo}' no tiene sección NODE_COORD_SECTION.")
+
+        # Cargar todas las coordenadas de una vez (la línea EOF se trata como comentario)
+        nodos = np.loadtxt(file, comments='EOF', max_rows=tsp_data['dimension'], ndmin=2)
+
+    tsp_data['ciudades'] = nodos[:, 0].astype(np.int64)
+    tsp_data['coordenadas'] = np.ascontiguousarray(nodos[:, 1:3])
+    if tsp_data['dimension'] is None:
+        tsp_data['dimension'] = len(nodos)
+
+    return tsp_data
+
+
+def leer_optimos(nombre_archivo='./data/_best.txt'):
+    """
+    Lee las distancias óptimas conocidas de cada problema (líneas 'NOMBRE: distancia').
 
-            # Procesar cabeceras y coordenadas del archivo
-            if line.startswith('NAME:'):
-                tsp_data['nombre'] = line.split(':')[1].strip()
-            elif line.startswith('DIMENSION:'):
-                tsp_data['dimension'] = int(line.split(':')[1].strip())
-            elif line.startswith('EDGE_WEIGHT_TYPE:'):
-                continue  # Ignorar esta línea
-            elif line[0].isdigit():  # Procesar solo líneas que comienzan con un número
-                # Procesar las coordenadas de cada nodo
-                tokens = line.split()
-                if len(tokens) == 3:
-                    ciudad = int(tokens[0])
-                    x = float(tokens[1])
-                    y = float(tokens[2])
-                    tsp_data['coordenadas'].append((ciudad, (float(x), float(y))))
-
-    return tsp_data
\ No newline at end of file
+    :param nombre_archivo: Ruta del archivo de óptimos.
+    :return: Diccionario {nombre en mayúsculas: distancia}; vacío si el archivo no existe.
+    """
+    optimos = {}
+    try:
+        with open(nombre_archivo, 'r') as archivo:
+            for linea in archivo:
+                nombre, separador, valor = linea.partition(':')
+                if separador and valor.strip():
+                    optimos[nombre.strip().upper()] = float(valor)
+    except FileNotFoundError:
+        pass
+    return optimos
@@ -0,0 +1,93 @@
+# utils/registro.py
+#
+# Registro de eventos de una ejecución con escritura asíncrona.
+#
+# Los mensajes se formatean en el hilo de la búsqueda (el tour cambia justo después) y se acumulan en un
+# lote en memoria; cada lote completo se encola en una cola acotada y un hilo escritor lo vuelca al archivo
+# con una sola escritura. Si la cola se llena, la búsqueda espera al escritor: la memoria no crece sin
+# límite y no se pierde ningún mensaje.
+#
+# Niveles de detalle (log_level), de menos a más:
+#   - 'resumen': inicio y resultado de cada ejecución y de cada algoritmo.
+#   - 'eventos': además, reinicios por estancamiento y cambios del tamaño del entorno.
+#   - 'traza': además, cada iteración, cada mejora y cada paso de construcción, con los tours completos.
+
+import queue, threading
+
+
+# Niveles de detalle del registro
+RESUMEN, EVENTOS, TRAZA = 0, 1, 2
+NIVELES = {'resumen': RESUMEN, 'eventos': EVENTOS, 'traza': TRAZA}
+
+
+def nivel_registro(nombre):
+    """
+    Convierte el parámetro log_level en un nivel de detalle.
+
+    :param nombre: 'resumen', 'eventos' o 'traza'.
+    :return: Uno de RESUMEN, EVENTOS o TRAZA.
+    :raises ValueError: Si el nivel no existe.
+    """
+    if nombre.lower() not in NIVELES:
+        raise ValueError(f"Nivel de registro '{nombre}' no soportado.")
+    return NIVELES[nombre.lower()]
+
+
+class RegistroAsincrono:
+    """
+    Archivo de log con escritura por lotes en un hilo aparte. Se usa como un archivo (write y close, o
+    como gestor de contexto) y registrar_evento descarta los mensajes por encima de su nivel.
+
+    Args:
+        nombre_archivo (str): Ruta del archivo de log.
+        nivel (int, optional): Nivel de detalle (RESUMEN, EVENTOS o TRAZA).
+        tamanio_lote (int, optional): Mensajes que se agrupan en cada escritura.
+        max_lotes (int, optional): Lotes pendientes de escribir antes de que la búsqueda tenga que esperar.
+    """
+
+    def __init__(self, nombre_archivo, nivel=TRAZA, tamanio_lote=1000, max_lotes=64):
+        self.nivel = nivel
+        self._archivo = open(nombre_archivo, 'w')
+        self._tamanio_lote = tamanio_lote
+        self._lote = []
+        self._cola = queue.Queue(maxsize=max_lotes)
+        self._error = None
+        self._hilo = threading.Thread(target=self._escritor, daemon=True)
+        self._hilo.start()
+
+    def write(self, texto):
+        self._lote.append(texto)
+        if len(self._lote) >= self._tamanio_lote:
+            self._cola.put(''.join(self._lote))
+            self._lote = []
+
+    def _escritor(self):
+        while True:
+            bloque = self._cola.get()
+            if bloque is None:
+                break
+            # Tras un error se siguen vaciando los lotes para que la búsqueda no se quede bloqueada
+            if self._error is None:
+                try:
+                    self._archivo.write(bloque)
+                except OSError as e:
+                    self._error = e
+
+    def close(self):
+        """Escribe lo pendiente, espera al hilo escritor y cierra el archivo."""
+        if self._hilo.is_alive():
+            if self._lote:
+                self._cola.put(''.join(self._lote))
+                self._lote = []
+            self._cola.put(None)
+            self._hilo.join()
+            self._archivo.close()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.close()
@@ -0,0 +1,90 @@
+# utils/soluciones_iniciales.py
+#
+# Almacén persistente de soluciones iniciales. Cada solución construida (recorrido y distancia) se guarda
+# en la caché en disco indexada por la huella del archivo .tsp, el constructor, la métrica y el tipo de la
+# matriz, K y la semilla; así todos los algoritmos y todas las ejecuciones de main.py que parten de la
+# misma solución la leen en lugar de construirla de nuevo.
+#
+# El recorrido se guarda como .npy de int32 y la distancia, tal y como la calculó el constructor, en un
+# .json al lado, para que partir de una solución guardada dé exactamente los mismos resultados.
+
+import os
+
+import numpy as np
+
+
+class AlmacenSoluciones:
+    """
+    Soluciones iniciales de una instancia guardadas en una CacheInstancias.
+
+    Args:
+        cache (CacheInstancias): Caché en disco donde se guardan las soluciones.
+        huella (str): Huella del archivo .tsp.
+        tipo_distancia (str): Métrica de la matriz de distancias.
+        dtype (str): Tipo de los elementos de la matriz de distancias.
+    """
+
+    def __init__(self, cache, huella, tipo_distancia, dtype):
+        self.cache = cache
+        self.huella = huella
+        self.tipo_distancia = tipo_distancia
+        self.dtype = dtype
+
+    def clave(self, constructor, k, semilla):
+        """Clave de la solución dentro de la caché."""
+        return f"inicial_{constructor}_{self.tipo_distancia}_{self.dtype}_K{k}_s{semilla}"
+
+    def cargar(self, constructor, k, semilla):
+        """
+        Carga una solución guardada.
+
+        :param constructor: Nombre del algoritmo constructivo.
+        :param k: Parámetro K del constructor.
+        :param semilla: Semilla con la que se construyó.
+        :return: Tupla (recorrido, distancia) o None si no está guardada.
+        """
+        clave = self.clave(constructor, k, semilla)
+        rutas = (self.cache.ruta(self.huella, clave), self.cache.ruta(self.huella, clave, '.json'))
+        if not all(os.path.exists(ruta) for ruta in rutas):
+            return None
+
+        try:
+            recorrido = self.cache.obtener_array(self.huella, clave, _no_guardada).tolist()
+            distancia = self.cache.obtener_json(self.huella, clave, _no_guardada)['distancia']
+        except KeyError:
+            return None  # Desalojada entre la comprobación y la lectura
+        return recorrido, distancia
+
+    def guardar(self, constructor, k, semilla, recorrido, distancia):
+        """
+        Guarda una solución (si no lo estaba ya).
+
+        :param constructor: Nombre del algoritmo constructivo.
+        :param k: Parámetro K del constructor.
+        :param semilla: Semilla con la que se construyó.
+        :param recorrido: Recorrido (con la ciudad inicial repetida al final).
+        :param distancia: Distancia total calculada por el constructor.
+        """
+        clave = self.clave(constructor, k, semilla)
+        self.cache.obtener_json(self.huella, clave, lambda: {'distancia': float(distancia)})
+        self.cache.obtener_array(self.huella, clave, lambda: np.asarray(recorrido, dtype=np.int32))
+
+    def obtener(self, constructor, k, semilla, construir):
+        """
+        Devuelve la solución guardada o la construye y la guarda.
+
+        :param constructor: Nombre del algoritmo constructivo.
+        :param k: Parámetro K del constructor.
+        :param semilla: Semilla de la solución.
+        :param construir: Función sin argumentos que construye la solución y devuelve (recorrido, distancia).
+        :return: Tupla (recorrido, distancia).
+        """
+        solucion = self.cargar(constructor, k, semilla)
+        if solucion is None:
+            solucion = construir()
+            self.guardar(constructor, k, semilla, *solucion)
+        return solucion
+
+
+def _no_guardada():
+    raise KeyError("La solución se ha desalojado de la caché")
@@ -0,0 +1,104 @@
+# utils/terminacion.py
+#
+# Criterio de parada común a las metaheurísticas, además del número de iteraciones de cada una:
+#   - max_seconds: tiempo de reloj máximo de la ejecución.
+#   - max_evaluations: número máximo de vecinos evaluados.
+#   - target_gap: parar al llegar a menos de ese porcentaje por encima del óptimo de data/_best.txt.
+#
+# La comprobación se hace en cada iteración, pero el reloj (monotónico) solo se consulta una vez cada
+# INTERVALO_RELOJ comprobaciones: en las búsquedas con iteraciones muy baratas leer el reloj en todas
+# ellas sería una parte apreciable del tiempo.
+
+import time
+
+
+# Comprobaciones entre dos lecturas del reloj
+INTERVALO_RELOJ = 32
+
+
+class CriterioParada:
+    """
+    Controla el presupuesto de una ejecución. El tiempo empieza a contar al crearlo.
+
+    Args:
+        max_segundos (float, optional): Segundos de reloj disponibles (0 sin límite).
+        max_evaluaciones (int, optional): Vecinos que se pueden evaluar (0 sin límite).
+        distancia_objetivo (float, optional): Distancia con la que se da la búsqueda por terminada.
+        intervalo_reloj (int, optional): Comprobaciones entre dos lecturas del reloj.
+    """
+
+    def __init__(self, max_segundos=0, max_evaluaciones=0, distancia_objetivo=None, intervalo_reloj=INTERVALO_RELOJ):
+        self.max_segundos = max_segundos
+        self.max_evaluaciones = max_evaluaciones
+        self.distancia_objetivo = float('-inf') if distancia_objetivo is None else distancia_objetivo
+        self.intervalo_reloj = intervalo_reloj
+        self.evaluaciones = 0
+        self.motivo = None
+        self._inicio = time.monotonic()
+        self._limite = self._inicio + max_segundos
+        self._hasta_reloj = intervalo_reloj
+
+    def agotado(self, distancia, evaluaciones=0):
+        """
+        Comprueba si hay que terminar antes de la siguiente iteración y, si no, descuenta sus evaluaciones.
+
+        Args:
+            distancia (float): Mejor distancia encontrada hasta el momento.
+            evaluaciones (int, optional): Vecinos que va a evaluar la siguiente iteración.
+
+        Returns:
+            bool: True si se ha alcanzado algún límite (el motivo queda en self.motivo).
+        """
+        if self.motivo is not None:
+            return True
+
+        if distancia <= self.distancia_objetivo:
+            self.motivo = 'objetivo'
+        elif self.max_evaluaciones and self.evaluaciones + evaluaciones > self.max_evaluaciones:
+            self.motivo = 'evaluaciones'
+        elif self.max_segundos:
+            self._hasta_reloj -= 1
+            if self._hasta_reloj <= 0:
+                self._hasta_reloj = self.intervalo_reloj
+                if time.monotonic() >= self._limite:
+                    self.motivo = 'tiempo'
+
+        if self.motivo is not None:
+            return True
+        self.evaluaciones += evaluaciones
+        return False
+
+    def estado(self):
+        """Presupuesto consumido hasta ahora (evaluaciones y segundos), para guardarlo en un punto de control."""
+        return {'parada_evaluaciones': self.evaluaciones, 'parada_segundos': time.monotonic() - self._inicio}
+
+    def restaurar(self, estado):
+        """
+        Descuenta el presupuesto que ya consumió una ejecución interrumpida.
+
+        Args:
+            estado (dict): Diccionario con las claves de estado() (las que falten se ignoran).
+        """
+        if 'parada_evaluaciones' in estado:
+            self.evaluaciones = int(estado['parada_evaluaciones'])
+        if 'parada_segundos' in estado:
+            self._inicio -= float(estado['parada_segundos'])
+            self._limite = self._inicio + self.max_segundos
+
+
+def crear_criterio_parada(params, optimo=None):
+    """
+    Crea el criterio de parada de una ejecución a partir de los parámetros.
+
+    :param params: Diccionario de parámetros (max_seconds, max_evaluations y target_gap).
+    :param optimo: Distancia óptima conocida del problema (necesaria para target_gap).
+    :return: CriterioParada, o None si no hay ningún límite configurado.
+    """
+    distancia_objetivo = None
+    if params['target_gap'] >= 0 and optimo is not None:
+        distancia_objetivo = optimo * (1 + params['target_gap'] / 100)
+
+    if not params['max_seconds'] and not params['max_evaluations'] and distancia_objetivo is None:
+        return None
+
+    return CriterioParada(params['max_seconds'], params['max_evaluations'], distancia_objetivo)
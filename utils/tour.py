@@ -0,0 +1,183 @@
+# utils/tour.py
+#
+# Representación compacta del tour: array cíclico de ciudades con índice de posiciones.
+#
+# `orden` guarda las ciudades en un array('i') y `posicion` la posición de cada ciudad en `orden`, de modo
+# que sucesor, predecesor y "está entre" son O(1) y un 2-opt invierte siempre el lado más corto del ciclo.
+# Ambos arrays se exponen también como vistas de numpy (sin copia) para las operaciones vectorizadas.
+#
+# Los movimientos por posiciones (utils/movimientos.py) ven el tour como la lista de siempre, con la ciudad
+# inicial en la posición 0 y repetida al final: la posición lógica p es la ciudad
+# orden[(posicion[inicio] + sentido * p) % n]. Cuando un 2-opt invierte el lado complementario, el ciclo
+# queda recorrido al revés y basta con cambiar `sentido`; la ciudad inicial no sale de la posición lógica 0.
+
+from array import array
+
+import numpy as np
+
+
+class Tour:
+    """
+    Tour cíclico con posiciones en O(1).
+
+    Args:
+        recorrido (list[int]): Recorrido con la ciudad inicial repetida al final.
+    """
+
+    def __init__(self, recorrido):
+        self.orden = array('i', recorrido[:-1])
+        self.n = len(self.orden)
+        self.posicion = array('i', bytes(4 * self.n))
+        self.inicio = recorrido[0]
+        self.sentido = 1
+        self._crear_vistas()
+        self._posicion_np[self._orden_np] = np.arange(self.n, dtype=np.int32)
+
+    def _crear_vistas(self):
+        self._orden_np = np.frombuffer(self.orden, dtype=np.int32)
+        self._posicion_np = np.frombuffer(self.posicion, dtype=np.int32)
+
+    def copia(self):
+        """Copia independiente del tour (dos copias de arrays de enteros, sin recorrerlos en Python)."""
+        nuevo = Tour.__new__(Tour)
+        nuevo.orden = array('i', self.orden)
+        nuevo.posicion = array('i', self.posicion)
+        nuevo.n = self.n
+        nuevo.inicio = self.inicio
+        nuevo.sentido = self.sentido
+        nuevo._crear_vistas()
+        return nuevo
+
+    def a_lista(self):
+        """Recorrido como lista, empezando por la ciudad inicial y con ella repetida al final."""
+        base = self.posicion[self.inicio]
+        if self.sentido == 1:
+            lista = self.orden[base:].tolist() + self.orden[:base].tolist()
+        else:
+            lista = self.orden[base::-1].tolist() + self.orden[:base:-1].tolist()
+        lista.append(self.inicio)
+        return lista
+
+    # ------------------------------------------------------------------ Vista por posiciones lógicas
+
+    def __len__(self):
+        return self.n + 1
+
+    def __getitem__(self, p):
+        return self.orden[(self.posicion[self.inicio] + self.sentido * p) % self.n]
+
+    def __iter__(self):
+        return iter(self.a_lista())
+
+    def indice(self, ciudad):
+        """Posición lógica de una ciudad (0 para la ciudad inicial)."""
+        return (self.sentido * (self.posicion[ciudad] - self.posicion[self.inicio])) % self.n
+
+    def ciudades(self, posiciones):
+        """Versión vectorizada de tour[p] para un array de posiciones lógicas."""
+        return self._orden_np[(self.posicion[self.inicio] + self.sentido * posiciones) % self.n]
+
+    def indices(self, ciudades):
+        """Versión vectorizada de indice para un array de ciudades."""
+        return (self.sentido * (self._posicion_np[ciudades].astype(np.int64) - self.posicion[self.inicio])) % self.n
+
+    def aplicar(self, movimiento):
+        """
+        Aplica un movimiento por posiciones lógicas (ver utils/movimientos.py) sin copiar el tour.
+
+        Solo se actualizan las posiciones de las ciudades que cambian de sitio.
+        """
+        operador, i, j, longitud = movimiento
+        fisica = self.posicion[self.inicio]
+        n, s = self.n, self.sentido
+
+        if operador == '2opt':
+            a, b = (fisica + s * i) % n, (fisica + s * j) % n
+            if self.invertir(a, b) if s == 1 else self.invertir(b, a):
+                self.sentido = -s
+
+        elif operador == 'oropt':
+            # Los bloques consecutivos X Y pasan a ser Y X
+            if j > i:
+                primera, longitud_x, longitud_y = i, longitud, j - i - longitud + 1
+            else:
+                primera, longitud_x, longitud_y = j + 1, i - j - 1, longitud
+            if s == 1:
+                self.intercambiar_bloques((fisica + primera) % n, longitud_x, longitud_y)
+            else:
+                # En el array los bloques aparecen al revés: Y empieza en la última ciudad lógica de Y
+                ultima = primera + longitud_x + longitud_y - 1
+                self.intercambiar_bloques((fisica - ultima) % n, longitud_y, longitud_x)
+
+        else:
+            orden, posicion = self.orden, self.posicion
+            a, b = (fisica + s * i) % n, (fisica + s * j) % n
+            x, y = orden[a], orden[b]
+            orden[a], orden[b] = y, x
+            posicion[y], posicion[x] = a, b
+
+    # ------------------------------------------------------------------ Operaciones sobre el array cíclico
+
+    def sucesor(self, ciudad):
+        indice = self.posicion[ciudad] + 1
+        return self.orden[indice if indice < self.n else 0]
+
+    def predecesor(self, ciudad):
+        return self.orden[self.posicion[ciudad] - 1]
+
+    def entre(self, a, b, c):
+        """Indica si b está en el camino que va de a a c siguiendo el sentido del array."""
+        posicion, n = self.posicion, self.n
+        return (posicion[b] - posicion[a]) % n <= (posicion[c] - posicion[a]) % n
+
+    def invertir(self, i, j):
+        """
+        Invierte el camino de las posiciones i a j (cíclico); si es más corto, invierte el complementario.
+
+        :return: True si se ha invertido el complementario (el ciclo queda recorrido en sentido contrario).
+        """
+        n, orden, posicion = self.n, self.orden, self.posicion
+        longitud = (j - i) % n + 1
+        complementario = 2 * longitud > n
+        if complementario:
+            i, j = (j + 1) % n, (i - 1) % n
+            longitud = n - longitud
+
+        for _ in range(longitud // 2):
+            a, b = orden[i], orden[j]
+            orden[i], orden[j] = b, a
+            posicion[b], posicion[a] = i, j
+            i = i + 1 if i + 1 < n else 0
+            j = j - 1 if j > 0 else n - 1
+        return complementario
+
+    def rotar(self, inicio, longitud_x, longitud_y):
+        """Convierte los bloques consecutivos X Y (a partir de la posición inicio, cíclica) en Y X."""
+        n, orden, posicion = self.n, self.orden, self.posicion
+        indices = [(inicio + t) % n for t in range(longitud_x + longitud_y)]
+        ciudades = [orden[t] for t in indices]
+        for t, ciudad in zip(indices, ciudades[longitud_x:] + ciudades[:longitud_x]):
+            orden[t] = ciudad
+            posicion[ciudad] = t
+
+    def intercambiar_bloques(self, inicio, longitud_x, longitud_y):
+        """
+        Intercambia los bloques consecutivos X e Y. En un ciclo X Y Z, intercambiar X-Y, Y-Z o Z-X produce
+        el mismo tour, así que se elige la pareja de bloques más corta.
+        """
+        longitud_z = self.n - longitud_x - longitud_y
+        opciones = ((longitud_x + longitud_y, inicio, longitud_x, longitud_y),
+                    (longitud_y + longitud_z, inicio + longitud_x, longitud_y, longitud_z),
+                    (longitud_z + longitud_x, inicio + longitud_x + longitud_y, longitud_z, longitud_x))
+        _, inicio, longitud_x, longitud_y = min(opciones)
+        self.rotar(inicio % self.n, longitud_x, longitud_y)
+
+    def intercambiar_aristas(self, a, b, c, d):
+        """
+        Movimiento 2-opt: elimina las aristas (a, b) y (c, d) y añade (a, c) y (b, d). Ambas aristas deben
+        recorrerse en el mismo sentido (a -> b y c -> d, o b -> a y d -> c).
+        """
+        if self.sucesor(a) == b:
+            self.invertir(self.posicion[b], self.posicion[c])
+        else:
+            self.invertir(self.posicion[a], self.posicion[d])
@@ -0,0 +1,121 @@
+# utils/traza.py
+#
+# Traza binaria de la trayectoria de una búsqueda.
+#
+# Cada iteración se guarda como una fila de ancho fijo (DTYPE_TRAZA) en un bloque de NumPy en memoria; al
+# llenarse, el bloque se añade al final de un archivo .npy con una sola escritura y se reescribe la cabecera
+# con el número de filas, de modo que el archivo es un .npy válido en todo momento (también si la ejecución
+# se interrumpe). leer_traza lo abre mapeado en memoria, sin cargarlo entero ni volver a procesar texto.
+
+import numpy as np
+
+
+# Fila de la traza: iteración, ciudades del movimiento (-1 si no aplica), variación de la distancia,
+# distancia actual, mejor distancia hasta el momento y tamaño del entorno (o ciudades activas)
+DTYPE_TRAZA = np.dtype([
+    ('iteracion', '<i8'),
+    ('i', '<i4'),
+    ('j', '<i4'),
+    ('delta', '<f8'),
+    ('distancia', '<f8'),
+    ('mejor', '<f8'),
+    ('entorno', '<i4')
+])
+
+
+def _cabecera(filas, longitud=None):
+    """
+    Construye la cabecera .npy (versión 1.0) de una traza con el número de filas indicado.
+
+    :param filas: Número de filas de la traza.
+    :param longitud: Longitud total de la cabecera; se rellena con espacios para poder reescribirla en su sitio.
+    :return: Cabecera en bytes.
+    """
+    diccionario = repr({'descr': np.lib.format.dtype_to_descr(DTYPE_TRAZA), 'fortran_order': False, 'shape': (filas,)})
+    prefijo = np.lib.format.magic(1, 0)
+    if longitud is None:
+        # Espacio para el mayor número de filas posible, alineado a 64 bytes como hace NumPy
+        longitud = len(prefijo) + 2 + len(diccionario) + len(str(2 ** 63)) + 1
+        longitud += -longitud % 64
+    texto = diccionario.ljust(longitud - len(prefijo) - 2 - 1) + '\n'
+    return prefijo + (len(texto)).to_bytes(2, 'little') + texto.encode('latin1')
+
+
+class TrazaBinaria:
+    """
+    Escritor de la traza de una ejecución por bloques de filas. Se usa como gestor de contexto o
+    llamando a close al terminar.
+
+    Args:
+        nombre_archivo (str): Ruta del archivo .npy.
+        tamanio_bloque (int, optional): Filas que se acumulan en memoria antes de escribirlas.
+    """
+
+    def __init__(self, nombre_archivo, tamanio_bloque=65536):
+        self.nombre_archivo = nombre_archivo
+        self._archivo = open(nombre_archivo, 'wb')
+        self._longitud_cabecera = len(_cabecera(0))
+        self._archivo.write(_cabecera(0, self._longitud_cabecera))
+        self._bloque = np.empty(tamanio_bloque, dtype=DTYPE_TRAZA)
+        self._pendientes = 0
+        self.filas = 0
+
+    def registrar(self, iteracion, i, j, delta, distancia, mejor, entorno):
+        """Añade una fila a la traza."""
+        self._bloque[self._pendientes] = (iteracion, i, j, delta, distancia, mejor, entorno)
+        self._pendientes += 1
+        if self._pendientes == len(self._bloque):
+            self.volcar()
+
+    def volcar(self):
+        """Escribe las filas pendientes al final del archivo y actualiza la cabecera."""
+        if not self._pendientes:
+            return
+        self._archivo.write(self._bloque[:self._pendientes].tobytes())
+        self.filas += self._pendientes
+        self._pendientes = 0
+
+        self._archivo.seek(0)
+        self._archivo.write(_cabecera(self.filas, self._longitud_cabecera))
+        self._archivo.seek(0, 2)
+        self._archivo.flush()
+
+    def close(self):
+        """Escribe lo pendiente y cierra el archivo."""
+        if not self._archivo.closed:
+            self.volcar()
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.close()
+
+
+def registrar_iteracion(traza, iteracion, i, j, delta, distancia, mejor, entorno):
+    """
+    Añade una iteración a la traza binaria si la ejecución tiene una.
+
+    :param traza: TrazaBinaria de la ejecución o None.
+    :param iteracion: Número de iteración.
+    :param i: Primera ciudad del movimiento (-1 si no aplica).
+    :param j: Segunda ciudad del movimiento (-1 si no aplica).
+    :param delta: Variación de la distancia producida por el movimiento.
+    :param distancia: Distancia de la solución actual tras el movimiento.
+    :param mejor: Mejor distancia encontrada hasta el momento.
+    :param entorno: Tamaño del entorno evaluado (o ciudades activas en la búsqueda exhaustiva).
+    """
+    if traza is not None:
+        traza.registrar(iteracion, i, j, delta, distancia, mejor, entorno)
+
+
+def leer_traza(nombre_archivo, mapear=True):
+    """
+    Carga una traza escrita por TrazaBinaria.
+
+    :param nombre_archivo: Ruta del archivo .npy.
+    :param mapear: Si es True se abre mapeada en memoria (solo lectura) en lugar de cargarla entera.
+    :return: Array estructurado con dtype DTYPE_TRAZA.
+    """
+    return np.load(nombre_archivo, mmap_mode='r' if mapear else None)
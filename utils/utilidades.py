@@ -2,13 +2,29 @@
 
 import numpy as np, random
 
-from scipy.spatial.distance import cdist
+from utils.tour import Tour
+from utils.registro import EVENTOS, TRAZA
+from utils.perfilado import cronometrar
+from utils.nucleo import evaluador_movimientos, longitud_recorrido
+from utils.movimientos import aplicar_movimiento, movimiento_aleatorio, movimiento_candidato
+from utils.movimientos import deltas_lote, movimientos_aleatorios_lote, movimientos_candidatos_lote
 
 
-def registrar_evento(log_file, mensaje):
-    """Registra un evento en el archivo de log."""
-    if log_file:
-        log_file.write(mensaje + '\n')
+def registro_activo(log_file, nivel=EVENTOS):
+    """Indica si se registran los eventos de un nivel (un archivo normal lo registra todo)."""
+    return bool(log_file) and nivel <= getattr(log_file, 'nivel', TRAZA)
+
+
+@cronometrar('registro')
+def registrar_evento(log_file, mensaje, nivel=EVENTOS):
+    """
+    Registra un evento en el archivo de log si su nivel está dentro del nivel de detalle del archivo.
+
+    El mensaje puede ser una función sin argumentos que lo construye: así no se formatea (por ejemplo,
+    un tour completo) cuando no se va a escribir.
+    """
+    if registro_activo(log_file, nivel):
+        log_file.write((mensaje() if callable(mensaje) else mensaje) + '\n')
 
 
 def generar_logs(alg_name, tsp_data, seed=None, execution_num=None):
@@ -23,144 +39,256 @@ def generar_logs(alg_name, tsp_data, seed=None, execution_num=None):
     return log_filename
 
 
-def crear_matriz_distancias_scipy(coordenadas):
+def generar_archivo_ejecucion(directorio, alg_name, tsp_data, seed, execution_num, extension):
+    """Genera el nombre de un archivo asociado a una ejecución (traza, punto de control o resultado)."""
+    return f"{directorio}/{alg_name}_{tsp_data['nombre']}_{seed}_ejecucion_{execution_num}.{extension}"
+
+
+@cronometrar('explorar_entorno')
+def explorar_entorno(tour, distancia, matriz_distancias, tamanio_entorno, operador='intercambio', candidatos=None,
+                     modo_evaluacion='escalar', memoria_tabu=None, iteracion=0, distancia_aspiracion=float('-inf')):
     """
-    Crea una matriz de distancias utilizando scipy a partir de las coordenadas de las ciudades.
+        Evalúa tamanio_entorno movimientos sobre el tour y devuelve el mejor, sin construir ningún vecino.
 
-    :param coordenadas: Lista de tuplas con las coordenadas de las ciudades [(x1, y1), (x2, y2), ...].
-    :return: Matriz de distancias (numpy array).
+        Si se proporciona una lista de candidatos, solo se proponen movimientos que colocan junto a una
+        ciudad uno de sus vecinos más cercanos. Si se proporciona una memoria tabú, se descartan los
+        movimientos sobre ciudades tabú salvo que cumplan el criterio de aspiración.
+
+        Parameters:
+            tour (Tour | list): La solución actual (una lista se convierte a Tour).
+            distancia (float): La distancia total de la solución actual.
+            matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+            tamanio_entorno (int): Número de vecinos a evaluar.
+            operador (str): Operador de vecindario ('intercambio', '2opt' u 'oropt').
+            candidatos (numpy.ndarray, optional): Lista de candidatos (n, k) de cada ciudad.
+            modo_evaluacion (str): 'escalar' (un movimiento cada vez) o 'lote' (todos a la vez con numpy).
+            memoria_tabu (MemoriaTabu, optional): Memoria tabú a corto plazo.
+            iteracion (int): Iteración actual (para la caducidad de la memoria tabú).
+            distancia_aspiracion (float): Un movimiento tabú se permite si su distancia es menor que esta.
+
+        Returns:
+            mejor_movimiento (tuple): El movimiento (operador, i, j, longitud) con menor distancia, o None.
+            distancia_mejor_vecino (float): La distancia del vecino que produce ese movimiento.
     """
-    # Convertir la lista de coordenadas a un numpy array
-    coordenadas_array = np.array(coordenadas)
 
-    # Calcular la matriz de distancias usando cdist
-    matriz_distancias = cdist(coordenadas_array, coordenadas_array, metric='euclidean')
+    if not isinstance(tour, Tour):
+        tour = Tour(tour)
+
+    if modo_evaluacion == 'lote':
+        return explorar_entorno_lote(tour, distancia, matriz_distancias, tamanio_entorno, operador, candidatos,
+                                     memoria_tabu, iteracion, distancia_aspiracion)
+
+    # Variables del mejor movimiento
+    mejor_movimiento = None
+    distancia_mejor_vecino = float('inf')
+
+    # Número de posiciones del tour (con la ciudad inicial repetida al final)
+    n = len(tour)
+
+    # Evaluación de los deltas (compilada si el núcleo está disponible)
+    evaluar = evaluador_movimientos(tour, matriz_distancias)
+
+    for _ in range(tamanio_entorno):
+        # Selecciona el movimiento al azar o a partir de los candidatos
+        if candidatos is None:
+            movimiento = movimiento_aleatorio(operador, n)
+        else:
+            movimiento = movimiento_candidato(operador, tour, candidatos)
 
-    return matriz_distancias
+        # Calculo la distancia del vecino a partir de los arcos que cambian
+        nueva_distancia = distancia + evaluar(movimiento)
 
+        # Verificamos el nuevo vecino encontrado (si no es tabú o cumple el criterio de aspiración)
+        if nueva_distancia < distancia_mejor_vecino:
+            if memoria_tabu is None or memoria_tabu.permitido(tour[movimiento[1]], tour[movimiento[2]], iteracion,
+                                                              nueva_distancia, distancia_aspiracion):
+                mejor_movimiento = movimiento
+                distancia_mejor_vecino = nueva_distancia
+
+    return mejor_movimiento, distancia_mejor_vecino
 
-def generar_vecinos(tour, distancia, matriz_distancias, tamanio_entorno):
+
+def explorar_entorno_lote(tour, distancia, matriz_distancias, tamanio_entorno, operador='intercambio', candidatos=None,
+                          memoria_tabu=None, iteracion=0, distancia_aspiracion=float('-inf')):
     """
-        Genera vecinos de la solución actual (tour) al intercambiar dos ciudades.
+        Versión vectorizada de explorar_entorno: sortea todos los movimientos a la vez, calcula sus deltas
+        con indexado avanzado de numpy y elige el mejor con argmin.
 
-        Parameters:
-            tour (list): La solución actual representada como un recorrido de ciudades.
-            distancia (float): La distancia total de la solución actual.
-            matriz_distancias (numpy.ndarray): Matriz de distancias entre las ciudades.
-            tamanio_entorno (int): Número de vecinos a generar.
+        El generador de numpy se inicializa desde el módulo random, así que el resultado es reproducible
+        con la misma semilla.
 
         Returns:
-            mejor_vecino (list): El vecino que tiene la mejor (menor) distancia encontrada.
-            distancia_mejor_vecino (float): La distancia del mejor vecino encontrado.
-            mejora (bool): Indica si se encontró una mejora en comparación con la solución actual.
-            m_i (int): Índice de la primera ciudad intercambiada.
-            m_j (int): Índice de la segunda ciudad intercambiada.
+            mejor_movimiento (tuple): El movimiento (operador, i, j, longitud) con menor distancia, o None.
+            distancia_mejor_vecino (float): La distancia del vecino que produce ese movimiento.
     """
+    rng = np.random.default_rng(random.getrandbits(64))
+    n = len(tour)
 
-    # Variables del vecino
-    mejor_vecino = None
-    distancia_mejor_vecino = float('inf')
+    # Sortear los movimientos (las posiciones de las ciudades salen del Tour, sin recorrerlo)
+    if candidatos is None:
+        i, j, longitud = movimientos_aleatorios_lote(operador, n, tamanio_entorno, rng)
+    else:
+        i, j, longitud = movimientos_candidatos_lote(operador, tour, candidatos, tamanio_entorno, rng)
 
-    # Control de la mejora
-    mejora = False
+    if len(i) == 0:
+        return None, float('inf')
 
-    # Control de los índices
-    i, j = 0, 0
-    m_i, m_j = 0, 0
+    # Elegir el movimiento con menor delta
+    deltas = deltas_lote(tour, operador, i, j, longitud, matriz_distancias).astype(np.float64)
 
-    # Arcos
-    arco_original_1 = arco_original_2 = arco_original_3 = arco_original_4 = 0
-    nuevo_arco_1 = nuevo_arco_2 = nuevo_arco_3 = nuevo_arco_4 = 0
+    # Descartar los movimientos tabú que no cumplen el criterio de aspiración
+    if memoria_tabu is not None:
+        prohibidos = memoria_tabu.mascara_tabu(tour.ciudades(i), tour.ciudades(j), iteracion)
+        prohibidos &= distancia + deltas >= distancia_aspiracion
+        deltas[prohibidos] = np.inf
 
-    # Número de ciudades en el tour
-    n = len(tour)
+    mejor = int(np.argmin(deltas))
+    if deltas[mejor] == np.inf:
+        return None, float('inf')
 
-    for _ in range(tamanio_entorno):
-        # Selecciona dos índices al azar (intercambio)
-        i, j = sorted(random.sample(range(1, n - 1), 2))
-
-        # Generamos el tour del vecino
-        nuevo_vecino = tour[:]
-        nuevo_vecino[i], nuevo_vecino[j] = tour[j], tour[i]
-
-        # Calculamos las distancias de los arcos
-        if i + 1 == j:
-            arco_original_1 = matriz_distancias[tour[i - 1]][tour[i]]
-            arco_original_2 = matriz_distancias[tour[j]][tour[j + 1 % n]]
-            nuevo_arco_1 = matriz_distancias[tour[i - 1]][tour[j]]
-            nuevo_arco_2 = matriz_distancias[tour[i]][tour[j + 1 % n]]
-        else:
-            arco_original_1 = matriz_distancias[tour[i - 1]][tour[i]]
-            arco_original_2 = matriz_distancias[tour[i]][tour[i + 1 % n]]
-            arco_original_3 = matriz_distancias[tour[j - 1]][tour[j]]
-            arco_original_4 = matriz_distancias[tour[j]][tour[j + 1 % n]]
-            nuevo_arco_1 = matriz_distancias[tour[i - 1]][tour[j]]
-            nuevo_arco_2 = matriz_distancias[tour[j]][tour[i + 1 % n]]
-            nuevo_arco_3 = matriz_distancias[tour[j - 1]][tour[i]]
-            nuevo_arco_4 = matriz_distancias[tour[i]][tour[j + 1 % n]]
+    return (operador, int(i[mejor]), int(j[mejor]), int(longitud[mejor])), distancia + float(deltas[mejor])
 
-        # Arcos que DESAPARECEN
-        arcos_desaparecen = (arco_original_1 + arco_original_2 + arco_original_3 + arco_original_4)
 
-        # Arcos NUEVOS
-        arcos_nuevos = (nuevo_arco_1 + nuevo_arco_2 + nuevo_arco_3 + nuevo_arco_4)
+@cronometrar('generar_vecinos')
+def generar_vecinos(tour, distancia, matriz_distancias, tamanio_entorno, candidatos=None, operador='intercambio'):
+    """
+        Genera vecinos de la solución actual (tour) y devuelve una copia del mejor.
 
-        # Calculo la distancia del vecino generado
-        nueva_distancia = distancia - (arcos_desaparecen) + (arcos_nuevos)
+        Solo se copia el tour del movimiento elegido; para evitar también esa copia se puede usar
+        explorar_entorno junto con aplicar_movimiento.
 
-        # Verificamos el nuevo vecino encontrado
-        if nueva_distancia < distancia_mejor_vecino:
-            mejor_vecino = nuevo_vecino
-            distancia_mejor_vecino = nueva_distancia
-            m_i, m_j = i, j
+        Parameters:
+            tour (Tour | list): La solución actual (una lista se convierte a Tour).
+            distancia (float): La distancia total de la solución actual.
+            matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+            tamanio_entorno (int): Número de vecinos a generar.
+            candidatos (numpy.ndarray, optional): Lista de candidatos (n, k) de cada ciudad.
+            operador (str): Operador de vecindario ('intercambio', '2opt' u 'oropt').
+
+        Returns:
+            mejor_vecino (Tour): El vecino que tiene la mejor (menor) distancia encontrada.
+            distancia_mejor_vecino (float): La distancia del mejor vecino encontrado.
+            mejora (bool): Indica si se encontró una mejora en comparación con la solución actual.
+            m_i (int): Índice de la primera posición del movimiento.
+            m_j (int): Índice de la segunda posición del movimiento.
+    """
+    if not isinstance(tour, Tour):
+        tour = Tour(tour)
+
+    movimiento, distancia_mejor_vecino = explorar_entorno(tour, distancia, matriz_distancias, tamanio_entorno,
+                                                         operador, candidatos)
+    if movimiento is None:
+        return None, distancia_mejor_vecino, False, 0, 0
 
-        # Comprobamos si existe una mejora
-        if distancia_mejor_vecino < distancia:
-            mejora = True
+    mejor_vecino = tour.copia()
+    aplicar_movimiento(mejor_vecino, movimiento)
 
-    return mejor_vecino, distancia_mejor_vecino, mejora, m_i, m_j
+    return mejor_vecino, distancia_mejor_vecino, distancia_mejor_vecino < distancia, movimiento[1], movimiento[2]
 
 
-def operador_intensificacion(solucion_actual, matriz_distancias):
+def coste_camino(camino, matriz_distancias):
+    """Suma de las distancias entre ciudades consecutivas de un camino (sin cerrar el ciclo)."""
+    camino = np.asarray(camino)
+    return np.sum(matriz_distancias[camino[:-1], camino[1:]], dtype=np.float64).item()
+
+
+def reconstruir_segmento(tour, distancia, matriz_distancias, memoria, longitud, k=1, intensificar=True):
     """
-    Operador de intensificación: Genera una solución basada en la solución actual
-    para explorar intensivamente su vecindario.
+    Reconstruye un segmento del tour guiándose por la memoria a largo plazo; el resto del tour se conserva.
+
+    Se elige la ventana de `longitud` ciudades cuyas aristas tienen menor frecuencia (intensificación: la
+    parte menos consolidada del tour) o mayor frecuencia (diversificación: la parte en la que más tiempo ha
+    pasado la búsqueda), y sus ciudades se vuelven a enlazar con un greedy aleatorio que premia (o penaliza)
+    las aristas frecuentes, eligiendo al azar entre las k mejores opciones.
 
     Args:
-        solucion_actual (list): La solución actual (recorrido).
-        matriz_distancias (numpy.ndarray): Matriz de distancias entre las ciudades.
+        tour (Tour | list): Tour de partida (no se modifica).
+        distancia (float): Distancia del tour de partida.
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        memoria (MemoriaLargoPlazo): Memoria de frecuencias de aristas.
+        longitud (int): Número de ciudades del segmento a reconstruir.
+        k (int, optional): Tamaño de la lista restringida de candidatos en la reconstrucción.
+        intensificar (bool, optional): True para intensificar y False para diversificar.
 
     Returns:
-        list, float: Un nuevo tour generado y su distancia.
+        Tour, float: El nuevo tour y su distancia.
     """
-    # Aquí puedes usar algún metodo como un operador 2-opt intensivo en torno a la mejor solución
-    nueva_solucion = solucion_actual.copy()
-    np.random.shuffle(nueva_solucion)  # Simple intensificación aleatoria (se puede mejorar)
+    if isinstance(tour, Tour):
+        tour = tour.a_lista()
+    n = len(tour)
+    longitud = min(max(2, longitud), n - 2)
+    tour_array = np.asarray(tour)
+
+    # Frecuencia de cada arista del tour y suma por ventanas de longitud + 1 aristas
+    frecuencias = memoria.frecuencias_aristas(tour_array[:-1], tour_array[1:])
+    acumuladas = np.concatenate(([0], np.cumsum(frecuencias)))
+    inicios = np.arange(1, n - longitud)
+    sumas = acumuladas[inicios + longitud] - acumuladas[inicios - 1]
+
+    # Entre ventanas empatadas se elige al azar
+    objetivo = sumas.min() if intensificar else sumas.max()
+    inicio = int(random.choice(inicios[sumas == objetivo].tolist()))
+    fin = inicio + longitud
+
+    # Greedy aleatorio sobre las ciudades del segmento, partiendo de la ciudad anterior a la ventana
+    anterior = tour[inicio - 1]
+    restantes = tour_array[inicio:fin]
+    segmento = []
+    while restantes.size:
+        distancias = np.asarray(matriz_distancias[anterior, restantes], dtype=np.float64)
+        frecuencia = memoria.frecuencias_normalizadas(np.full(restantes.size, anterior), restantes)
+        coste = distancias / (1.0 + frecuencia) if intensificar else distancias * (1.0 + frecuencia)
+
+        mejores = np.argsort(coste, kind='stable')[:k]
+        eleccion = int(random.choice(mejores.tolist()))
+        anterior = int(restantes[eleccion])
+        segmento.append(anterior)
+        restantes = np.delete(restantes, eleccion)
+
+    nuevo_tour = tour[:inicio] + segmento + tour[fin:]
+    nueva_distancia = (distancia - coste_camino(tour[inicio - 1:fin + 1], matriz_distancias)
+                       + coste_camino(nuevo_tour[inicio - 1:fin + 1], matriz_distancias))
+    return Tour(nuevo_tour), nueva_distancia
+
+
+@cronometrar('reinicio')
+def operador_intensificacion(mejor_tour, mejor_distancia, matriz_distancias, memoria, longitud, k=1):
+    """
+    Operador de intensificación: vuelve a la mejor solución y reconstruye su segmento menos consolidado,
+    favoreciendo las aristas que la búsqueda ha introducido con más frecuencia.
 
-    # Calcular la distancia total de la nueva solución
-    nueva_distancia = calcular_distancia(nueva_solucion, matriz_distancias)
+    Args:
+        mejor_tour (Tour | list): Mejor solución encontrada (no se modifica).
+        mejor_distancia (float): Distancia de la mejor solución.
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        memoria (MemoriaLargoPlazo): Memoria de frecuencias de aristas.
+        longitud (int): Número de ciudades del segmento a reconstruir.
+        k (int, optional): Tamaño de la lista restringida de candidatos en la reconstrucción.
 
-    return nueva_solucion, nueva_distancia
+    Returns:
+        Tour, float: Un nuevo tour generado y su distancia.
+    """
+    return reconstruir_segmento(mejor_tour, mejor_distancia, matriz_distancias, memoria, longitud, k, intensificar=True)
 
 
-def operador_diversificacion(matriz_distancias):
+@cronometrar('reinicio')
+def operador_diversificacion(solucion_actual, distancia_actual, matriz_distancias, memoria, longitud, k=1):
     """
-    Operador de diversificación: Genera una solución completamente nueva
-    para explorar otras áreas del espacio de búsqueda.
+    Operador de diversificación: reconstruye el segmento más visitado de la solución actual penalizando
+    las aristas frecuentes, para llevar la búsqueda a zonas poco exploradas.
 
     Args:
-        matriz_distancias (numpy.ndarray): Matriz de distancias entre las ciudades.
+        solucion_actual (Tour | list): La solución actual (no se modifica).
+        distancia_actual (float): Distancia de la solución actual.
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
+        memoria (MemoriaLargoPlazo): Memoria de frecuencias de aristas.
+        longitud (int): Número de ciudades del segmento a reconstruir.
+        k (int, optional): Tamaño de la lista restringida de candidatos en la reconstrucción.
 
     Returns:
-        list, float: Un nuevo tour generado y su distancia.
+        Tour, float: Un nuevo tour generado y su distancia.
     """
-    # Generar una solución completamente nueva aleatoria
-    nueva_solucion = np.random.permutation(len(matriz_distancias)).tolist()
-
-    # Calcular la distancia total de la nueva solución
-    nueva_distancia = calcular_distancia(nueva_solucion, matriz_distancias)
-
-    return nueva_solucion, nueva_distancia
+    return reconstruir_segmento(solucion_actual, distancia_actual, matriz_distancias, memoria, longitud, k, intensificar=False)
 
 
 def calcular_distancia(tour, matriz_distancias):
@@ -168,13 +296,10 @@ def calcular_distancia(tour, matriz_distancias):
     Calcula la distancia total de un recorrido dado.
 
     Args:
-        tour (list): Recorrido de las ciudades.
-        matriz_distancias (numpy.ndarray): Matriz de distancias entre las ciudades.
+        tour (Tour | list): Recorrido de las ciudades.
+        matriz_distancias (numpy.ndarray | OraculoDistancias): Matriz u oráculo de distancias entre las ciudades.
 
     Returns:
         float: Distancia total del recorrido.
     """
-    distancia_total = 0
-    for i in range(len(tour)):
-        distancia_total += matriz_distancias[tour[i]][tour[(i + 1) % len(tour)]]
-    return distancia_total
+    return longitud_recorrido(tour, matriz_distancias)